@@ -4,11 +4,61 @@ import time
 import asyncio
 import PyPDF2
 import io
-from face_tracker.camera import generate_frames
+import os
+from urllib.parse import urlsplit
+from face_tracker.shared_frames import SharedCamera
+from face_tracker.streaming import MJPEGStreamer, format_stream_summary
 from voice_assistant.main import run_audio_loop, set_stop_event, set_jd_cr
 
 st.set_page_config(layout="wide", page_title="Voice + Vision AI Assistant")
 
+# Address of the MJPEG endpoint used by the "MJPEG stream" video output.
+# Loopback only by default, set MJPEG_HOST=0.0.0.0 to serve other machines.
+# Port 0 gives every session its own free port, a taken fixed port falls
+# back to a free one.
+STREAM_HOST = os.getenv("MJPEG_HOST", "127.0.0.1")
+STREAM_PORT = int(os.getenv("MJPEG_PORT", "0"))
+LOOPBACK = ("localhost", "127.0.0.1", "::1")
+
+
+def page_origin():
+    """(scheme, host) of the page as the browser loaded it"""
+    try:
+        headers = st.context.headers
+        origin = headers.get("Origin") or ""
+        host = urlsplit(f"//{headers.get('Host', 'localhost')}").hostname
+    except (AttributeError, ValueError):
+        return "http", "localhost"
+    scheme = urlsplit(origin).scheme or "http"
+    return scheme, host or "localhost"
+
+
+def mjpeg_unavailable(scheme, host):
+    """Why the browser can't show the MJPEG stream, or None if it can"""
+    if scheme == "https":
+        return "browsers block a plain http stream on an https page"
+    if host not in LOOPBACK and STREAM_HOST in LOOPBACK:
+        return (
+            f"the stream only listens on {STREAM_HOST}, set MJPEG_HOST=0.0.0.0 "
+            "to reach it from other machines"
+        )
+    return None
+
+
+def session_alive():
+    """False once the browser session running this script has gone away"""
+    try:
+        from streamlit.runtime import get_instance
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return True
+        return get_instance().is_active_session(ctx.session_id)
+    except Exception:
+        return True
+
+
 # Initialize session state
 if "voice_thread" not in st.session_state:
     st.session_state.voice_thread = None
@@ -18,6 +68,11 @@ if "camera_active" not in st.session_state:
     st.session_state.camera_active = False
 if "camera_stop_event" not in st.session_state:
     st.session_state.camera_stop_event = threading.Event()
+if "shared_camera" not in st.session_state:
+    # Face tracking runs in its own process, frames arrive via shared memory
+    st.session_state.shared_camera = SharedCamera()
+if "streamer" not in st.session_state:
+    st.session_state.streamer = None
 if "jd_text" not in st.session_state:
     st.session_state.jd_text = ""
 if "cr_text" not in st.session_state:
@@ -56,9 +111,10 @@ with sidebar_col:
             # Read the PDF file
             pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file.read()))
 
+            # Pages end in a form feed, compaction uses it to spot headers/footers
             text = ""
             for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+                text += page.extract_text() + "\f"
 
             return text.strip()
         except Exception as e:
@@ -155,16 +211,40 @@ with sidebar_col:
 
     if st.button("🟢 Start Camera", key="start_camera", use_container_width=True):
         if not st.session_state.camera_active:
-            st.session_state.camera_active = True
-            st.session_state.camera_stop_event.clear()
-            st.success("Camera starting...", icon="📹")
+            if st.session_state.shared_camera.start():
+                st.session_state.camera_active = True
+                st.session_state.camera_stop_event.clear()
+                st.success("Camera starting...", icon="📹")
+            else:
+                st.error("Could not open camera", icon="📹")
 
     if st.button("🔴 Stop Camera", key="stop_camera", use_container_width=True):
         if st.session_state.camera_active:
             st.session_state.camera_active = False
             st.session_state.camera_stop_event.set()
+            st.session_state.shared_camera.stop()
+            if st.session_state.streamer:
+                st.session_state.streamer.stop()
+                st.session_state.streamer = None
             st.info("Camera stopping...", icon="⏹️")
 
+    # MJPEG encodes each frame once and lets the browser pull it directly
+    video_mode = st.radio(
+        "Video output",
+        ["Streamlit", "MJPEG stream"],
+        key="video_mode",
+        horizontal=True,
+        help="MJPEG stream uses less bandwidth and stays smooth over slow links",
+    )
+    if video_mode == "MJPEG stream":
+        stream_quality = st.slider("JPEG quality", 30, 95, 75, key="stream_quality")
+        stream_width = st.select_slider(
+            "Stream width",
+            options=[320, 480, 640, 960, 1280],
+            value=640,
+            key="stream_width",
+        )
+
     camera_indicator = "🟢 Running" if st.session_state.camera_active else "⚪ Stopped"
     st.markdown(f"**Status:** {camera_indicator}")
 
@@ -239,40 +319,126 @@ with main_col:
 
         # Create the video container
         video_container = st.empty()
-
-        # Import the camera stop event setter
-        from face_tracker.camera import set_camera_stop_event
-
-        set_camera_stop_event(st.session_state.camera_stop_event)
-
-        # Run the camera loop
-        try:
-            frame_generator = generate_frames()
-
-            for frame in frame_generator:
-                # Check if we should stop
-                if st.session_state.camera_stop_event.is_set():
-                    break
-
-                # Display the frame
-                video_container.image(
-                    frame,
-                    channels="RGB",
-                    use_container_width=True,
-                    caption="Real-time face tracking with head pose detection",
+        stats_container = st.empty()
+
+        from face_tracker.attention import format_attention_summary
+        from face_tracker.stats import format_summary
+
+        camera = st.session_state.shared_camera
+        stop_event = st.session_state.camera_stop_event
+
+        use_mjpeg = video_mode == "MJPEG stream"
+        scheme, host = page_origin()
+        if use_mjpeg:
+            reason = mjpeg_unavailable(scheme, host)
+            if reason:
+                st.info(f"MJPEG stream unavailable, {reason}. Showing it here instead.")
+                use_mjpeg = False
+
+        if use_mjpeg:
+            streamer = st.session_state.streamer
+            if streamer is None or not streamer.running:
+                if streamer is not None:
+                    streamer.stop()
+                streamer = MJPEGStreamer(
+                    camera.frames(stop_event),
+                    host=STREAM_HOST,
+                    port=STREAM_PORT,
+                    quality=stream_quality,
+                    width=stream_width,
                 )
+                try:
+                    streamer.start()
+                except OSError as e:
+                    st.warning(f"Could not start the MJPEG stream ({e})", icon="⚠️")
+                    streamer = None
+                st.session_state.streamer = streamer
+            if streamer is None:
+                use_mjpeg = False
+
+        if use_mjpeg:
+            streamer.quality = stream_quality
+            streamer.width = stream_width
+
+            # The browser reaches the stream on the same host as this page
+            netloc = f"[{host}]" if ":" in host else host
+            video_container.markdown(
+                f'<img src="http://{netloc}:{streamer.port}{streamer.stream_path}" '
+                'style="width: 100%; border-radius: 4px;" />',
+                unsafe_allow_html=True,
+            )
+            st.caption("Real-time face tracking with head pose detection")
+
+            # Frames go straight to the browser, only refresh the stats here
+            while not stop_event.is_set() and camera.running and session_alive():
+                stats = camera.stats_snapshot()
+                summary = (
+                    f"{format_summary(stats)} | "
+                    f"{format_stream_summary(streamer.stats())} | "
+                    f"{format_attention_summary(camera.attention_snapshot())}"
+                )
+                if stats and stats.get("below_realtime"):
+                    stats_container.warning(summary, icon="⚠️")
+                else:
+                    stats_container.caption(summary)
+                time.sleep(1)
+
+            if not camera.running or not session_alive():
+                st.session_state.camera_active = False
+                streamer.stop()
+                st.session_state.streamer = None
+                camera.stop()
+
+        else:
+            if st.session_state.streamer:
+                st.session_state.streamer.stop()
+                st.session_state.streamer = None
+
+            # Show frames as the camera process publishes them
+            try:
+                frame_generator = camera.frames(stop_event)
+
+                for frame_count, frame in enumerate(frame_generator, start=1):
+                    # Check if we should stop
+                    if stop_event.is_set():
+                        break
+
+                    # Display the frame
+                    video_container.image(
+                        frame,
+                        channels="RGB",
+                        use_container_width=True,
+                        caption="Real-time face tracking with head pose detection",
+                    )
 
-                # Small delay to prevent too rapid updates
-                time.sleep(0.033)  # ~30 FPS
-
-        except Exception as e:
-            st.error(f"Camera error: {e}")
-            st.session_state.camera_active = False
-
-        finally:
-            # Clear the video container when done
-            if not st.session_state.camera_active:
-                video_container.empty()
+                    # Refresh fps / inference cost about once a second
+                    if frame_count % 30 == 0:
+                        if not session_alive():
+                            break
+                        stats = camera.stats_snapshot()
+                        summary = (
+                            f"{format_summary(stats)} | "
+                            f"{format_attention_summary(camera.attention_snapshot())}"
+                        )
+                        if stats and stats.get("below_realtime"):
+                            stats_container.warning(summary, icon="⚠️")
+                        else:
+                            stats_container.caption(summary)
+
+                # The camera process exited on its own or the tab went away
+                if not camera.running or not session_alive():
+                    st.session_state.camera_active = False
+                    camera.stop()
+
+            except Exception as e:
+                st.error(f"Camera error: {e}")
+                st.session_state.camera_active = False
+                camera.stop()
+
+            finally:
+                # Clear the video container when done
+                if not st.session_state.camera_active:
+                    video_container.empty()
 
     else:
         # Welcome screen when camera is off
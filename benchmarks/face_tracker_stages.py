@@ -0,0 +1,323 @@
+"""Per-stage latency and throughput of the face-tracking pipeline.
+
+Usage:
+    python -m benchmarks.face_tracker_stages --video clip.mp4 --json out.json
+    python -m benchmarks.face_tracker_stages --image face.jpg --frames 300
+    python -m benchmarks.face_tracker_stages --synthetic --width 1280 --height 720
+
+Frames come from a recorded clip, from a still image with small shifts
+applied (so FaceMesh finds a face), or from synthetic noise (no face, so the
+landmark/solvePnP stages stay empty). The current path runs the shipped
+FramePipeline and FaceAnalyzer.analyze like track_frames does and reports
+the PipelineStats stage timers: capture, prepare, detection, inference,
+tracking, solvepnp and annotate. ``--adaptive``, ``--tier``, ``--roi`` and
+``--inference-width`` are passed to FaceAnalyzer. ``--path legacy`` times the
+original conversion sequence for comparison. Results are printed and
+optionally written as JSON.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+
+import cv2
+import numpy as np
+
+from face_tracker.analyzer import TIERS, FaceAnalyzer, create_face_mesh
+from face_tracker.frames import RED, FramePipeline
+from face_tracker.stats import PipelineStats
+
+# PipelineStats stages recorded by the shipped pipeline
+CURRENT_STAGES = [
+    "capture",
+    "prepare",
+    "detection",
+    "inference",
+    "tracking",
+    "solvepnp",
+    "annotate",
+]
+
+LEGACY_STAGES = [
+    "capture",
+    "color_conversion",
+    "facemesh",
+    "landmark_extraction",
+    "solvepnp",
+    "annotation",
+    "output_conversion",
+]
+
+
+class ClipSource:
+    """Decodes frames from a video file, rewinding at the end"""
+
+    def __init__(self, path):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise ValueError(f"Could not open video {path}")
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return frame
+
+    def describe(self):
+        return {"kind": "video", "path": self.path}
+
+
+class SyntheticSource:
+    """Cycles through prepared frames, copying each like a camera read"""
+
+    def __init__(self, frames, description):
+        self.frames = frames
+        self.description = description
+        self.index = 0
+
+    def read(self):
+        frame = self.frames[self.index % len(self.frames)].copy()
+        self.index += 1
+        return frame
+
+    def describe(self):
+        return self.description
+
+
+def image_source(path, width, height, count=30):
+    image = cv2.imread(path)
+    if image is None:
+        raise ValueError(f"Could not read image {path}")
+    image = cv2.resize(image, (width, height))
+    frames = []
+    for i in range(count):
+        shift = np.float32([[1, 0, 6 * np.sin(i / 5)], [0, 1, 4 * np.cos(i / 7)]])
+        frames.append(cv2.warpAffine(image, shift, (width, height)))
+    return SyntheticSource(frames, {"kind": "image", "path": path})
+
+
+def noise_source(width, height, count=8):
+    rng = np.random.default_rng(0)
+    frames = [
+        rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)
+    ]
+    return SyntheticSource(frames, {"kind": "synthetic"})
+
+
+class RecordingStats(PipelineStats):
+    """PipelineStats that also keeps every sample, for percentiles"""
+
+    def __init__(self):
+        super().__init__(enabled=True)
+        self.samples = {}
+
+    def record(self, stage, seconds):
+        super().record(stage, seconds)
+        self.samples.setdefault(stage, []).append(seconds)
+
+
+def run_current(source, frames, analyzer_options=None):
+    """Time the shipped pipeline, returns per-stage lists of seconds
+
+    Frames go through FramePipeline and FaceAnalyzer.analyze the way
+    track_frames runs them, and stage timings are read back from the
+    PipelineStats timers those record into (prepare, detection, inference,
+    tracking, solvepnp, annotate), plus the source read as capture.
+    """
+    stats = RecordingStats()
+    analyzer = FaceAnalyzer(stats=stats, **(analyzer_options or {}))
+    pipeline = FramePipeline()
+    totals = []
+    clock = time.perf_counter
+
+    for _ in range(frames):
+        t0 = clock()
+        with stats.time("capture"):
+            bgr = source.read()
+        with stats.time("prepare"):
+            frame = pipeline.prepare(bgr)
+        result = analyzer.analyze(frame, t0)
+        if result.pose is not None:
+            if result.pose.looking_forward:
+                text = "Looking Forward"
+            else:
+                text = "Not Looking Forward"
+            with stats.time("annotate"):
+                cv2.putText(frame, text, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, RED, 2)
+        stats.frame()
+        totals.append(clock() - t0)
+
+    timings = {stage: stats.samples.get(stage, []) for stage in CURRENT_STAGES}
+    return timings, totals
+
+
+def run_legacy(source, frames):
+    """Time the original flip / convert / convert back / convert sequence"""
+    timings = {stage: [] for stage in LEGACY_STAGES}
+    totals = []
+    face_mesh = create_face_mesh()
+    clock = time.perf_counter
+
+    for _ in range(frames):
+        t0 = clock()
+        bgr = source.read()
+        t1 = clock()
+        frame = cv2.cvtColor(cv2.flip(bgr, 1), cv2.COLOR_BGR2RGB)
+        t2 = clock()
+        results = face_mesh.process(frame)
+        t3 = clock()
+        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        t4 = clock()
+        timings["capture"].append(t1 - t0)
+        timings["color_conversion"].append((t2 - t1) + (t4 - t3))
+        timings["facemesh"].append(t3 - t2)
+
+        text = "No Face Detected"
+        if results.multi_face_landmarks:
+            img_h, img_w = frame.shape[:2]
+            t5 = clock()
+            face_2d, face_3d = [], []
+            for idx, lm in enumerate(results.multi_face_landmarks[0].landmark):
+                if idx in [33, 263, 1, 61, 291, 199]:
+                    x, y = int(lm.x * img_w), int(lm.y * img_h)
+                    face_2d.append([x, y])
+                    face_3d.append([x, y, lm.z])
+            face_2d = np.array(face_2d, dtype=np.float64)
+            face_3d = np.array(face_3d, dtype=np.float64)
+            t6 = clock()
+            camera_matrix = np.array(
+                [[img_w, 0, img_w / 2], [0, img_w, img_h / 2], [0, 0, 1]]
+            )
+            dist_coeffs = np.zeros((4, 1), dtype=np.float64)
+            _, rotation_vector, _ = cv2.solvePnP(
+                face_3d, face_2d, camera_matrix, dist_coeffs
+            )
+            angles, *_ = cv2.RQDecomp3x3(cv2.Rodrigues(rotation_vector)[0])
+            t7 = clock()
+            timings["landmark_extraction"].append(t6 - t5)
+            timings["solvepnp"].append(t7 - t6)
+            text = "Looking Forward"
+
+        t8 = clock()
+        cv2.putText(frame, text, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        t9 = clock()
+        output = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        t10 = clock()
+        timings["annotation"].append(t9 - t8)
+        timings["output_conversion"].append(t10 - t9)
+        totals.append(t10 - t0)
+        del output
+
+    return timings, totals
+
+
+def summarize(samples):
+    """Latency summary in milliseconds"""
+    if not samples:
+        return {"count": 0}
+    ms = np.asarray(samples) * 1000.0
+    return {
+        "count": int(ms.size),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source_group = parser.add_mutually_exclusive_group()
+    source_group.add_argument("--video", help="recorded clip to replay")
+    source_group.add_argument("--image", help="still image to jitter into frames")
+    source_group.add_argument("--synthetic", action="store_true", help="noise frames")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--path", choices=["current", "legacy"], default="current")
+    parser.add_argument("--adaptive", action="store_true")
+    parser.add_argument("--tier", choices=TIERS, default="mesh")
+    parser.add_argument("--roi", action="store_true")
+    parser.add_argument("--inference-width", type=int, default=None)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    if args.video:
+        source = ClipSource(args.video)
+    elif args.image:
+        source = image_source(args.image, args.width, args.height)
+    else:
+        source = noise_source(args.width, args.height)
+
+    if args.path == "current":
+        options = {
+            "adaptive": args.adaptive,
+            "tier": args.tier,
+            "roi": args.roi,
+            "inference_width": args.inference_width,
+        }
+        stages = CURRENT_STAGES
+
+        def run(source, frames):
+            return run_current(source, frames, options)
+
+    else:
+        options = None
+        stages = LEGACY_STAGES
+        run = run_legacy
+    run(source, args.warmup)
+
+    started = time.perf_counter()
+    timings, totals = run(source, args.frames)
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "source": source.describe(),
+        "path": args.path,
+        "analyzer_options": options,
+        "frames": args.frames,
+        "throughput_fps": args.frames / elapsed,
+        "total": summarize(totals),
+        "stages": {stage: summarize(timings[stage]) for stage in stages},
+    }
+
+    print(f"{args.path} pipeline, {report['throughput_fps']:.1f} fps")
+    print(f"{'stage':<22}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, row in [*report["stages"].items(), ("total", report["total"])]:
+        if not row["count"]:
+            print(f"{name:<22}{0:>7}{'-':>9}{'-':>9}{'-':>9}")
+            continue
+        print(
+            f"{name:<22}{row['count']:>7}{row['p50_ms']:>9.2f}"
+            f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Time and memory per frame of the display path, before and after FramePipeline.
+
+Usage:
+    python -m benchmarks.frame_pipeline --width 1280 --height 720 --frames 300
+
+FaceMesh is left out so only the flip / color conversion / annotation work
+is measured. "before" is the original sequence of cv2.flip, BGR->RGB,
+RGB->BGR for drawing and BGR->RGB for display.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from face_tracker.frames import RED, FramePipeline
+
+
+def legacy_path(bgr):
+    frame = cv2.cvtColor(cv2.flip(bgr, 1), cv2.COLOR_BGR2RGB)
+    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+    cv2.putText(
+        frame, "Looking Forward", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2
+    )
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def pipeline_path(pipeline):
+    def run(bgr):
+        frame = pipeline.prepare(bgr)
+        cv2.putText(
+            frame, "Looking Forward", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, RED, 2
+        )
+        return frame
+
+    return run
+
+
+def measure(path, frames):
+    # Warm up buffers and OpenCV dispatch before measuring
+    for bgr in frames[:5]:
+        path(bgr)
+
+    start = time.perf_counter()
+    for bgr in frames:
+        path(bgr)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    peaks = []
+    for bgr in frames:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        out = path(bgr)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - base)
+        del out
+    tracemalloc.stop()
+
+    return {
+        "ms_per_frame": elapsed / len(frames) * 1000,
+        # Largest amount of extra memory held at once while producing a frame
+        "peak_transient_bytes": float(np.mean(peaks)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [
+        rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+        for _ in range(8)
+    ]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+
+    results = {
+        "before": measure(legacy_path, frames),
+        "after": measure(pipeline_path(FramePipeline()), frames),
+    }
+
+    frame_mb = args.width * args.height * 3 / 1e6
+    print(f"{args.width}x{args.height}, {frame_mb:.2f} MB per frame")
+    for name, row in results.items():
+        print(
+            f"{name:<8}{row['ms_per_frame']:>8.2f} ms/frame"
+            f"{row['peak_transient_bytes'] / 1e6:>9.2f} MB peak transient/frame"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"resolution": [args.width, args.height], **results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
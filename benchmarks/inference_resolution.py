@@ -0,0 +1,116 @@
+"""Compare downscaled / ROI-cropped FaceMesh inference with full resolution.
+
+Usage:
+    python -m benchmarks.inference_resolution clip.mp4 --widths 640 480 320 --roi
+
+Each configuration runs over the same decoded frames. Reported per config:
+frames/sec of the analyzer, mean and p95 absolute pitch/yaw error against the
+full-resolution run, and how often the "Looking Forward" decision agrees.
+"""
+
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from face_tracker.analyzer import FaceAnalyzer
+
+
+def load_frames(path, limit):
+    """Decode up to ``limit`` frames as mirrored RGB, like the camera loop"""
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames
+
+
+def run(frames, **options):
+    """Analyze all frames with a fresh analyzer, returns (fps, results)"""
+    analyzer = FaceAnalyzer(**options)
+    results = []
+    start = time.perf_counter()
+    for frame in frames:
+        results.append(analyzer.analyze(frame))
+    elapsed = time.perf_counter() - start
+    return len(frames) / elapsed, results
+
+
+def compare(reference, results):
+    """Pitch/yaw error and decision agreement against the reference run"""
+    errors, agree, both = [], 0, 0
+    for ref, res in zip(reference, results):
+        if ref.pose is None or res.pose is None:
+            continue
+        both += 1
+        errors.append(
+            (abs(ref.pose.pitch - res.pose.pitch), abs(ref.pose.yaw - res.pose.yaw))
+        )
+        agree += ref.pose.looking_forward == res.pose.looking_forward
+
+    if not errors:
+        return {"frames_compared": 0}
+    errors = np.array(errors)
+    return {
+        "frames_compared": both,
+        "pitch_mae": float(errors[:, 0].mean()),
+        "pitch_p95": float(np.percentile(errors[:, 0], 95)),
+        "yaw_mae": float(errors[:, 1].mean()),
+        "yaw_p95": float(np.percentile(errors[:, 1], 95)),
+        "decision_agreement": agree / both,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video", help="recorded clip with a face in view")
+    parser.add_argument("--widths", type=int, nargs="+", default=[640, 480, 320, 256])
+    parser.add_argument("--roi", action="store_true", help="also run with ROI cropping")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    if not frames:
+        parser.error(f"could not read frames from {args.video}")
+    img_h, img_w = frames[0].shape[:2]
+    print(f"{len(frames)} frames at {img_w}x{img_h}")
+
+    base_fps, reference = run(frames)
+    rows = [{"config": "full", "fps": base_fps, **compare(reference, reference)}]
+
+    configs = [(f"width={w}", {"inference_width": w}) for w in args.widths if w < img_w]
+    if args.roi:
+        configs.append(("roi", {"roi": True}))
+        configs += [
+            (f"roi+width={w}", {"roi": True, "inference_width": w}) for w in args.widths
+        ]
+
+    for name, options in configs:
+        fps, results = run(frames, **options)
+        rows.append({"config": name, "fps": fps, **compare(reference, results)})
+
+    print(
+        f"{'config':<16}{'fps':>8}{'speedup':>9}{'pitch mae':>11}{'yaw mae':>9}{'agree':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['config']:<16}{row['fps']:>8.1f}{row['fps'] / base_fps:>8.2f}x"
+            f"{row.get('pitch_mae', float('nan')):>11.2f}"
+            f"{row.get('yaw_mae', float('nan')):>9.2f}"
+            f"{row.get('decision_agreement', float('nan')):>8.1%}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"resolution": [img_w, img_h], "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
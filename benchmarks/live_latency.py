@@ -0,0 +1,155 @@
+"""End-to-end latency of the voice loop against a local mock Live API.
+
+Usage:
+    python -m benchmarks.live_latency --sessions 1 2 4 8 --duration 20
+
+Runs ``voice_assistant.main.audio_loop`` for each concurrency level with N
+loops side by side in one event loop. Each loop gets a fake microphone that
+alternates scripted speech and silence, a fake speaker, and a
+MockLiveSession instead of Gemini, so nothing needs a network, an API key
+or audio hardware. Reported per level:
+
+- mic-to-upload: capture of a microphone chunk until the mock receives it
+- response-to-speaker: a turn's first audio message until it is played
+- event-loop lag: how late a 10 ms sleep wakes up
+- turns, interruptions and reconnects seen by the mock sessions
+- playback underruns and dropped uplink chunks, summed over the stats each
+  loop returns
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import threading
+import time
+
+import numpy as np
+
+from voice_assistant import main as voice
+from voice_assistant.fake_audio import FakePyAudio, ScriptedMicrophone, Speaker
+from voice_assistant.mock_live import mock_session_factory
+
+
+def percentiles(values_s):
+    if not values_s:
+        return {"p50": float("nan"), "p95": float("nan"), "max": float("nan")}
+    ms = 1000.0 * np.asarray(values_s)
+    return {
+        "p50": float(np.percentile(ms, 50)),
+        "p95": float(np.percentile(ms, 95)),
+        "max": float(ms.max()),
+    }
+
+
+async def measure_lag(stop, lags, interval=0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run_level(sessions, duration, options):
+    """Run ``sessions`` audio loops for ``duration`` seconds"""
+    stop = threading.Event()
+    voice.set_stop_event(stop)
+    uplink, speakers, factories, loops = [], [], [], []
+
+    for i in range(sessions):
+        mic = ScriptedMicrophone(voice.SEND_SAMPLE_RATE, seed=i)
+        speaker = Speaker()
+
+        def on_audio(data, mic=mic):
+            uplink.extend(mic.received(data))
+
+        factory = mock_session_factory(
+            on_audio=on_audio, on_response=speaker.expect, **options
+        )
+        speakers.append(speaker)
+        factories.append(factory)
+        pya = FakePyAudio(source=mic, sink=speaker)
+        loops.append(voice.audio_loop(session_factory=factory, pya=pya))
+
+    lags = []
+    lag_task = asyncio.create_task(measure_lag(stop, lags))
+    tasks = [asyncio.create_task(loop) for loop in loops]
+    await asyncio.sleep(duration)
+    stop.set()
+    *loop_stats, _ = await asyncio.gather(*tasks, lag_task)
+
+    mocks = [session for factory in factories for session in factory.sessions]
+    return {
+        "sessions": sessions,
+        "turns": sum(s.turns for s in mocks),
+        "interruptions": sum(s.interruptions for s in mocks),
+        "tool_calls": sum(s.tool_calls for s in mocks),
+        "reconnects": sum(len(f.sessions) - 1 for f in factories),
+        "underruns": sum(stats["playback"]["underruns"] for stats in loop_stats),
+        "uplink_dropped": sum(
+            stats["uplink"]["queue"]["dropped"] for stats in loop_stats
+        ),
+        "mic_to_upload_ms": percentiles(uplink),
+        "response_to_speaker_ms": percentiles(
+            [lat for speaker in speakers for lat in speaker.latencies]
+        ),
+        "loop_lag_ms": percentiles(lags),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--response-ms", type=int, default=2000)
+    parser.add_argument("--speed", type=float, default=1.5)
+    parser.add_argument("--connect-ms", type=int, default=300)
+    parser.add_argument("--interrupt-ms", type=int, default=500)
+    parser.add_argument(
+        "--go-away", type=float, help="send go_away after this many seconds"
+    )
+    parser.add_argument("--verbose", action="store_true", help="show loop output")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    options = {
+        "response_ms": args.response_ms,
+        "speed": args.speed,
+        "connect_ms": args.connect_ms,
+        "interrupt_ms": args.interrupt_ms,
+        "go_away_after_s": args.go_away,
+    }
+    voice.TRANSCRIPT_DIR = None
+    rows = []
+    for sessions in args.sessions:
+        output = (
+            contextlib.nullcontext()
+            if args.verbose
+            else contextlib.redirect_stdout(io.StringIO())
+        )
+        with output:
+            rows.append(asyncio.run(run_level(sessions, args.duration, options)))
+
+    print(
+        f"{'sessions':>8}{'turns':>7}{'intr':>6}{'recon':>7}{'undr':>6}{'drop':>6}"
+        f"{'up p50':>9}{'up p95':>9}{'spk p50':>9}{'spk p95':>9}"
+        f"{'lag p50':>9}{'lag p95':>9}{'lag max':>9}"
+    )
+    for row in rows:
+        up = row["mic_to_upload_ms"]
+        spk = row["response_to_speaker_ms"]
+        lag = row["loop_lag_ms"]
+        print(
+            f"{row['sessions']:>8}{row['turns']:>7}{row['interruptions']:>6}"
+            f"{row['reconnects']:>7}{row['underruns']:>6}{row['uplink_dropped']:>6}"
+            f"{up['p50']:>9.1f}{up['p95']:>9.1f}{spk['p50']:>9.1f}{spk['p95']:>9.1f}"
+            f"{lag['p50']:>9.2f}{lag['p95']:>9.2f}{lag['max']:>9.2f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"duration": args.duration, "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Accuracy and cost of the FaceAnalyzer model tiers.
+
+Usage:
+    python -m benchmarks.model_tiers clip.mp4 --absent-ratio 0.4 --adaptive
+
+Runs every tier (see face_tracker.analyzer.TIERS) over the same frames.
+``--absent-ratio`` splices in blocks of empty frames, like a candidate
+stepping away from the camera. Reported per tier: frames/sec, mean ms per
+frame, FaceMesh and detector runs, face-presence agreement and pitch/yaw
+error against the "mesh" tier.
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from benchmarks.inference_resolution import compare, load_frames, run
+from face_tracker.analyzer import TIERS
+from face_tracker.stats import PipelineStats
+
+
+def with_absences(frames, ratio, block=30):
+    """Interleave blocks of empty frames until ``ratio`` of them are empty"""
+    if ratio <= 0:
+        return list(frames)
+    empty = np.full_like(frames[0], int(frames[0].mean()))
+    absent_total = round(len(frames) * ratio / (1 - ratio))
+    out, absent = [], 0
+    for start in range(0, len(frames), block):
+        out.extend(frames[start : start + block])
+        if absent < absent_total:
+            count = min(block, absent_total - absent)
+            out.extend([empty] * count)
+            absent += count
+    return out
+
+
+def presence_agreement(reference, results):
+    agree = sum(
+        ref.face_present == res.face_present for ref, res in zip(reference, results)
+    )
+    return agree / len(reference) if reference else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video", help="recorded clip with a face in view")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--absent-ratio", type=float, default=0.3)
+    parser.add_argument("--adaptive", action="store_true", help="also run adaptive")
+    parser.add_argument("--roi", action="store_true")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    if not frames:
+        parser.error(f"could not read frames from {args.video}")
+    frames = with_absences(frames, args.absent_ratio)
+    print(f"{len(frames)} frames, {args.absent_ratio:.0%} without a face")
+
+    configs = [(tier, {"tier": tier, "roi": args.roi}) for tier in TIERS]
+    if args.adaptive:
+        configs += [
+            (f"{tier}+adaptive", {"tier": tier, "roi": args.roi, "adaptive": True})
+            for tier in TIERS
+        ]
+
+    rows, reference = [], None
+    for name, options in configs:
+        stats = PipelineStats()
+        fps, results = run(frames, stats=stats, **options)
+        if reference is None:
+            reference = results
+        counters = stats.snapshot()["counters"]
+        rows.append(
+            {
+                "config": name,
+                "fps": fps,
+                "ms_per_frame": 1000.0 / fps,
+                "facemesh_runs": counters.get("inference_runs", 0),
+                "detector_runs": counters.get("detector_runs", 0),
+                "presence_agreement": presence_agreement(reference, results),
+                **compare(reference, results),
+            }
+        )
+
+    base_fps = rows[0]["fps"]
+    print(
+        f"{'config':<20}{'fps':>8}{'speedup':>9}{'mesh':>7}{'detect':>8}"
+        f"{'present':>9}{'pitch mae':>11}{'yaw mae':>9}"
+    )
+    for row in rows:
+        print(
+            f"{row['config']:<20}{row['fps']:>8.1f}{row['fps'] / base_fps:>8.2f}x"
+            f"{row['facemesh_runs']:>7}{row['detector_runs']:>8}"
+            f"{row['presence_agreement']:>9.1%}"
+            f"{row.get('pitch_mae', float('nan')):>11.2f}"
+            f"{row.get('yaw_mae', float('nan')):>9.2f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"frames": len(frames), "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import time
+from typing import NamedTuple, Optional
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from face_tracker.pose import (
+    BOX_LANDMARKS,
+    KEY_LANDMARKS,
+    HeadPose,
+    gather_landmarks,
+    key_points_from_normalized,
+    solve_head_pose,
+)
+from face_tracker.stats import PipelineStats
+from face_tracker.tracking import InferenceCadence, PoseTracker
+
+_LANDMARKS = KEY_LANDMARKS + BOX_LANDMARKS
+
+# "mesh": FaceMesh on every inference. "cascade": a face detector gates
+# FaceMesh while nobody is in view. "presence": detector only, no pose.
+TIERS = ("mesh", "cascade", "presence")
+
+
+def create_face_mesh():
+    """FaceMesh configured the way the tracker has always used it"""
+    return mp.solutions.face_mesh.FaceMesh(
+        min_detection_confidence=0.6, min_tracking_confidence=0.5
+    )
+
+
+def create_face_detector():
+    """Short-range BlazeFace detector used to gate FaceMesh"""
+    return mp.solutions.face_detection.FaceDetection(
+        model_selection=0, min_detection_confidence=0.6
+    )
+
+
+class FaceResult(NamedTuple):
+    """Outcome of analyzing one frame"""
+
+    face_present: bool
+    pose: Optional[HeadPose]
+    inferred: bool
+
+
+class FaceAnalyzer:
+    """Runs FaceMesh and head-pose estimation on RGB frames.
+
+    With ``adaptive=True`` FaceMesh only runs every N frames, N adapting to
+    ``cpu_budget``, or earlier when the tracker loses the face or sees large
+    motion. In between, pose is carried forward by a PoseTracker.
+
+    ``inference_width`` downscales the image FaceMesh sees and ``roi`` crops
+    it to the last face box plus ``roi_margin``; landmarks are mapped back to
+    full-resolution coordinates before solvePnP.
+
+    ``tier`` picks the models, see TIERS. With "cascade" the cheap face
+    detector runs whenever FaceMesh has no face to follow, and FaceMesh is
+    skipped on frames where the detector finds nobody; a detected face also
+    seeds the ROI crop. "presence" never runs FaceMesh and reports face
+    presence without pose.
+
+    Inference, detection, tracking and solvePnP timings and counters go to
+    ``stats``.
+    """
+
+    def __init__(
+        self,
+        face_mesh=None,
+        adaptive=False,
+        max_interval=10,
+        cpu_budget=0.35,
+        inference_width=None,
+        roi=False,
+        roi_margin=0.6,
+        stats=None,
+        tier="mesh",
+        face_detector=None,
+    ):
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier {tier!r}, expected one of {TIERS}")
+        self.tier = tier
+        self.face_mesh = None
+        if tier != "presence":
+            self.face_mesh = face_mesh if face_mesh is not None else create_face_mesh()
+        self.face_detector = None
+        if tier != "mesh":
+            self.face_detector = (
+                face_detector if face_detector is not None else create_face_detector()
+            )
+        self._mesh_has_face = False
+        self.adaptive = adaptive
+        self.inference_width = inference_width
+        self.roi = roi
+        self.roi_margin = roi_margin
+        self.stats = stats if stats is not None else PipelineStats(enabled=False)
+        self._face_box = None
+        self._crop = None
+        self.cadence = InferenceCadence(
+            max_interval=max_interval, cpu_budget=cpu_budget
+        )
+        self.tracker = PoseTracker()
+        self._last = FaceResult(False, None, False)
+
+    def analyze(self, rgb, timestamp=None):
+        """Analyze one RGB frame, returns a FaceResult"""
+        if not self.adaptive:
+            return self._infer(rgb, None)
+
+        self.cadence.tick(time.monotonic() if timestamp is None else timestamp)
+        gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+
+        if not self.cadence.due():
+            if self.tracker.active:
+                with self.stats.time("tracking"):
+                    pose = self.tracker.track(gray)
+                if pose is not None:
+                    self.stats.count("tracked_frames")
+                    self._last = FaceResult(True, pose, False)
+                    return self._last
+            elif not self._last.face_present:
+                # Nobody in view, keep waiting for the next scheduled run
+                self.stats.count("frames_without_face")
+                return FaceResult(False, None, False)
+            elif self.tier == "presence":
+                # No pose to track, presence carries over until the next run
+                return FaceResult(True, None, False)
+
+        self._last = self._infer(rgb, gray)
+        return self._last
+
+    def _inference_view(self, rgb):
+        """Image handed to FaceMesh and its (x0, y0, w, h) region in ``rgb``"""
+        img_h, img_w = rgb.shape[:2]
+        x0, y0, x1, y1 = 0, 0, img_w, img_h
+
+        if self.roi and self._face_box is not None:
+            if self._crop is None or not _contains(self._crop, self._face_box):
+                bx0, by0, bx1, by1 = self._face_box
+                mx = (bx1 - bx0) * self.roi_margin
+                my = (by1 - by0) * self.roi_margin
+                self._crop = (
+                    max(0, int(bx0 - mx)),
+                    max(0, int(by0 - my)),
+                    min(img_w, int(bx1 + mx) + 1),
+                    min(img_h, int(by1 + my) + 1),
+                )
+            # The crop only moves when the face nears its edge, which keeps
+            # FaceMesh's own landmark tracking stable between frames
+            x0, y0, x1, y1 = self._crop
+
+        view = rgb[y0:y1, x0:x1]
+        w, h = x1 - x0, y1 - y0
+        if self.inference_width and w > self.inference_width:
+            size = (self.inference_width, max(1, round(h * self.inference_width / w)))
+            view = cv2.resize(view, size, interpolation=cv2.INTER_LINEAR)
+        elif w != img_w or h != img_h:
+            view = np.ascontiguousarray(view)
+        return view, (x0, y0, w, h)
+
+    def _run_face_mesh(self, rgb):
+        """FaceMesh landmarks in full-frame normalized coordinates, or None"""
+        img_h, img_w = rgb.shape[:2]
+        view, (x0, y0, w, h) = self._inference_view(rgb)
+        results = self.face_mesh.process(view)
+
+        if not results.multi_face_landmarks:
+            if self._face_box is not None:
+                # Face left the crop, look at the whole frame again
+                self._face_box = None
+                self._crop = None
+                if self.roi:
+                    return self._run_face_mesh(rgb)
+            return None
+
+        indices = _LANDMARKS if self.roi else KEY_LANDMARKS
+        raw = gather_landmarks(results.multi_face_landmarks[0], indices)
+        if (x0, y0, w, h) != (0, 0, img_w, img_h):
+            raw[:, 0] = (x0 + raw[:, 0] * w) / img_w
+            raw[:, 1] = (y0 + raw[:, 1] * h) / img_h
+            raw[:, 2] *= w / img_w
+
+        if self.roi:
+            xs, ys = raw[:, 0] * img_w, raw[:, 1] * img_h
+            self._face_box = (xs.min(), ys.min(), xs.max(), ys.max())
+        return raw[: len(KEY_LANDMARKS)]
+
+    def _detect_face(self, rgb):
+        """Run the face detector, returns whether a face is in view"""
+        with self.stats.time("detection"):
+            detections = self.face_detector.process(rgb).detections
+        self.stats.count("detector_runs")
+        if not detections:
+            return False
+
+        if self.roi and self._face_box is None:
+            # Start FaceMesh on the detected face instead of the whole frame
+            img_h, img_w = rgb.shape[:2]
+            box = detections[0].location_data.relative_bounding_box
+            self._face_box = (
+                max(0.0, box.xmin * img_w),
+                max(0.0, box.ymin * img_h),
+                min(img_w, (box.xmin + box.width) * img_w),
+                min(img_h, (box.ymin + box.height) * img_h),
+            )
+        return True
+
+    def _infer(self, rgb, gray):
+        start = time.perf_counter()
+        face_seen = True
+        if self.tier == "presence" or (
+            self.tier == "cascade" and not self._mesh_has_face
+        ):
+            face_seen = self._detect_face(rgb)
+
+        if self.tier == "presence":
+            elapsed = time.perf_counter() - start
+            if self.adaptive:
+                self.cadence.record_inference(elapsed)
+            self.stats.record("inference", elapsed)
+            if not face_seen:
+                self.stats.count("frames_without_face")
+            return FaceResult(face_seen, None, True)
+
+        if face_seen:
+            raw = self._run_face_mesh(rgb)
+        else:
+            raw = None
+            self.stats.count("mesh_skipped")
+        self._mesh_has_face = raw is not None
+        elapsed = time.perf_counter() - start
+        if self.adaptive:
+            self.cadence.record_inference(elapsed)
+        self.stats.record("inference", elapsed)
+        if face_seen:
+            self.stats.count("inference_runs")
+
+        if raw is None:
+            self.tracker.clear()
+            self.stats.count("frames_without_face")
+            return FaceResult(False, None, True)
+
+        img_h, img_w = rgb.shape[:2]
+        with self.stats.time("solvepnp"):
+            face_2d, face_3d = key_points_from_normalized(raw, img_w, img_h)
+            pose = solve_head_pose(face_2d, face_3d, img_w, img_h)
+        if pose is None:
+            self.stats.count("pnp_failures")
+
+        if gray is not None:
+            if pose is not None:
+                self.tracker.reset(gray, face_2d, face_3d, pose)
+            else:
+                self.tracker.clear()
+        return FaceResult(True, pose, True)
+
+
+def _contains(crop, box):
+    """True if ``box`` sits inside ``crop`` with some room to spare"""
+    x0, y0, x1, y1 = crop
+    bx0, by0, bx1, by1 = box
+    pad_x, pad_y = (bx1 - bx0) * 0.15, (by1 - by0) * 0.15
+    return (
+        bx0 - pad_x >= x0
+        and by0 - pad_y >= y0
+        and bx1 + pad_x <= x1
+        and by1 + pad_y <= y1
+    )
@@ -0,0 +1,234 @@
+import math
+import threading
+
+import numpy as np
+
+_SAMPLE = np.dtype(
+    [
+        ("t", np.float64),
+        ("pitch", np.float32),
+        ("yaw", np.float32),
+        ("face", np.bool_),
+        ("forward", np.bool_),
+    ]
+)
+
+
+class AttentionAggregator:
+    """Streaming attention metrics with fixed memory.
+
+    Per-frame samples go into a numpy ring of ``capacity`` entries. Sums over
+    the last ``window_s`` seconds are updated incrementally as samples enter
+    and leave the window, session totals are plain counters, and the
+    per-``bucket_s`` timeline is a ring of ``max_buckets`` entries, so memory
+    does not grow with interview length.
+
+    A look-away episode is a stretch of at least ``min_episode_s`` seconds
+    without a face looking forward. ``snapshot()`` is O(1) and safe to poll
+    from UI threads.
+    """
+
+    def __init__(
+        self,
+        window_s=10.0,
+        capacity=1024,
+        bucket_s=10.0,
+        max_buckets=720,
+        min_episode_s=1.0,
+    ):
+        self.window_s = window_s
+        self.bucket_s = bucket_s
+        self.min_episode_s = min_episode_s
+
+        self._lock = threading.Lock()
+        self._samples = np.zeros(capacity, dtype=_SAMPLE)
+        self._head = 0
+        self._count = 0
+
+        self._bucket_forward = np.zeros(max_buckets, dtype=np.float64)
+        self._bucket_total = np.zeros(max_buckets, dtype=np.float64)
+        self._bucket_start = None
+        self._bucket_index = 0
+
+        self.reset()
+
+    def reset(self):
+        """Forget all samples and totals"""
+        with self._lock:
+            self._head = 0
+            self._count = 0
+            self._win_frames = 0
+            self._win_face = 0
+            self._win_forward = 0
+            self._win_pitch = 0.0
+            self._win_yaw = 0.0
+            self._win_posed = 0
+
+            self._bucket_forward[:] = 0
+            self._bucket_total[:] = 0
+            self._bucket_start = None
+            self._bucket_index = 0
+
+            self.total_frames = 0
+            self.total_face = 0
+            self.total_forward = 0
+            self.episodes = 0
+            self._start_t = None
+            self._last_t = None
+            self._away_since = None
+            self._in_episode = False
+            self._episode_time = 0.0
+
+    def add(self, timestamp, face_present, pitch, yaw, looking_forward):
+        """Record one frame; pitch/yaw may be NaN when no pose is available"""
+        attentive = bool(face_present and looking_forward)
+        with self._lock:
+            if self._count == len(self._samples):
+                self._evict()
+            index = (self._head + self._count) % len(self._samples)
+            self._samples[index] = (timestamp, pitch, yaw, face_present, attentive)
+            self._count += 1
+
+            self._win_frames += 1
+            self._win_face += bool(face_present)
+            self._win_forward += attentive
+            if not math.isnan(pitch):
+                self._win_pitch += pitch
+                self._win_yaw += yaw
+                self._win_posed += 1
+
+            cutoff = timestamp - self.window_s
+            while self._count and self._samples[self._head]["t"] < cutoff:
+                self._evict()
+
+            self.total_frames += 1
+            self.total_face += bool(face_present)
+            self.total_forward += attentive
+            if self._start_t is None:
+                self._start_t = timestamp
+            self._update_episode(timestamp, attentive)
+            self._update_bucket(timestamp, attentive)
+            self._last_t = timestamp
+
+    def add_result(self, timestamp, result):
+        """Record a FaceResult"""
+        pose = result.pose
+        if pose is None:
+            self.add(timestamp, result.face_present, math.nan, math.nan, False)
+        else:
+            self.add(
+                timestamp,
+                result.face_present,
+                pose.pitch,
+                pose.yaw,
+                pose.looking_forward,
+            )
+
+    def _evict(self):
+        sample = self._samples[self._head]
+        self._head = (self._head + 1) % len(self._samples)
+        self._count -= 1
+
+        self._win_frames -= 1
+        self._win_face -= bool(sample["face"])
+        self._win_forward -= bool(sample["forward"])
+        if not math.isnan(sample["pitch"]):
+            self._win_pitch -= float(sample["pitch"])
+            self._win_yaw -= float(sample["yaw"])
+            self._win_posed -= 1
+
+    def _update_episode(self, timestamp, attentive):
+        if attentive:
+            if self._in_episode:
+                self._episode_time += timestamp - self._away_since
+            self._away_since = None
+            self._in_episode = False
+            return
+
+        if self._away_since is None:
+            self._away_since = timestamp
+        elif (
+            not self._in_episode and timestamp - self._away_since >= self.min_episode_s
+        ):
+            self._in_episode = True
+            self.episodes += 1
+
+    def _update_bucket(self, timestamp, attentive):
+        if self._bucket_start is None:
+            self._bucket_start = timestamp
+        while timestamp - self._bucket_start >= self.bucket_s:
+            self._bucket_start += self.bucket_s
+            self._bucket_index += 1
+            slot = self._bucket_index % len(self._bucket_total)
+            self._bucket_forward[slot] = 0
+            self._bucket_total[slot] = 0
+        slot = self._bucket_index % len(self._bucket_total)
+        self._bucket_forward[slot] += attentive
+        self._bucket_total[slot] += 1
+
+    def snapshot(self):
+        """Current rolling-window and session metrics as a dict"""
+        with self._lock:
+            frames = self._win_frames
+            posed = self._win_posed
+            away_time = self._episode_time
+            if self._in_episode and self._last_t is not None:
+                away_time += self._last_t - self._away_since
+            return {
+                "window_s": self.window_s,
+                "window_frames": frames,
+                "window_face_pct": 100.0 * self._win_face / frames if frames else 0.0,
+                "window_forward_pct": (
+                    100.0 * self._win_forward / frames if frames else 0.0
+                ),
+                "window_mean_pitch": self._win_pitch / posed if posed else None,
+                "window_mean_yaw": self._win_yaw / posed if posed else None,
+                "session_s": (
+                    self._last_t - self._start_t if self._start_t is not None else 0.0
+                ),
+                "total_frames": self.total_frames,
+                "total_face_pct": (
+                    100.0 * self.total_face / self.total_frames
+                    if self.total_frames
+                    else 0.0
+                ),
+                "total_forward_pct": (
+                    100.0 * self.total_forward / self.total_frames
+                    if self.total_frames
+                    else 0.0
+                ),
+                "look_away_episodes": self.episodes,
+                "look_away_s": away_time,
+                "looking_away": self._in_episode,
+            }
+
+    def timeline(self):
+        """Percent looking forward per bucket, oldest first, as a numpy array"""
+        with self._lock:
+            if self._bucket_start is None:
+                return np.empty(0)
+            size = len(self._bucket_total)
+            filled = min(self._bucket_index + 1, size)
+            order = (
+                np.arange(self._bucket_index + 1 - filled, self._bucket_index + 1)
+            ) % size
+            total = self._bucket_total[order]
+            forward = self._bucket_forward[order]
+        return np.divide(
+            100.0 * forward, total, out=np.zeros_like(forward), where=total > 0
+        )
+
+
+def format_attention_summary(snapshot):
+    """One-line summary of an attention snapshot"""
+    if not snapshot:
+        return "No attention data yet"
+    parts = [
+        f"{snapshot['window_forward_pct']:.0f}% forward "
+        f"(last {snapshot['window_s']:.0f}s)",
+        f"{snapshot['total_forward_pct']:.0f}% overall",
+        f"{snapshot['look_away_episodes']} look-aways",
+    ]
+    if snapshot["looking_away"]:
+        parts.append("looking away")
+    return " | ".join(parts)
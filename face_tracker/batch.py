@@ -0,0 +1,272 @@
+"""Offline attention analysis of recorded interview videos.
+
+Usage:
+    python -m face_tracker.batch recordings/*.mp4 --out results/ --workers 8
+
+Long videos are split into frame ranges that run in parallel on a process
+pool. For every video a per-frame table (<name>.poses.csv) and a summary
+(<name>.summary.json) are written to the output directory, where <name> is
+the video's path relative to the videos' common folder with "/" as "__".
+A video that can't be opened or a segment that fails is listed under
+"errors" in its summary, the other videos and segments carry on.
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+from pathlib import Path
+
+import cv2
+
+from face_tracker.attention import AttentionAggregator
+from face_tracker.headless import track_video
+
+COLUMNS = [
+    "frame",
+    "time_s",
+    "face_present",
+    "pitch",
+    "yaw",
+    "roll",
+    "looking_forward",
+]
+
+
+def plan_segments(path, segment_frames):
+    """Split a video into (path, start, end, fps) frame ranges"""
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video {path}")
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+
+    if total <= 0:
+        # Unknown length, read the whole file in one range
+        return [(str(path), 0, 2**62, fps)]
+
+    return [
+        (str(path), start, min(start + segment_frames, total), fps)
+        for start in range(0, total, segment_frames)
+    ]
+
+
+def analyze_segment(path, start, end, fps, analyzer_options, mirror=True, width=None):
+    """Analyze frames [start, end) of a video, returns (rows, seconds)"""
+    began = time.perf_counter()
+    rows = []
+    for sample in track_video(
+        path, start, end, fps, mirror=mirror, width=width, **analyzer_options
+    ):
+        posed = not math.isnan(sample.pitch)
+        rows.append(
+            (
+                sample.seq,
+                round(sample.timestamp, 3),
+                int(sample.face_present),
+                round(sample.pitch, 2) if posed else None,
+                round(sample.yaw, 2) if posed else None,
+                round(sample.roll, 2) if posed else None,
+                int(sample.looking_forward),
+            )
+        )
+    return rows, time.perf_counter() - began
+
+
+def count_episodes(flags, fps, min_episode_s=1.0):
+    """Look-away episodes in per-frame looking-forward flags
+
+    Uses AttentionAggregator's definition, a stretch of at least
+    ``min_episode_s`` seconds without looking forward, so offline and live
+    counts agree.
+    """
+    aggregator = AttentionAggregator(min_episode_s=min_episode_s)
+    for index, flag in enumerate(flags):
+        aggregator.add(index / fps, True, math.nan, math.nan, bool(flag))
+    return aggregator.episodes
+
+
+def summarize(rows, fps, worker_seconds, min_episode_s=1.0, errors=()):
+    """Attention summary of a video's per-frame rows"""
+    frames = len(rows)
+    face_frames = sum(row[2] for row in rows)
+    forward_frames = sum(row[6] for row in rows)
+    return {
+        "frames": frames,
+        "duration_s": frames / fps if fps else None,
+        "face_present_pct": 100.0 * face_frames / frames if frames else 0.0,
+        "looking_forward_pct": 100.0 * forward_frames / frames if frames else 0.0,
+        "looking_forward_pct_of_face": (
+            100.0 * forward_frames / face_frames if face_frames else 0.0
+        ),
+        "look_away_episodes": count_episodes(
+            (row[6] for row in rows), fps or 30.0, min_episode_s
+        ),
+        "worker_seconds": worker_seconds,
+        "frames_per_sec_per_core": frames / worker_seconds if worker_seconds else 0.0,
+        "errors": list(errors),
+    }
+
+
+def output_names(paths):
+    """Unique output name per video, from its path relative to the common folder"""
+    paths = [str(path) for path in paths]
+    if not paths:
+        return {}
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    relative = {p: Path(os.path.relpath(os.path.abspath(p), base)) for p in paths}
+    names = {p: "__".join(rel.with_suffix("").parts) for p, rel in relative.items()}
+    taken = list(names.values())
+    for p, rel in relative.items():
+        # Same folder and stem, different container: keep the extension too
+        if taken.count(names[p]) > 1:
+            names[p] = "__".join(rel.parts)
+    return names
+
+
+def write_outputs(out_dir, path, rows, summary, stem=None):
+    stem = stem or Path(path).stem
+    with open(out_dir / f"{stem}.poses.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+    with open(out_dir / f"{stem}.summary.json", "w") as f:
+        json.dump({"video": str(path), **summary}, f, indent=2)
+
+
+def analyze_videos(
+    paths,
+    out_dir,
+    workers=None,
+    segment_frames=3000,
+    analyzer_options=None,
+    mirror=True,
+    width=None,
+):
+    """Analyze videos on a process pool, returns (summaries by path, wall seconds)"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    analyzer_options = analyzer_options or {}
+
+    segments = {}
+    errors = {}
+    for path in paths:
+        path = str(path)
+        errors[path] = []
+        try:
+            segments[path] = plan_segments(path, segment_frames)
+        except ValueError as e:
+            errors[path].append(str(e))
+            segments[path] = []
+    names = output_names(segments)
+    parts = {path: {} for path in segments}
+    seconds = {path: 0.0 for path in segments}
+    summaries = {}
+
+    def finish(path):
+        done = parts.pop(path)
+        rows = [row for key in sorted(done) for row in done[key]]
+        fps = segments[path][0][3] if segments[path] else None
+        summaries[path] = summarize(rows, fps, seconds[path], errors=errors[path])
+        write_outputs(out_dir, path, rows, summaries[path], names[path])
+        if errors[path]:
+            print(f"⚠️ {Path(path).name}: {errors[path][0]}")
+        print(
+            f"🎞️ {Path(path).name}: {len(rows)} frames, "
+            f"{summaries[path]['looking_forward_pct']:.1f}% looking forward"
+        )
+
+    for path, plan in segments.items():
+        if not plan:
+            finish(path)
+
+    started = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, mp_context=mp.get_context("spawn")
+    ) as pool:
+        futures = {
+            pool.submit(
+                analyze_segment,
+                path,
+                start,
+                end,
+                fps,
+                analyzer_options,
+                mirror,
+                width,
+            ): (path, start, end)
+            for plan in segments.values()
+            for path, start, end, fps in plan
+        }
+        for future in concurrent.futures.as_completed(futures):
+            path, start, end = futures[future]
+            try:
+                chunk, elapsed = future.result()
+                seconds[path] += elapsed
+            except Exception as e:
+                # Keep the other segments, the gap is listed in the summary
+                errors[path].append(f"frames {start}-{end}: {e!r}")
+                chunk = []
+            parts[path][start] = chunk
+
+            if len(parts[path]) == len(segments[path]):
+                finish(path)
+
+    wall = time.perf_counter() - started
+    return summaries, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("videos", nargs="+", help="video files to analyze")
+    parser.add_argument("--out", default="attention_results", help="output directory")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--segment-frames", type=int, default=3000)
+    parser.add_argument("--inference-width", type=int, default=None)
+    parser.add_argument(
+        "--width",
+        type=int,
+        default=None,
+        help="downsample frames to this width before analysis",
+    )
+    parser.add_argument("--adaptive", action="store_true")
+    parser.add_argument(
+        "--no-mirror",
+        action="store_true",
+        help="analyze unmirrored frames (yaw sign flips relative to the live UI)",
+    )
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    options = {"adaptive": args.adaptive, "inference_width": args.inference_width}
+    summaries, wall = analyze_videos(
+        args.videos,
+        args.out,
+        workers=workers,
+        segment_frames=args.segment_frames,
+        analyzer_options=options,
+        mirror=not args.no_mirror,
+        width=args.width,
+    )
+
+    frames = sum(s["frames"] for s in summaries.values())
+    worker_seconds = sum(s["worker_seconds"] for s in summaries.values())
+    failed = [path for path, s in summaries.items() if s["errors"]]
+    if failed:
+        print(f"⚠️ {len(failed)} videos with errors, see their summary.json")
+    print(
+        f"✅ {frames} frames from {len(summaries)} videos in {wall:.1f}s: "
+        f"{frames / wall:.1f} frames/sec total, "
+        f"{frames / worker_seconds if worker_seconds else 0.0:.1f} frames/sec per core "
+        f"({workers} workers)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
 import cv2
-import numpy as np
-import mediapipe as mp
 import threading
+from typing import NamedTuple
+
+import numpy as np
 
-mp_face = mp.solutions.face_mesh
-face_mesh = mp_face.FaceMesh(min_detection_confidence=0.6, min_tracking_confidence=0.5)
+from face_tracker.analyzer import FaceAnalyzer, FaceResult
+from face_tracker.attention import AttentionAggregator
+from face_tracker.capture import FrameGrabber
+from face_tracker.frames import CYAN, GREEN, RED, WHITE, FramePipeline
+from face_tracker.stats import PipelineStats
 
 # Global stop event for camera control
 _camera_stop_event = None
+# Capture stage, attention metrics and timers of the running generate_frames loop
+_frame_grabber = None
+_attention = None
+_pipeline_stats = None
 
 
 def set_camera_stop_event(stop_event):
@@ -16,94 +24,192 @@ def set_camera_stop_event(stop_event):
     _camera_stop_event = stop_event
 
 
-def generate_frames():
-    """Generate camera frames with face tracking - matches original exactly"""
-    global _camera_stop_event
-
-    cap = cv2.VideoCapture(0)
-
-    if not cap.isOpened():
+def get_capture_stats():
+    """Dropped-frame and frame-age counters of the running camera loop"""
+    if _frame_grabber is None:
+        return None
+    return _frame_grabber.stats()
+
+
+class TrackedFrame(NamedTuple):
+    seq: int
+    timestamp: float
+    image: np.ndarray
+    result: FaceResult
+
+
+def _stats_snapshot(stats, grabber):
+    snapshot = stats.snapshot()
+    if grabber is not None:
+        capture = grabber.stats()
+        snapshot["capture"] = capture
+        # Processing can't keep up with the camera if fps trails capture rate
+        snapshot["below_realtime"] = bool(
+            stats.enabled
+            and capture["capture_fps"]
+            and snapshot["fps"] < 0.9 * capture["capture_fps"]
+        )
+    return snapshot
+
+
+def get_pipeline_stats():
+    """Counters, fps and stage timings of the running camera loop"""
+    if _pipeline_stats is None:
+        return None
+    return _stats_snapshot(_pipeline_stats, _frame_grabber)
+
+
+def get_attention_snapshot():
+    """Rolling attention metrics of the running camera loop"""
+    if _attention is None:
+        return None
+    return _attention.snapshot()
+
+
+def generate_frames(
+    adaptive=False,
+    inference_width=None,
+    roi=False,
+    attention=None,
+    stats=None,
+    tier="mesh",
+):
+    """Generate annotated, mirrored RGB camera frames with face tracking
+
+    Frames are reused buffers, see track_frames() which gets the options.
+    """
+    for tracked in track_frames(
+        adaptive=adaptive,
+        inference_width=inference_width,
+        roi=roi,
+        attention=attention,
+        stats=stats,
+        tier=tier,
+    ):
+        yield tracked.image
+
+
+def track_frames(
+    adaptive=False,
+    inference_width=None,
+    roi=False,
+    attention=None,
+    stats=None,
+    tier="mesh",
+):
+    """Annotated camera frames together with their FaceResult
+
+    Yields a TrackedFrame per processed frame; the image is a reused RGB
+    buffer that stays valid for a couple of frames. With ``adaptive=True``
+    FaceMesh runs on a CPU-budgeted cadence and head pose is tracked in
+    between. ``inference_width`` and ``roi`` shrink the image FaceMesh sees
+    and ``tier`` selects the models, see FaceAnalyzer and TIERS. Per-frame
+    results are recorded in ``attention`` (a new AttentionAggregator by
+    default), which get_attention_snapshot() reads. Stage timers and
+    counters go to ``stats`` (a new PipelineStats by default), read through
+    get_pipeline_stats().
+    """
+    global _camera_stop_event, _frame_grabber, _attention, _pipeline_stats
+
+    if stats is None:
+        stats = PipelineStats()
+    # Each loop owns its FaceMesh, the object is not safe to share
+    analyzer = FaceAnalyzer(
+        adaptive=adaptive,
+        inference_width=inference_width,
+        roi=roi,
+        stats=stats,
+        tier=tier,
+    )
+    pipeline = FramePipeline()
+    grabber = FrameGrabber(0)
+
+    if not grabber.start():
         print("Error: Could not open camera")
         return
 
+    _frame_grabber = grabber
+    if attention is None:
+        attention = AttentionAggregator()
+    _attention = attention
+    _pipeline_stats = stats
     print("📹 Camera started")
 
     try:
-        while cap.isOpened():
+        while True:
             # Check if we should stop
             if _camera_stop_event and _camera_stop_event.is_set():
                 print("🛑 Camera stop signal received")
                 break
 
-            ret, frame = cap.read()
-            if not ret:
+            # Always process the newest frame, stale ones are dropped
+            captured = grabber.read(timeout=0.5)
+            if captured is None:
+                if grabber.running:
+                    continue
                 break
 
-            # Exact same processing as original
-            frame = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
-            results = face_mesh.process(frame)
-            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-
-            img_h, img_w, _ = frame.shape
-            face_3d, face_2d = [], []
-
-            if results.multi_face_landmarks:
-                for face_landmarks in results.multi_face_landmarks:
-                    for idx, lm in enumerate(face_landmarks.landmark):
-                        if idx in [33, 263, 1, 61, 291, 199]:
-                            x, y = int(lm.x * img_w), int(lm.y * img_h)
-                            face_2d.append([x, y])
-                            face_3d.append([x, y, lm.z])
-
-                    face_2d = np.array(face_2d, dtype=np.float64)
-                    face_3d = np.array(face_3d, dtype=np.float64)
-
-                    focal_length = img_w
-                    center = (img_w / 2, img_h / 2)
-                    camera_matrix = np.array(
-                        [
-                            [focal_length, 0, center[0]],
-                            [0, focal_length, center[1]],
-                            [0, 0, 1],
-                        ]
-                    )
-                    dist_coeffs = np.zeros((4, 1), dtype=np.float64)
-                    success, rotation_vector, translation_vector = cv2.solvePnP(
-                        face_3d, face_2d, camera_matrix, dist_coeffs
-                    )
-                    rmat = cv2.Rodrigues(rotation_vector)[0]
-                    angles, *_ = cv2.RQDecomp3x3(rmat)
-                    x_angle, y_angle = angles[0] * 360, angles[1] * 360
+            # Mirrored RGB in a reused buffer, annotated in place
+            with stats.time("prepare"):
+                frame = pipeline.prepare(captured.image)
+            result = analyzer.analyze(frame, captured.timestamp)
+            attention.add_result(captured.timestamp, result)
 
-                    if y_angle < -15 or y_angle > 15 or x_angle < -7 or x_angle > 20:
-                        text = "Not Looking Forward"
-                    else:
-                        text = "Looking Forward"
+            pose = result.pose
+            if pose is not None:
+                if pose.looking_forward:
+                    text = "Looking Forward"
+                else:
+                    text = "Not Looking Forward"
 
+                with stats.time("annotate"):
                     cv2.putText(
                         frame,
                         text,
                         (20, 40),
                         cv2.FONT_HERSHEY_SIMPLEX,
                         1,
-                        (0, 0, 255),
+                        RED,
                         2,
                     )
 
-            yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            grabber.mark_output(captured)
+            stats.frame()
+            yield TrackedFrame(captured.seq, captured.timestamp, frame, result)
 
     except Exception as e:
         print(f"Error in camera processing: {e}")
     finally:
-        cap.release()
-        print("📹 Camera stopped and released")
+        grabber.stop()
+        capture = grabber.stats()
+        print(
+            f"📹 Camera stopped and released ({capture['frames_dropped']} of "
+            f"{capture['frames_captured']} frames dropped)"
+        )
 
 
 class CameraManager:
     """Camera manager class for better control"""
 
-    def __init__(self):
-        self.cap = None
+    def __init__(
+        self,
+        adaptive=False,
+        inference_width=None,
+        roi=False,
+        stats_enabled=True,
+        tier="mesh",
+    ):
+        self.stats = PipelineStats(enabled=stats_enabled)
+        self.analyzer = FaceAnalyzer(
+            adaptive=adaptive,
+            inference_width=inference_width,
+            roi=roi,
+            stats=self.stats,
+            tier=tier,
+        )
+        self.pipeline = FramePipeline()
+        self.attention = AttentionAggregator()
+        self.grabber = None
         self.is_running = False
         self.stop_event = threading.Event()
 
@@ -113,17 +219,13 @@ class CameraManager:
             return False
 
         self.stop_event.clear()
-        self.cap = cv2.VideoCapture(0)
+        self.grabber = FrameGrabber(0, width=1280, height=720, fps=30)
 
-        if not self.cap.isOpened():
+        if not self.grabber.start():
             print("Error: Could not open camera")
+            self.grabber = None
             return False
 
-        # Set camera properties
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-        self.cap.set(cv2.CAP_PROP_FPS, 30)
-
         self.is_running = True
         print("📹 Camera manager started")
         return True
@@ -136,94 +238,78 @@ class CameraManager:
         self.stop_event.set()
         self.is_running = False
 
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        if self.grabber:
+            self.grabber.stop()
+            self.grabber = None
 
         print("📹 Camera manager stopped")
 
+    def capture_stats(self):
+        """Dropped-frame and frame-age counters of the capture stage"""
+        if not self.grabber:
+            return None
+        return self.grabber.stats()
+
+    def stats_snapshot(self):
+        """Counters, fps and stage timings, including capture counters"""
+        return _stats_snapshot(self.stats, self.grabber)
+
+    def attention_snapshot(self):
+        """Rolling attention metrics, cheap enough to poll every UI tick"""
+        return self.attention.snapshot()
+
     def get_frame(self):
         """Get a single frame with face tracking"""
-        if not self.is_running or not self.cap:
+        if not self.is_running or not self.grabber:
             return None
 
-        ret, frame = self.cap.read()
-        if not ret:
+        # Newest frame only, anything older has already gone stale
+        captured = self.grabber.read()
+        if captured is None:
             return None
 
-        # Process frame with face tracking (exact same logic as original)
-        frame = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
-        results = face_mesh.process(frame)
-        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-
-        img_h, img_w, _ = frame.shape
-        face_3d, face_2d = [], []
-
-        if results.multi_face_landmarks:
-            for face_landmarks in results.multi_face_landmarks:
-                # Reset arrays for each face
-                face_3d, face_2d = [], []
-
-                for idx, lm in enumerate(face_landmarks.landmark):
-                    if idx in [33, 263, 1, 61, 291, 199]:
-                        x, y = int(lm.x * img_w), int(lm.y * img_h)
-                        face_2d.append([x, y])
-                        face_3d.append([x, y, lm.z])
-
-                # Only proceed if we have the expected number of landmarks
-                if len(face_2d) == 6 and len(face_3d) == 6:
-                    face_2d = np.array(face_2d, dtype=np.float64)
-                    face_3d = np.array(face_3d, dtype=np.float64)
-
-                    focal_length = img_w
-                    center = (img_w / 2, img_h / 2)
-                    camera_matrix = np.array(
-                        [
-                            [focal_length, 0, center[0]],
-                            [0, focal_length, center[1]],
-                            [0, 0, 1],
-                        ]
-                    )
-
-                    dist_coeffs = np.zeros((4, 1), dtype=np.float64)
-                    success, rotation_vector, translation_vector = cv2.solvePnP(
-                        face_3d, face_2d, camera_matrix, dist_coeffs
-                    )
-
-                    if success:
-                        rmat = cv2.Rodrigues(rotation_vector)[0]
-                        angles, *_ = cv2.RQDecomp3x3(rmat)
-                        x_angle, y_angle = angles[0] * 360, angles[1] * 360
-
-                        # Use the exact same logic as original
-                        if (
-                            y_angle < -15
-                            or y_angle > 15
-                            or x_angle < -7
-                            or x_angle > 20
-                        ):
-                            text = "Not Looking Forward"
-                            color = (0, 0, 255)  # Red
-                        else:
-                            text = "Looking Forward"
-                            color = (0, 255, 0)  # Green
-
-                        # Use the same text positioning as original
-                        cv2.putText(
-                            frame, text, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2
-                        )
-
-                        # Add debug info (optional)
-                        debug_text = f"Pitch: {x_angle:.1f}° Yaw: {y_angle:.1f}°"
-                        cv2.putText(
-                            frame,
-                            debug_text,
-                            (20, 80),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            0.6,
-                            (255, 255, 255),
-                            1,
-                        )
+        # Process frame with face tracking, drawing straight onto the RGB frame
+        with self.stats.time("prepare"):
+            frame = self.pipeline.prepare(captured.image)
+        result = self.analyzer.analyze(frame, captured.timestamp)
+        self.attention.add_result(captured.timestamp, result)
+
+        with self.stats.time("annotate"):
+            self._annotate(frame, result)
+
+        self.grabber.mark_output(captured)
+        self.stats.frame()
+        return frame
+
+    def _annotate(self, frame, result):
+        """Draw the attention status and pose onto an RGB frame"""
+        pose = result.pose
+        if result.face_present:
+            if pose is not None:
+                # Use the exact same logic as original
+                if pose.looking_forward:
+                    text = "Looking Forward"
+                    color = GREEN
+                else:
+                    text = "Not Looking Forward"
+                    color = RED
+
+                # Use the same text positioning as original
+                cv2.putText(
+                    frame, text, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2
+                )
+
+                # Add debug info (optional)
+                debug_text = f"Pitch: {pose.pitch:.1f}° Yaw: {pose.yaw:.1f}°"
+                cv2.putText(
+                    frame,
+                    debug_text,
+                    (20, 80),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.6,
+                    WHITE,
+                    1,
+                )
         else:
             # No face detected
             cv2.putText(
@@ -232,8 +318,6 @@ class CameraManager:
                 (20, 40),
                 cv2.FONT_HERSHEY_SIMPLEX,
                 1,
-                (255, 255, 0),
+                CYAN,
                 2,
             )
-
-        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+
+class CapturedFrame(NamedTuple):
+    """A frame grabbed by the capture thread"""
+
+    seq: int
+    timestamp: float
+    image: np.ndarray
+
+
+class FrameGrabber:
+    """Capture thread that keeps a small ring of the newest frames.
+
+    ``cap.read()`` runs on its own thread so a slow inference stage never backs
+    up the driver buffer. ``read()`` always hands out the newest frame; any
+    frames captured since the previous ``read()`` are counted as dropped.
+    """
+
+    def __init__(self, source=0, ring_size=2, width=None, height=None, fps=None):
+        self.source = source
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+        self._cap = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._ring = deque(maxlen=ring_size)
+        self._capture_times = deque(maxlen=60)
+        self._seq = 0
+        self._last_seq = 0
+        self._finished = False
+
+        self.frames_delivered = 0
+        self.frames_dropped = 0
+        self.last_frame_age = 0.0
+        self.last_output_age = 0.0
+
+    def start(self):
+        """Open the capture device and start the capture thread"""
+        if self._thread is not None:
+            return False
+
+        self._cap = cv2.VideoCapture(self.source)
+        if not self._cap.isOpened():
+            self._cap.release()
+            self._cap = None
+            return False
+
+        if self.width:
+            self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            self._cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # Keep the driver queue short, we do our own buffering
+        self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # A fresh event, an old thread still stuck in read() stays stopped
+        self._stop = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(
+            target=self._run, args=(self._cap, self._stop), daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop the capture thread, which releases the device on its way out
+
+        If the thread is still blocked in ``cap.read()`` after the join
+        timeout, the device is released once that read returns rather than
+        from under it.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._cap = None
+        with self._cond:
+            self._ring.clear()
+            self._finished = True
+            self._cond.notify_all()
+
+    @property
+    def running(self):
+        """True while the capture thread is still producing frames"""
+        return self._thread is not None and not self._finished
+
+    def _run(self, cap, stop):
+        try:
+            while not stop.is_set():
+                ret, frame = cap.read()
+                if not ret or stop.is_set():
+                    break
+                now = time.monotonic()
+                with self._cond:
+                    self._seq += 1
+                    self._ring.append(CapturedFrame(self._seq, now, frame))
+                    self._capture_times.append(now)
+                    self._cond.notify()
+        finally:
+            cap.release()
+            with self._cond:
+                # A thread outliving stop() must not end a newer capture
+                if stop is self._stop:
+                    self._finished = True
+                self._cond.notify_all()
+
+    def read(self, timeout=1.0):
+        """Return the newest frame not yet handed out.
+
+        Returns None if no new frame arrives within ``timeout`` or capture has
+        ended; check ``running`` to tell the two apart.
+        """
+        with self._cond:
+            while not self._ring or self._ring[-1].seq <= self._last_seq:
+                if self._finished:
+                    return None
+                if not self._cond.wait(timeout):
+                    return None
+
+            frame = self._ring[-1]
+            self.frames_dropped += frame.seq - self._last_seq - 1
+            self._last_seq = frame.seq
+            self.frames_delivered += 1
+
+        self.last_frame_age = time.monotonic() - frame.timestamp
+        return frame
+
+    def frame_age(self, frame):
+        """Seconds since ``frame`` was captured"""
+        return time.monotonic() - frame.timestamp
+
+    def mark_output(self, frame):
+        """Record the age of ``frame`` as it leaves the processing pipeline"""
+        self.last_output_age = self.frame_age(frame)
+
+    def stats(self):
+        """Snapshot of capture counters"""
+        with self._cond:
+            times = list(self._capture_times)
+        capture_fps = 0.0
+        if len(times) > 1 and times[-1] > times[0]:
+            capture_fps = (len(times) - 1) / (times[-1] - times[0])
+        return {
+            "capture_fps": capture_fps,
+            "frames_captured": self._seq,
+            "frames_delivered": self.frames_delivered,
+            "frames_dropped": self.frames_dropped,
+            "last_frame_age_ms": self.last_frame_age * 1000.0,
+            "last_output_age_ms": self.last_output_age * 1000.0,
+        }
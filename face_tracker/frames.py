@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+# Overlay colors, frames are annotated in RGB
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+WHITE = (255, 255, 255)
+CYAN = (0, 255, 255)
+
+
+class FramePipeline:
+    """Turns BGR camera frames into mirrored RGB frames without allocating.
+
+    Color is converted once into a preallocated buffer and mirrored into one
+    of ``output_buffers`` rotating output buffers, which are annotated in
+    place and handed out as is. An output buffer is reused ``output_buffers``
+    frames later, so callers that keep frames around must copy them.
+
+    ``prepare(..., width=...)`` shrinks the BGR frame first (into another
+    reused buffer), so the conversion runs on the smaller image.
+    """
+
+    def __init__(self, output_buffers=3):
+        self.output_buffers = output_buffers
+        self._shape = None
+        self._rgb = None
+        self._small = None
+        self._outputs = []
+        self._next = 0
+
+    def _allocate(self, shape):
+        self._shape = shape
+        self._rgb = np.empty(shape, dtype=np.uint8)
+        self._outputs = [
+            np.empty(shape, dtype=np.uint8) for _ in range(self.output_buffers)
+        ]
+        self._next = 0
+
+    def prepare(self, bgr, mirror=True, width=None):
+        """Mirrored RGB copy of ``bgr`` in the next output buffer"""
+        if width and bgr.shape[1] > width:
+            h, w = bgr.shape[:2]
+            shape = (max(1, round(h * width / w)), width, 3)
+            if self._small is None or self._small.shape != shape:
+                self._small = np.empty(shape, dtype=np.uint8)
+            cv2.resize(
+                bgr, (width, shape[0]), dst=self._small, interpolation=cv2.INTER_LINEAR
+            )
+            bgr = self._small
+
+        if bgr.shape != self._shape:
+            self._allocate(bgr.shape)
+
+        out = self._outputs[self._next]
+        self._next = (self._next + 1) % self.output_buffers
+
+        if mirror:
+            cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            cv2.flip(self._rgb, 1, dst=out)
+        else:
+            cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=out)
+        return out
@@ -0,0 +1,129 @@
+import math
+import time
+from typing import NamedTuple
+
+import cv2
+
+from face_tracker.analyzer import FaceAnalyzer
+from face_tracker.attention import AttentionAggregator
+from face_tracker.capture import FrameGrabber
+from face_tracker.frames import FramePipeline
+
+
+class PoseSample(NamedTuple):
+    """Structured per-frame result, angles are NaN without a pose"""
+
+    seq: int
+    timestamp: float
+    face_present: bool
+    pitch: float
+    yaw: float
+    roll: float
+    looking_forward: bool
+    inferred: bool
+
+
+class HeadlessTracker:
+    """Pose and attention results without drawing or display frames.
+
+    Meant for proctoring workers that never show video: each BGR frame is
+    optionally shrunk to ``width``, converted to RGB once for FaceMesh and
+    analyzed; nothing is annotated and nothing is converted back for output.
+    Frames are not mirrored unless ``mirror=True``, which only flips the sign
+    of yaw and roll relative to the live UI. With ``attention=True`` results
+    also feed an AttentionAggregator. Other options go to FaceAnalyzer.
+    """
+
+    def __init__(self, width=None, mirror=False, attention=False, **analyzer_options):
+        self.width = width
+        self.mirror = mirror
+        self.analyzer = FaceAnalyzer(**analyzer_options)
+        self.pipeline = FramePipeline(output_buffers=1)
+        self.attention = AttentionAggregator() if attention else None
+
+    def process(self, bgr, timestamp=None, seq=0):
+        """Analyze one BGR frame, returns a PoseSample"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        rgb = self.pipeline.prepare(bgr, mirror=self.mirror, width=self.width)
+        result = self.analyzer.analyze(rgb, timestamp)
+        if self.attention is not None:
+            self.attention.add_result(timestamp, result)
+
+        pose = result.pose
+        if pose is None:
+            return PoseSample(
+                seq,
+                timestamp,
+                result.face_present,
+                math.nan,
+                math.nan,
+                math.nan,
+                False,
+                result.inferred,
+            )
+        return PoseSample(
+            seq,
+            timestamp,
+            result.face_present,
+            pose.pitch,
+            pose.yaw,
+            pose.roll,
+            pose.looking_forward,
+            result.inferred,
+        )
+
+    def attention_snapshot(self):
+        """Rolling attention metrics, None unless created with attention=True"""
+        if self.attention is None:
+            return None
+        return self.attention.snapshot()
+
+
+def track_video(path, start=0, end=None, fps=None, **options):
+    """Yield a PoseSample per frame of a video file, timestamps from its fps
+
+    Options are passed to HeadlessTracker.
+    """
+    tracker = HeadlessTracker(**options)
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video {path}")
+    fps = fps or cap.get(cv2.CAP_PROP_FPS) or 30.0
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    try:
+        index = start
+        while end is None or index < end:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield tracker.process(frame, index / fps, index)
+            index += 1
+    finally:
+        cap.release()
+
+
+def track_camera(source=0, stop_event=None, **options):
+    """Yield a PoseSample per processed camera frame until ``stop_event`` is set
+
+    Stale frames are dropped by the capture thread, as in generate_frames.
+    Options are passed to HeadlessTracker.
+    """
+    tracker = HeadlessTracker(**options)
+    grabber = FrameGrabber(source)
+    if not grabber.start():
+        print("Error: Could not open camera")
+        return
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            captured = grabber.read(timeout=0.5)
+            if captured is None:
+                if grabber.running:
+                    continue
+                break
+            yield tracker.process(captured.image, captured.timestamp, captured.seq)
+    finally:
+        grabber.stop()
@@ -0,0 +1,227 @@
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+import traceback
+from typing import Any, NamedTuple, Optional
+
+from face_tracker.analyzer import FaceAnalyzer, FaceResult
+
+_STOP = "stop"
+_FRAME = "frame"
+_RELEASE = "release"
+
+
+class PoolResult(NamedTuple):
+    """Result delivered to the pool callback"""
+
+    stream_id: Any
+    seq: int
+    timestamp: Optional[float]
+    result: Optional[FaceResult]
+    error: Optional[str]
+
+
+def _worker_main(tasks, results, analyzer_options):
+    """Worker process loop, one FaceAnalyzer (and FaceMesh) per stream"""
+    analyzers = {}
+    while True:
+        message = tasks.get()
+        kind = message[0]
+        if kind == _STOP:
+            break
+        if kind == _RELEASE:
+            analyzers.pop(message[1], None)
+            continue
+
+        _, stream_id, seq, timestamp, frame = message
+        try:
+            analyzer = analyzers.get(stream_id)
+            if analyzer is None:
+                analyzer = analyzers[stream_id] = FaceAnalyzer(**analyzer_options)
+            result = analyzer.analyze(frame, timestamp)
+            results.put(PoolResult(stream_id, seq, timestamp, result, None))
+        except Exception:
+            results.put(
+                PoolResult(stream_id, seq, timestamp, None, traceback.format_exc())
+            )
+
+
+class FaceMeshPool:
+    """Analyzes frames from many camera streams in worker processes.
+
+    Every stream is pinned to one worker, which owns that stream's FaceMesh,
+    so results of a stream reach ``callback(PoolResult)`` in submission order.
+    At most ``max_pending`` frames are in flight; ``submit`` blocks beyond
+    that, or returns False when ``block=False``. The callback runs on the
+    pool's collector thread. ``analyzer_options`` are passed to FaceAnalyzer.
+
+    Workers are checked every ``check_interval`` seconds. Frames in flight
+    on a worker that died are delivered with an error and their slots freed;
+    its streams move to the remaining workers with a fresh FaceMesh.
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        max_pending=None,
+        callback=None,
+        analyzer_options=None,
+        check_interval=0.5,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.callback = callback
+        self.analyzer_options = analyzer_options or {}
+        self.check_interval = check_interval
+
+        self._ctx = mp.get_context("spawn")
+        self._processes = []
+        self._task_queues = []
+        self._results = None
+        self._collector = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._assignment = {}
+        self._load = [0] * self.workers
+        self._seq = {}
+        self._pending = 0
+        # (stream_id, seq) -> (worker, timestamp) of frames not yet delivered
+        self._in_flight = {}
+        self._dead = set()
+        self._closing = False
+
+    def start(self):
+        """Spawn the worker processes"""
+        self._results = self._ctx.Queue()
+        for _ in range(self.workers):
+            tasks = self._ctx.Queue()
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(tasks, self._results, self.analyzer_options),
+                daemon=True,
+            )
+            process.start()
+            self._task_queues.append(tasks)
+            self._processes.append(process)
+
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+        print(f"🧠 FaceMesh pool started with {self.workers} workers")
+
+    def _worker_for(self, stream_id, timestamp):
+        with self._lock:
+            worker = self._assignment.get(stream_id)
+            if worker is None or worker in self._dead:
+                live = [w for w in range(self.workers) if w not in self._dead]
+                if not live:
+                    raise RuntimeError("All FaceMesh pool workers died")
+                worker = min(live, key=lambda w: self._load[w])
+                self._assignment[stream_id] = worker
+                self._load[worker] += 1
+                self._seq.setdefault(stream_id, 0)
+            seq = self._seq[stream_id]
+            self._seq[stream_id] = seq + 1
+            self._in_flight[(stream_id, seq)] = (worker, timestamp)
+            self._pending += 1
+        return worker, seq
+
+    def submit(self, stream_id, frame, timestamp=None, block=True, timeout=None):
+        """Queue an RGB frame of ``stream_id``, False if the pool is full"""
+        if not self._slots.acquire(block, timeout):
+            return False
+        try:
+            worker, seq = self._worker_for(stream_id, timestamp)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        self._task_queues[worker].put((_FRAME, stream_id, seq, timestamp, frame))
+        return True
+
+    def release_stream(self, stream_id):
+        """Drop the worker-side state of a finished stream"""
+        with self._lock:
+            worker = self._assignment.pop(stream_id, None)
+            self._seq.pop(stream_id, None)
+            if worker is None or worker in self._dead:
+                return
+            self._load[worker] -= 1
+        self._task_queues[worker].put((_RELEASE, stream_id))
+
+    @property
+    def pending(self):
+        """Frames submitted but not yet delivered"""
+        return self._pending
+
+    def _deliver(self, item):
+        with self._lock:
+            if self._in_flight.pop((item.stream_id, item.seq), None) is None:
+                # Already failed when its worker died
+                return
+            self._pending -= 1
+        self._slots.release()
+        if self.callback:
+            try:
+                self.callback(item)
+            except Exception as e:
+                print(f"Error in FaceMesh pool callback: {e}")
+
+    def _check_workers(self):
+        """Fail the frames of workers that died, e.g. killed by the OOM killer"""
+        for worker, process in enumerate(self._processes):
+            if worker in self._dead or process.is_alive():
+                continue
+            with self._lock:
+                self._dead.add(worker)
+                self._load[worker] = 0
+                lost = sorted(
+                    (
+                        (key, timestamp)
+                        for key, (owner, timestamp) in self._in_flight.items()
+                        if owner == worker
+                    ),
+                    key=lambda entry: entry[0][1],
+                )
+            # Frames nobody will read must not hold up interpreter exit
+            self._task_queues[worker].cancel_join_thread()
+            error = f"FaceMesh worker {worker} died (exit code {process.exitcode})"
+            print(f"Error in FaceMesh pool: {error}, {len(lost)} frames lost")
+            for (stream_id, seq), timestamp in lost:
+                self._deliver(PoolResult(stream_id, seq, timestamp, None, error))
+
+    def _collect(self):
+        next_check = time.monotonic() + self.check_interval
+        while True:
+            try:
+                item = self._results.get(timeout=self.check_interval)
+                if item is None:
+                    break
+                self._deliver(item)
+            except queue.Empty:
+                pass
+            if not self._closing and time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + self.check_interval
+
+    def close(self):
+        """Finish queued frames and stop the workers"""
+        self._closing = True
+        for worker, tasks in enumerate(self._task_queues):
+            if worker not in self._dead:
+                tasks.put((_STOP,))
+        for process in self._processes:
+            process.join()
+        if self._results is not None:
+            self._results.put(None)
+            self._collector.join()
+        self._processes.clear()
+        self._task_queues.clear()
+        print("🧠 FaceMesh pool stopped")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,129 @@
+import functools
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+# FaceMesh landmarks used for head pose, in mesh order: nose tip, eye corners,
+# mouth corners and chin
+KEY_LANDMARKS = (1, 33, 61, 199, 263, 291)
+KEY_LANDMARK_INDEX = np.array(KEY_LANDMARKS, dtype=np.intp)
+# Forehead, chin and both cheek edges, enough to bound the face
+BOX_LANDMARKS = (10, 152, 234, 454)
+
+# Attention thresholds in the (scaled) angle units used since the first version
+PITCH_LIMITS = (-7, 20)
+YAW_LIMITS = (-15, 15)
+
+
+class HeadPose(NamedTuple):
+    """Head pose of a single face"""
+
+    pitch: float
+    yaw: float
+    roll: float
+    looking_forward: bool
+    rotation_vector: np.ndarray
+    translation_vector: np.ndarray
+
+
+@functools.lru_cache(maxsize=8)
+def camera_intrinsics(img_w, img_h):
+    """Pinhole camera matrix and zero distortion for a frame resolution.
+
+    Cached per resolution; the returned arrays are read-only.
+    """
+    camera_matrix = np.array(
+        [
+            [img_w, 0, img_w / 2],
+            [0, img_w, img_h / 2],
+            [0, 0, 1],
+        ],
+        dtype=np.float64,
+    )
+    dist_coeffs = np.zeros((4, 1), dtype=np.float64)
+    camera_matrix.setflags(write=False)
+    dist_coeffs.setflags(write=False)
+    return camera_matrix, dist_coeffs
+
+
+def _to_pixels(raw, img_w, img_h):
+    face_3d = np.array(raw, dtype=np.float64)
+    # Truncate to whole pixels like the original int() conversion
+    np.trunc(face_3d[:, :2] * (img_w, img_h), out=face_3d[:, :2])
+    face_2d = np.ascontiguousarray(face_3d[:, :2])
+    return face_2d, face_3d
+
+
+def gather_landmarks(face_landmarks, indices=KEY_LANDMARKS):
+    """(len(indices), 3) float64 array of normalized landmark coordinates"""
+    landmarks = face_landmarks.landmark
+    return np.array(
+        [(landmarks[i].x, landmarks[i].y, landmarks[i].z) for i in indices],
+        dtype=np.float64,
+    )
+
+
+def key_points(face_landmarks, img_w, img_h):
+    """Gather the key landmarks as (face_2d, face_3d) float64 arrays"""
+    return _to_pixels(gather_landmarks(face_landmarks), img_w, img_h)
+
+
+def key_points_from_array(landmarks, img_w, img_h):
+    """Same as key_points for an (N, 3) array of normalized landmarks"""
+    return _to_pixels(landmarks[KEY_LANDMARK_INDEX], img_w, img_h)
+
+
+def key_points_from_normalized(raw, img_w, img_h):
+    """Same as key_points for the already gathered key landmarks"""
+    return _to_pixels(raw, img_w, img_h)
+
+
+def is_looking_forward(pitch, yaw):
+    """Attention decision for a head pose"""
+    return (
+        PITCH_LIMITS[0] <= pitch <= PITCH_LIMITS[1]
+        and YAW_LIMITS[0] <= yaw <= YAW_LIMITS[1]
+    )
+
+
+def solve_head_pose(face_2d, face_3d, img_w, img_h, rvec=None, tvec=None):
+    """Run solvePnP on key points, returns a HeadPose or None on failure.
+
+    Passing ``rvec``/``tvec`` seeds the solver with a previous pose.
+    """
+    camera_matrix, dist_coeffs = camera_intrinsics(img_w, img_h)
+    if rvec is not None and tvec is not None:
+        success, rotation_vector, translation_vector = cv2.solvePnP(
+            face_3d,
+            face_2d,
+            camera_matrix,
+            dist_coeffs,
+            rvec.copy(),
+            tvec.copy(),
+            useExtrinsicGuess=True,
+        )
+    else:
+        success, rotation_vector, translation_vector = cv2.solvePnP(
+            face_3d, face_2d, camera_matrix, dist_coeffs
+        )
+    if not success:
+        return None
+
+    rmat = cv2.Rodrigues(rotation_vector)[0]
+    angles, *_ = cv2.RQDecomp3x3(rmat)
+    pitch, yaw, roll = angles[0] * 360, angles[1] * 360, angles[2] * 360
+    return HeadPose(
+        pitch,
+        yaw,
+        roll,
+        is_looking_forward(pitch, yaw),
+        rotation_vector,
+        translation_vector,
+    )
+
+
+def estimate_head_pose(face_landmarks, img_w, img_h):
+    """Head pose for one set of FaceMesh landmarks, or None if PnP fails"""
+    face_2d, face_3d = key_points(face_landmarks, img_w, img_h)
+    return solve_head_pose(face_2d, face_3d, img_w, img_h)
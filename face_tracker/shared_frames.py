@@ -0,0 +1,458 @@
+import math
+import multiprocessing as mp
+import time
+import weakref
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+_HEADER = np.dtype(
+    [
+        ("latest", np.int64),
+        ("height", np.int64),
+        ("width", np.int64),
+        ("slots", np.int64),
+        ("closed", np.int64),
+        ("fps", np.float64),
+        ("inference_ms", np.float64),
+        ("frames_captured", np.int64),
+        ("frames_dropped", np.int64),
+        ("output_age_ms", np.float64),
+        ("pnp_failures", np.int64),
+        ("below_realtime", np.int64),
+        # AttentionAggregator.snapshot() of the camera process
+        ("attention_ready", np.int64),
+        ("window_s", np.float64),
+        ("window_frames", np.int64),
+        ("window_face_pct", np.float64),
+        ("window_forward_pct", np.float64),
+        ("window_mean_pitch", np.float64),
+        ("window_mean_yaw", np.float64),
+        ("session_s", np.float64),
+        ("total_frames", np.int64),
+        ("total_face_pct", np.float64),
+        ("total_forward_pct", np.float64),
+        ("look_away_episodes", np.int64),
+        ("look_away_s", np.float64),
+        ("looking_away", np.int64),
+    ],
+    align=True,
+)
+
+_ATTENTION_FIELDS = [
+    "window_s",
+    "window_frames",
+    "window_face_pct",
+    "window_forward_pct",
+    "window_mean_pitch",
+    "window_mean_yaw",
+    "session_s",
+    "total_frames",
+    "total_face_pct",
+    "total_forward_pct",
+    "look_away_episodes",
+    "look_away_s",
+    "looking_away",
+]
+
+_SLOT = np.dtype(
+    [
+        ("seq", np.int64),
+        ("timestamp", np.float64),
+        ("face_present", np.int64),
+        ("looking_forward", np.int64),
+        ("pitch", np.float64),
+        ("yaw", np.float64),
+        ("roll", np.float64),
+    ],
+    align=True,
+)
+
+
+class SharedFrame(NamedTuple):
+    seq: int
+    timestamp: float
+    image: np.ndarray
+    face_present: bool
+    pitch: float
+    yaw: float
+    roll: float
+    looking_forward: bool
+
+
+def _frames_offset(slots):
+    # Frame data starts on a cache line after the header and slot records
+    offset = _HEADER.itemsize + slots * _SLOT.itemsize
+    return (offset + 63) // 64 * 64
+
+
+class SharedFrameRing:
+    """Annotated RGB frames and pose results in a shared-memory ring.
+
+    One process writes, any number read. Each slot carries the sequence
+    number of the frame it holds; the writer zeroes it while copying pixels
+    in and publishes the new number in the header once the slot is complete.
+    ``read()`` returns numpy views straight into the shared block, so a frame
+    is only copied by the writer. A view stays intact until the writer comes
+    round to its slot again, ``slots - 1`` frames later; ``is_current()``
+    tells whether that has happened.
+    """
+
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((), dtype=_HEADER, buffer=shm.buf)
+        height = int(self.header["height"])
+        width = int(self.header["width"])
+        self.slots = int(self.header["slots"])
+        self.meta = np.ndarray(
+            (self.slots,), dtype=_SLOT, buffer=shm.buf, offset=_HEADER.itemsize
+        )
+        self.images = np.ndarray(
+            (self.slots, height, width, 3),
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=_frames_offset(self.slots),
+        )
+        self._written = int(self.header["latest"])
+
+    @classmethod
+    def create(cls, height, width, slots=4):
+        """Allocate a new ring, the caller owns and eventually unlinks it"""
+        size = _frames_offset(slots) + slots * height * width * 3
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = np.ndarray((), dtype=_HEADER, buffer=shm.buf)
+        header[()] = 0
+        header["height"] = height
+        header["width"] = width
+        header["slots"] = slots
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Open a ring created by another process"""
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def closed(self):
+        return self.header is None or bool(self.header["closed"])
+
+    def write(self, timestamp, image, result):
+        """Publish an annotated frame and its FaceResult"""
+        seq = self._written + 1
+        slot = (seq - 1) % self.slots
+        meta = self.meta
+
+        meta["seq"][slot] = 0
+        np.copyto(self.images[slot], image)
+        meta["timestamp"][slot] = timestamp
+        meta["face_present"][slot] = result.face_present
+        pose = result.pose
+        if pose is None:
+            meta["looking_forward"][slot] = 0
+            meta["pitch"][slot] = meta["yaw"][slot] = meta["roll"][slot] = math.nan
+        else:
+            meta["looking_forward"][slot] = pose.looking_forward
+            meta["pitch"][slot] = pose.pitch
+            meta["yaw"][slot] = pose.yaw
+            meta["roll"][slot] = pose.roll
+        meta["seq"][slot] = seq
+
+        self.header["latest"] = seq
+        self._written = seq
+
+    def publish_stats(self, snapshot):
+        """Copy the fields format_summary shows from a pipeline stats snapshot"""
+        if not snapshot:
+            return
+        header = self.header
+        header["fps"] = snapshot["fps"]
+        inference = snapshot["stages"].get("inference")
+        header["inference_ms"] = inference["recent_ms"] if inference else 0.0
+        header["pnp_failures"] = snapshot["counters"].get("pnp_failures", 0)
+        capture = snapshot.get("capture")
+        if capture:
+            header["frames_captured"] = capture["frames_captured"]
+            header["frames_dropped"] = capture["frames_dropped"]
+            header["output_age_ms"] = capture["last_output_age_ms"]
+        header["below_realtime"] = bool(snapshot.get("below_realtime"))
+
+    def publish_attention(self, snapshot):
+        """Copy an AttentionAggregator snapshot into the header"""
+        if not snapshot:
+            return
+        header = self.header
+        for field in _ATTENTION_FIELDS:
+            value = snapshot[field]
+            # Means are None before any pose, NaN in the header
+            header[field] = math.nan if value is None else value
+        header["attention_ready"] = 1
+
+    def read(self, after=0):
+        """Newest complete frame with a sequence number above ``after``, or None"""
+        if self.header is None:
+            return None
+        seq = int(self.header["latest"])
+        if seq <= after:
+            return None
+        slot = (seq - 1) % self.slots
+        meta = self.meta[slot].copy()
+        if meta["seq"] != seq:
+            # The writer has lapped the reader and is refilling this slot
+            return None
+        return SharedFrame(
+            seq,
+            float(meta["timestamp"]),
+            self.images[slot],
+            bool(meta["face_present"]),
+            float(meta["pitch"]),
+            float(meta["yaw"]),
+            float(meta["roll"]),
+            bool(meta["looking_forward"]),
+        )
+
+    def is_current(self, frame):
+        """Whether the slot behind ``frame.image`` still holds that frame"""
+        if self.header is None:
+            return False
+        return int(self.meta["seq"][(frame.seq - 1) % self.slots]) == frame.seq
+
+    def stats_snapshot(self):
+        """Writer stats in the shape format_summary expects"""
+        if self.header is None:
+            return None
+        header = self.header.copy()
+        stages = {}
+        if header["inference_ms"]:
+            stages["inference"] = {"recent_ms": float(header["inference_ms"])}
+        return {
+            "enabled": True,
+            "fps": float(header["fps"]),
+            "counters": {"pnp_failures": int(header["pnp_failures"])},
+            "stages": stages,
+            "capture": {
+                "frames_captured": int(header["frames_captured"]),
+                "frames_dropped": int(header["frames_dropped"]),
+                "last_output_age_ms": float(header["output_age_ms"]),
+            },
+            "below_realtime": bool(header["below_realtime"]),
+        }
+
+    def attention_snapshot(self):
+        """Writer's attention metrics in AttentionAggregator.snapshot() shape"""
+        if self.header is None:
+            return None
+        header = self.header.copy()
+        if not header["attention_ready"]:
+            return None
+        snapshot = {field: header[field].item() for field in _ATTENTION_FIELDS}
+        for field in ("window_mean_pitch", "window_mean_yaw"):
+            if math.isnan(snapshot[field]):
+                snapshot[field] = None
+        snapshot["looking_away"] = bool(snapshot["looking_away"])
+        return snapshot
+
+    def close(self):
+        """Detach from the block, unlinking it if this side created it"""
+        if self.header is None:
+            return
+        self.header = self.meta = self.images = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A reader still holds a frame view; the mapping goes with it
+            pass
+        if self.owner:
+            self.shm.unlink()
+
+
+def _camera_main(conn, stop_event, options):
+    """Camera process: track frames and publish them into the parent's ring"""
+    import cv2
+
+    from face_tracker.camera import (
+        get_attention_snapshot,
+        get_pipeline_stats,
+        set_camera_stop_event,
+        track_frames,
+    )
+
+    set_camera_stop_event(stop_event)
+    parent = mp.parent_process()
+    ring = None
+    try:
+        for count, tracked in enumerate(track_frames(**options), start=1):
+            if ring is None:
+                # The ring is sized from the first frame the camera delivers
+                conn.send(tracked.image.shape[:2])
+                name = conn.recv()
+                if name is None:
+                    break
+                ring = SharedFrameRing.attach(name)
+            image = tracked.image
+            height, width = ring.images.shape[1:3]
+            if image.shape[:2] != (height, width):
+                # The camera switched resolution, the ring keeps its size
+                image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+            ring.write(tracked.timestamp, image, tracked.result)
+            if count % 15 == 0:
+                ring.publish_stats(get_pipeline_stats())
+                ring.publish_attention(get_attention_snapshot())
+                if parent is not None and not parent.is_alive():
+                    # Nobody left to stop us, give the webcam back
+                    stop_event.set()
+        else:
+            if ring is None:
+                conn.send(None)
+    finally:
+        if ring is not None:
+            ring.header["closed"] = 1
+            ring.close()
+        conn.close()
+
+
+def _shutdown(process, stop_event, ring, timeout=5.0):
+    """Stop a camera process and free its ring, see SharedCamera.stop()"""
+    stop_event.set()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    if ring is not None:
+        ring.close()
+
+
+class SharedCamera:
+    """Face tracker running in its own process.
+
+    FaceMesh, OpenCV and drawing happen in a spawned process, so they do not
+    compete for the GIL with the UI or the voice assistant. Frames, pose
+    results, stats and attention metrics come back through a SharedFrameRing
+    this object owns. Options are passed to track_frames() in the camera
+    process.
+
+    The process and ring are also shut down when this object is garbage
+    collected (an abandoned UI session) or the interpreter exits, and the
+    camera process stops by itself once its parent is gone.
+    """
+
+    def __init__(self, slots=4, **options):
+        self.slots = slots
+        self.options = options
+        self.process = None
+        self.ring = None
+        self.stop_event = None
+        self._finalizer = None
+        self.torn_frames = 0
+
+    def start(self, timeout=15.0):
+        """Spawn the camera process and wait for its first frame"""
+        if self.process is not None:
+            return False
+
+        ctx = mp.get_context("spawn")
+        self.stop_event = ctx.Event()
+        conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_camera_main,
+            args=(child_conn, self.stop_event, self.options),
+            name="face-tracker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+        try:
+            shape = conn.recv() if conn.poll(timeout) else None
+        except EOFError:
+            shape = None
+        if shape is None:
+            print("Error: Could not start camera process")
+            conn.close()
+            self.stop()
+            return False
+
+        self.ring = SharedFrameRing.create(*shape, slots=self.slots)
+        # Runs on garbage collection or at exit unless stop() came first
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self.process, self.stop_event, self.ring
+        )
+        conn.send(self.ring.name)
+        conn.close()
+        print("📹 Camera process started")
+        return True
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.is_alive()
+
+    def read(self, after=0):
+        """Newest SharedFrame after sequence number ``after``, or None"""
+        if self.ring is None:
+            return None
+        return self.ring.read(after)
+
+    def frames(self, stop_event=None, poll_interval=0.002):
+        """Yield each new annotated frame
+
+        Frames are copied out of the ring into one reused buffer. A frame the
+        camera process started overwriting during the copy is skipped and
+        counted in ``torn_frames``. Ends when ``stop_event`` is set, the
+        camera process exits or stop() is called.
+        """
+        last = 0
+        image = None
+        while True:
+            ring = self.ring
+            if ring is None:
+                return
+            if stop_event is not None and stop_event.is_set():
+                return
+            frame = ring.read(last)
+            if frame is None:
+                if ring.closed or not self.running:
+                    return
+                time.sleep(poll_interval)
+                continue
+            last = frame.seq
+            if image is None or image.shape != frame.image.shape:
+                image = np.empty_like(frame.image)
+            np.copyto(image, frame.image)
+            intact = ring.is_current(frame)
+            # Don't hold a view into the shared block while the consumer runs
+            del frame
+            if not intact:
+                self.torn_frames += 1
+                continue
+            yield image
+
+    def stats_snapshot(self):
+        """fps, inference cost and capture counters of the camera process"""
+        if self.ring is None:
+            return None
+        return self.ring.stats_snapshot()
+
+    def attention_snapshot(self):
+        """Rolling attention metrics of the camera process, or None"""
+        if self.ring is None:
+            return None
+        return self.ring.attention_snapshot()
+
+    def stop(self, timeout=5.0):
+        """Stop the camera process and free the shared block"""
+        if self.process is None:
+            return
+
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+        process, self.process = self.process, None
+        ring, self.ring = self.ring, None
+        _shutdown(process, self.stop_event, ring, timeout)
+        print("📹 Camera process stopped")
@@ -0,0 +1,125 @@
+import contextlib
+import threading
+import time
+from collections import deque
+
+_NO_TIMER = contextlib.nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ("stats", "stage", "start")
+
+    def __init__(self, stats, stage):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class PipelineStats:
+    """Counters and stage timers for the face tracking loop.
+
+    ``count()`` bumps a named counter, ``time(stage)`` is a context manager
+    that records the stage duration and ``frame()`` marks a finished frame for
+    the fps estimate. With ``enabled=False`` all of them return immediately
+    (``time()`` hands back a shared no-op context), so the instrumented loop
+    pays a single attribute check per call.
+    """
+
+    def __init__(self, enabled=True, window=120):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._frame_times = deque(maxlen=window)
+        self._counters = {}
+        self._stages = {}
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def time(self, stage):
+        if not self.enabled:
+            return _NO_TIMER
+        return _StageTimer(self, stage)
+
+    def record(self, stage, seconds):
+        """Add one duration sample to ``stage``"""
+        if not self.enabled:
+            return
+        ms = seconds * 1000.0
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                self._stages[stage] = [1, ms, ms, ms]
+            else:
+                entry[0] += 1
+                entry[1] += ms
+                entry[2] = 0.1 * ms + 0.9 * entry[2]
+                entry[3] = max(entry[3], ms)
+
+    def frame(self):
+        """Mark the end of one processed frame"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._frame_times.append(now)
+            self._counters["frames_processed"] = (
+                self._counters.get("frames_processed", 0) + 1
+            )
+
+    def reset(self):
+        with self._lock:
+            self._frame_times.clear()
+            self._counters.clear()
+            self._stages.clear()
+
+    def snapshot(self):
+        """Counters, recent fps and per-stage ms (count, mean, recent, max)"""
+        with self._lock:
+            times = self._frame_times
+            fps = 0.0
+            if len(times) > 1 and times[-1] > times[0]:
+                fps = (len(times) - 1) / (times[-1] - times[0])
+            return {
+                "enabled": self.enabled,
+                "fps": fps,
+                "counters": dict(self._counters),
+                "stages": {
+                    stage: {
+                        "count": count,
+                        "mean_ms": total / count,
+                        "recent_ms": recent,
+                        "max_ms": worst,
+                    }
+                    for stage, (count, total, recent, worst) in self._stages.items()
+                },
+            }
+
+
+def format_summary(snapshot):
+    """One-line fps / inference cost summary of a camera stats snapshot"""
+    if not snapshot:
+        return "No camera stats yet"
+    parts = [f"{snapshot['fps']:.1f} fps"]
+    inference = snapshot["stages"].get("inference")
+    if inference:
+        parts.append(f"inference {inference['recent_ms']:.1f} ms")
+    capture = snapshot.get("capture")
+    if capture:
+        parts.append(f"{capture['frames_dropped']} dropped")
+        parts.append(f"latency {capture['last_output_age_ms']:.0f} ms")
+    failures = snapshot["counters"].get("pnp_failures")
+    if failures:
+        parts.append(f"{failures} PnP failures")
+    if snapshot.get("below_realtime"):
+        parts.append("below real time")
+    return " | ".join(parts)
@@ -0,0 +1,249 @@
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+BOUNDARY = "frame"
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    """Serves /<token>/stream (multipart MJPEG) and /<token>/frame.jpg"""
+
+    def do_GET(self):
+        streamer = self.server.streamer
+        path = self.path.split("?", 1)[0]
+        prefix = f"/{streamer.token}"
+        if path in (prefix, f"{prefix}/", f"{prefix}/stream"):
+            self._stream(streamer)
+        elif path == f"{prefix}/frame.jpg":
+            seq, jpeg = streamer.latest()
+            if jpeg is None:
+                self.send_error(503, "No frame yet")
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(jpeg)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(jpeg)
+        else:
+            self.send_error(404)
+
+    def _stream(self, streamer):
+        self.send_response(200)
+        self.send_header(
+            "Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}"
+        )
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        streamer._client_joined()
+        seq = 0
+        try:
+            while True:
+                # Slow clients skip to the newest frame instead of queueing
+                seq, jpeg = streamer.wait_frame(seq)
+                if jpeg is None:
+                    break
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(jpeg)}\r\n\r\n".encode()
+                )
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            streamer._client_left()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MJPEGStreamer:
+    """Encode annotated frames once and serve them to browsers as MJPEG.
+
+    A background thread pulls RGB frames from ``frames`` (generate_frames(),
+    SharedCamera.frames() or any iterable), optionally scales them to
+    ``width``, JPEG-encodes them at ``quality`` and keeps the latest result.
+    Every connected client is sent those same bytes, so the encode cost does
+    not grow with viewers and a slow connection only skips frames.
+
+    The webcam feed is private: the server listens on ``host`` (loopback by
+    default) at ``port`` (0 picks a free one, so every UI session gets its
+    own server) and only answers under a random per-streamer ``token``, see
+    ``stream_path``. A fixed ``port`` that is already taken, e.g. by another
+    session's stream, falls back to a free one. It stops by itself when
+    ``frames`` ends.
+    """
+
+    def __init__(self, frames, host="127.0.0.1", port=0, quality=75, width=None):
+        self.frames = frames
+        self.host = host
+        self.port = port
+        self.quality = quality
+        self.width = width
+        self.token = secrets.token_urlsafe(16)
+
+        self._cond = threading.Condition()
+        self._jpeg = None
+        self._seq = 0
+        self._stopped = threading.Event()
+        self._stop_lock = threading.Lock()
+        self._server = None
+        self._threads = []
+
+        self._clients = 0
+        self._encode_ms = 0.0
+        self._bytes = 0
+        self._started_at = None
+
+    def start(self):
+        """Start the encoder and HTTP server threads"""
+        if self._server is not None:
+            return False
+        self._stopped.clear()
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), _StreamHandler)
+        except OSError as e:
+            if not self.port:
+                raise
+            print(f"MJPEG port {self.port} unavailable ({e}), using a free one")
+            self._server = ThreadingHTTPServer((self.host, 0), _StreamHandler)
+        self._server.daemon_threads = True
+        self._server.streamer = self
+        # Port 0 picks a free port
+        self.port = self._server.server_address[1]
+        self._started_at = time.monotonic()
+
+        self._threads = [
+            threading.Thread(
+                target=self._encode_loop, name="mjpeg-encoder", daemon=True
+            ),
+            threading.Thread(
+                target=self._server.serve_forever, name="mjpeg-server", daemon=True
+            ),
+        ]
+        for thread in self._threads:
+            thread.start()
+        print(f"📡 MJPEG stream on http://{self.host}:{self.port}/<token>/stream")
+        return True
+
+    @property
+    def stream_path(self):
+        """URL path of the MJPEG stream, includes the access token"""
+        return f"/{self.token}/stream"
+
+    @property
+    def running(self):
+        return self._server is not None and not self._stopped.is_set()
+
+    def stop(self):
+        """Stop serving; open client connections are closed"""
+        with self._stop_lock:
+            server, threads = self._server, self._threads
+            if server is None:
+                return
+            self._server = None
+            self._threads = []
+            self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+        server.shutdown()
+        server.server_close()
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=2.0)
+        print("📡 MJPEG stream stopped")
+
+    def _encode_loop(self):
+        bgr = None
+        try:
+            for frame in self.frames:
+                if self._stopped.is_set():
+                    break
+                start = time.perf_counter()
+                h, w = frame.shape[:2]
+                if self.width and self.width < w:
+                    size = (self.width, round(h * self.width / w))
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                if bgr is None or bgr.shape != frame.shape:
+                    bgr = frame.copy()
+                # imencode expects BGR
+                cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=bgr)
+                # Quality and width are read per frame so the UI can change them
+                ok, encoded = cv2.imencode(
+                    ".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)]
+                )
+                if not ok:
+                    continue
+                jpeg = encoded.tobytes()
+                elapsed = (time.perf_counter() - start) * 1000.0
+
+                with self._cond:
+                    self._jpeg = jpeg
+                    self._seq += 1
+                    self._bytes += len(jpeg)
+                    self._encode_ms = (
+                        elapsed
+                        if self._seq == 1
+                        else 0.1 * elapsed + 0.9 * self._encode_ms
+                    )
+                    self._cond.notify_all()
+        except Exception as e:
+            print(f"Error in MJPEG encoder: {e}")
+        finally:
+            # Source ended (camera stopped): let clients finish, free the port
+            self._stopped.set()
+            with self._cond:
+                self._cond.notify_all()
+            self.stop()
+
+    def latest(self):
+        """(sequence number, JPEG bytes) of the newest frame"""
+        with self._cond:
+            return self._seq, self._jpeg
+
+    def wait_frame(self, after, timeout=1.0):
+        """Block until a frame newer than ``after``; JPEG is None once stopped"""
+        with self._cond:
+            while self._seq <= after:
+                if self._stopped.is_set():
+                    return after, None
+                self._cond.wait(timeout)
+            return self._seq, self._jpeg
+
+    def _client_joined(self):
+        with self._cond:
+            self._clients += 1
+
+    def _client_left(self):
+        with self._cond:
+            self._clients -= 1
+
+    def stats(self):
+        """Encoded fps, encode cost, mean frame size and connected clients"""
+        with self._cond:
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0
+            return {
+                "frames_encoded": self._seq,
+                "encode_fps": self._seq / elapsed if elapsed else 0.0,
+                "encode_ms": self._encode_ms,
+                "mean_frame_kb": self._bytes / self._seq / 1024 if self._seq else 0.0,
+                "clients": self._clients,
+            }
+
+
+def format_stream_summary(stats):
+    """One-line summary of MJPEGStreamer.stats()"""
+    if not stats:
+        return "No stream stats yet"
+    return (
+        f"stream {stats['encode_fps']:.1f} fps | "
+        f"encode {stats['encode_ms']:.1f} ms | "
+        f"{stats['mean_frame_kb']:.0f} KB/frame | "
+        f"{stats['clients']} viewer(s)"
+    )
@@ -0,0 +1,152 @@
+import math
+
+import cv2
+import numpy as np
+
+from face_tracker.pose import HeadPose, is_looking_forward, solve_head_pose
+
+_LK_PARAMS = dict(
+    winSize=(21, 21),
+    maxLevel=3,
+    criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03),
+)
+
+
+class InferenceCadence:
+    """Decides on which frames FaceMesh runs.
+
+    The interval N is the smallest number of frames that keeps FaceMesh within
+    ``cpu_budget`` (fraction of one core), using moving averages of the
+    inference time and of the frame period.
+    """
+
+    def __init__(self, min_interval=1, max_interval=10, cpu_budget=0.35):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.cpu_budget = cpu_budget
+        self.interval = min_interval
+
+        self._frames_since = 0
+        self._avg_inference = None
+        self._avg_period = None
+        self._last_timestamp = None
+
+    def tick(self, timestamp):
+        """Register a new frame at ``timestamp`` (seconds)"""
+        if self._last_timestamp is not None:
+            period = timestamp - self._last_timestamp
+            if period > 0:
+                self._avg_period = _ewma(self._avg_period, period)
+        self._last_timestamp = timestamp
+        self._frames_since += 1
+
+    def due(self):
+        """True if FaceMesh should run on the current frame"""
+        return self._frames_since >= self.interval
+
+    def record_inference(self, seconds):
+        """Register a FaceMesh run and re-evaluate the interval"""
+        self._frames_since = 0
+        self._avg_inference = _ewma(self._avg_inference, seconds)
+        if self._avg_period:
+            needed = self._avg_inference / (self.cpu_budget * self._avg_period)
+            self.interval = min(
+                self.max_interval, max(self.min_interval, math.ceil(needed))
+            )
+
+
+class PoseTracker:
+    """Carries head pose forward between FaceMesh runs.
+
+    The six key points are followed with pyramidal Lucas-Kanade optical flow
+    and the pose is re-solved with the previous one as extrinsic guess. Tracking
+    is reported lost when a point is lost, the flow error is high or the face
+    moved too far, so the caller can fall back to FaceMesh.
+    """
+
+    def __init__(self, max_flow_error=12.0, max_motion=0.04, smoothing=0.6):
+        self.max_flow_error = max_flow_error
+        # Largest mean point displacement per frame, relative to frame width
+        self.max_motion = max_motion
+        # Weight of the newest angles in the exponential filter
+        self.smoothing = smoothing
+
+        self._gray = None
+        self._points = None
+        self._depth = None
+        self._pose = None
+
+    @property
+    def active(self):
+        return self._pose is not None
+
+    def reset(self, gray, face_2d, face_3d, pose):
+        """Start tracking from a FaceMesh result"""
+        self._gray = gray
+        self._points = face_2d.astype(np.float32).reshape(-1, 1, 2)
+        self._depth = face_3d[:, 2].copy()
+        self._pose = pose
+
+    def clear(self):
+        self._gray = None
+        self._points = None
+        self._depth = None
+        self._pose = None
+
+    def track(self, gray):
+        """Pose on ``gray`` from tracked points, or None if tracking is lost"""
+        if self._pose is None:
+            return None
+
+        points, status, error = cv2.calcOpticalFlowPyrLK(
+            self._gray, gray, self._points, None, **_LK_PARAMS
+        )
+        if points is None or not status.all() or error.mean() > self.max_flow_error:
+            self.clear()
+            return None
+
+        img_h, img_w = gray.shape[:2]
+        motion = np.linalg.norm(points - self._points, axis=2).mean()
+        if motion > self.max_motion * img_w:
+            self.clear()
+            return None
+
+        face_2d = points.reshape(-1, 2).astype(np.float64)
+        face_3d = np.column_stack((face_2d, self._depth))
+        pose = solve_head_pose(
+            face_2d,
+            face_3d,
+            img_w,
+            img_h,
+            self._pose.rotation_vector,
+            self._pose.translation_vector,
+        )
+        if pose is None:
+            self.clear()
+            return None
+
+        pose = self._filter(pose)
+        self._gray = gray
+        self._points = points
+        self._pose = pose
+        return pose
+
+    def _filter(self, pose):
+        a = self.smoothing
+        pitch = a * pose.pitch + (1 - a) * self._pose.pitch
+        yaw = a * pose.yaw + (1 - a) * self._pose.yaw
+        roll = a * pose.roll + (1 - a) * self._pose.roll
+        return HeadPose(
+            pitch,
+            yaw,
+            roll,
+            is_looking_forward(pitch, yaw),
+            pose.rotation_vector,
+            pose.translation_vector,
+        )
+
+
+def _ewma(average, value, alpha=0.2):
+    if average is None:
+        return value
+    return alpha * value + (1 - alpha) * average
@@ -13,10 +13,12 @@ from PySide6.QtWidgets import (
     QFileDialog,
 )
 from PySide6.QtGui import QPixmap, QImage
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QThread, QTimer, Signal
 import PyPDF2
 import io
-from face_tracker.camera import generate_frames, set_camera_stop_event
+from face_tracker.attention import format_attention_summary
+from face_tracker.shared_frames import SharedCamera
+from face_tracker.stats import format_summary
 from voice_assistant.main import run_audio_loop, set_stop_event, set_jd_cr
 
 
@@ -26,15 +28,59 @@ def extract_text_from_pdf(pdf_file):
         # Read the PDF file
         pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file.read()))
 
+        # Pages end in a form feed, compaction uses it to spot headers/footers
         text = ""
         for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+            text += page.extract_text() + "\f"
 
         return text.strip()
     except Exception as e:
         return e
 
 
+class VideoWorker(QThread):
+    """Pulls tracked frames off the GUI thread and emits display-ready images"""
+
+    frame_ready = Signal(QImage)
+    stats_ready = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, camera, stop_event, width, height):
+        super().__init__()
+        self.camera = camera
+        self.stop_event = stop_event
+        self.target_size = (width, height)
+
+    def set_target_size(self, width, height):
+        self.target_size = (width, height)
+
+    def run(self):
+        # Spawning the camera process takes a moment, keep it off the GUI thread
+        if not self.camera.start():
+            self.failed.emit("(No camera)")
+            return
+
+        try:
+            for count, frame in enumerate(self.camera.frames(self.stop_event), start=1):
+                h, w, ch = frame.shape
+                img = QImage(frame.data, w, h, ch * w, QImage.Format_RGB888)
+                # Detach from the frame buffer, frames() reuses it
+                width, height = self.target_size
+                if (width, height) == (w, h):
+                    self.frame_ready.emit(img.copy())
+                else:
+                    self.frame_ready.emit(img.scaled(width, height))
+
+                # Refresh fps / inference cost about once a second
+                if count % 30 == 0:
+                    self.stats_ready.emit(
+                        f"{format_summary(self.camera.stats_snapshot())} | "
+                        f"{format_attention_summary(self.camera.attention_snapshot())}"
+                    )
+        finally:
+            self.camera.stop()
+
+
 class InterviewBotUI(QWidget):
     def __init__(self):
         super().__init__()
@@ -45,6 +91,12 @@ class InterviewBotUI(QWidget):
         self.camera_active = False
         self.voice_active = False
         self.stop_event = threading.Event()
+        # Face tracking runs in its own process, frames arrive via shared memory
+        self.camera = SharedCamera()
+        self.video_worker = None
+        self.pending_image = None
+        # Start clicked while the previous camera process was shutting down
+        self.restart_pending = False
 
         # Layout
         main_layout = QHBoxLayout()
@@ -90,9 +142,13 @@ class InterviewBotUI(QWidget):
             "QLabel { background: #333; color: white; padding: 20px; }"
         )
         self.video_label.setFixedSize(900, 600)
-        main_layout.addWidget(self.video_label, 3)
+        self.stats_label = QLabel("")
+        right_panel = QVBoxLayout()
+        right_panel.addWidget(self.video_label)
+        right_panel.addWidget(self.stats_label)
+        main_layout.addLayout(right_panel, 3)
 
-        # Timer for updating video frames
+        # Timer for painting the newest frame, independent of inference rate
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
 
@@ -102,37 +158,93 @@ class InterviewBotUI(QWidget):
         )
         if file_path:
             print("Resume uploaded:", file_path)
-            extracted_text = extract_text_from_pdf(file_path)
-            # TODO: Extract PDF text and call set_jd_cr(self.jd_text, extracted_text)
-            return set_jd_cr(self.jd_text, extracted_text)
+            with open(file_path, "rb") as pdf_file:
+                extracted_text = extract_text_from_pdf(pdf_file)
+            return set_jd_cr(self.jd_text.toPlainText(), extracted_text)
 
     def start_camera(self):
+        if self.video_worker is not None and self.video_worker.isRunning():
+            if not self.camera_active:
+                # Previous camera process is still shutting down, start once
+                # it is gone
+                self.restart_pending = True
+                self.video_label.setText(
+                    "📱 AI Powered Interviewer\n\n(Waiting for the camera to stop)"
+                )
+            return
         if not self.camera_active:
             self.camera_active = True
             self.stop_event.clear()
-            set_camera_stop_event(self.stop_event)
-            self.frame_generator = generate_frames()
+            self.pending_image = None
+            self.video_label.setText("📱 AI Powered Interviewer\n\n(Starting camera)")
+
+            self.video_worker = VideoWorker(
+                self.camera,
+                self.stop_event,
+                self.video_label.width(),
+                self.video_label.height(),
+            )
+            self.video_worker.frame_ready.connect(self.on_frame_ready)
+            self.video_worker.stats_ready.connect(self.stats_label.setText)
+            self.video_worker.failed.connect(self.on_camera_failed)
+            self.video_worker.finished.connect(self.on_video_finished)
+            self.video_worker.start()
             self.timer.start(30)  # ~30 FPS
 
     def stop_camera(self):
+        if self.restart_pending:
+            self.restart_pending = False
+            self.video_label.setText("📱 AI Powered Interviewer\n\n(Camera stopped)")
         if self.camera_active:
             self.camera_active = False
+            # The worker sees the event and shuts the camera process down
             self.stop_event.set()
             self.timer.stop()
+            self.pending_image = None
             self.video_label.setText("📱 AI Powered Interviewer\n\n(Camera stopped)")
+            self.stats_label.setText("")
+
+    def on_frame_ready(self, image):
+        if self.sender() is not self.video_worker:
+            return
+        # Keep only the newest image, the timer decides when to paint it
+        self.pending_image = image
+
+    def on_camera_failed(self, message):
+        if self.sender() is not self.video_worker:
+            return
+        self.stop_camera()
+        self.video_label.setText(f"📱 AI Powered Interviewer\n\n{message}")
+
+    def on_video_finished(self):
+        # Signals of a worker that has been replaced arrive late, ignore them
+        worker = self.sender()
+        if worker is not self.video_worker:
+            return
+        restart = self.restart_pending
+        # Camera process exited without the stop button
+        self.stop_camera()
+        if restart:
+            worker.wait()
+            self.start_camera()
 
     def update_frame(self):
-        if self.camera_active:
-            try:
-                frame = next(self.frame_generator)
-                h, w, ch = frame.shape
-                img = QImage(frame.data, w, h, ch * w, QImage.Format_RGB888)
-                pix = QPixmap.fromImage(img)
-                self.video_label.setPixmap(
-                    pix.scaled(self.video_label.width(), self.video_label.height())
-                )
-            except StopIteration:
-                self.stop_camera()
+        if self.camera_active and self.pending_image is not None:
+            image, self.pending_image = self.pending_image, None
+            self.video_label.setPixmap(QPixmap.fromImage(image))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.video_worker is not None:
+            self.video_worker.set_target_size(
+                self.video_label.width(), self.video_label.height()
+            )
+
+    def closeEvent(self, event):
+        self.stop_camera()
+        if self.video_worker is not None:
+            self.video_worker.wait(5000)
+        super().closeEvent(event)
 
     def start_voice(self):
         if not self.voice_active:
@@ -0,0 +1,179 @@
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from face_tracker.analyzer import FaceAnalyzer
+from face_tracker.pose import KEY_LANDMARKS
+from face_tracker.stats import PipelineStats
+
+IMG_W, IMG_H = 640, 480
+
+
+def face_points(count=478):
+    """Normalized landmarks spread over the middle fifth of the image"""
+    i = np.arange(count)
+    u = 0.4 + 0.2 * (i % 10) / 9
+    v = 0.4 + 0.2 * (i // 10 % 10) / 9
+    z = 0.01 * i / count
+    return np.stack([u, v, z], axis=1)
+
+
+class FakeFaceMesh:
+    """Finds the same face, in coordinates of whatever view it is given"""
+
+    def __init__(self, points=None):
+        self.points = face_points() if points is None else points
+        self.views = []
+
+    def process(self, view):
+        self.views.append(view.copy())
+        if self.points is None or not len(self.points):
+            return SimpleNamespace(multi_face_landmarks=None)
+        landmark = [SimpleNamespace(x=x, y=y, z=z) for x, y, z in self.points]
+        return SimpleNamespace(
+            multi_face_landmarks=[SimpleNamespace(landmark=landmark)]
+        )
+
+
+def frame():
+    # A gradient, so a crop can be told apart from the full frame
+    xs = np.linspace(0, 255, IMG_W, dtype=np.uint8)
+    ys = np.linspace(0, 255, IMG_H, dtype=np.uint8)
+    image = np.zeros((IMG_H, IMG_W, 3), np.uint8)
+    image[..., 0] = xs[None, :]
+    image[..., 1] = ys[:, None]
+    return image
+
+
+def test_full_frame_downscale_keeps_full_frame_coordinates():
+    mesh = FakeFaceMesh()
+    analyzer = FaceAnalyzer(face_mesh=mesh, inference_width=160)
+    raw = analyzer._run_face_mesh(frame())
+
+    assert mesh.views[0].shape == (120, 160, 3)
+    # A plain downscale doesn't move normalized landmarks
+    np.testing.assert_allclose(raw, mesh.points[list(KEY_LANDMARKS)])
+
+
+def test_roi_crop_maps_landmarks_back_to_the_full_frame():
+    mesh = FakeFaceMesh()
+    analyzer = FaceAnalyzer(face_mesh=mesh, roi=True, inference_width=160)
+    image = frame()
+    analyzer._run_face_mesh(image)
+    # The face box spans the middle fifth, the crop adds 60% on each side
+    assert analyzer._face_box == pytest.approx((256.0, 192.0, 384.0, 288.0))
+
+    raw = analyzer._run_face_mesh(image)
+    x0, y0, x1, y1 = analyzer._crop
+    assert (x0, y0, x1, y1) == (179, 134, 461, 346)
+    w, h = x1 - x0, y1 - y0
+
+    # FaceMesh saw the crop, downscaled to inference_width
+    expected_view = cv2.resize(
+        image[y0:y1, x0:x1], (160, round(h * 160 / w)), interpolation=cv2.INTER_LINEAR
+    )
+    np.testing.assert_array_equal(mesh.views[1], expected_view)
+
+    key = mesh.points[list(KEY_LANDMARKS)]
+    np.testing.assert_allclose(raw[:, 0], (x0 + key[:, 0] * w) / IMG_W)
+    np.testing.assert_allclose(raw[:, 1], (y0 + key[:, 1] * h) / IMG_H)
+    np.testing.assert_allclose(raw[:, 2], key[:, 2] * w / IMG_W)
+
+
+def test_roi_falls_back_to_the_full_frame_when_the_face_leaves_the_crop():
+    mesh = FakeFaceMesh()
+    analyzer = FaceAnalyzer(face_mesh=mesh, roi=True)
+    image = frame()
+    analyzer._run_face_mesh(image)
+    analyzer._run_face_mesh(image)
+    assert analyzer._crop is not None
+
+    mesh.points = None
+    assert analyzer._run_face_mesh(image) is None
+    # The crop missed, the whole frame was tried before giving up
+    assert mesh.views[-2].shape != image.shape
+    assert mesh.views[-1].shape == image.shape
+    assert analyzer._crop is None and analyzer._face_box is None
+
+
+class FakeDetector:
+    """Face detector that sees a face while ``face`` is set"""
+
+    def __init__(self, face=True):
+        self.face = face
+        self.runs = 0
+
+    def process(self, rgb):
+        self.runs += 1
+        if not self.face:
+            return SimpleNamespace(detections=None)
+        box = SimpleNamespace(xmin=0.4, ymin=0.4, width=0.2, height=0.2)
+        detection = SimpleNamespace(
+            location_data=SimpleNamespace(relative_bounding_box=box)
+        )
+        return SimpleNamespace(detections=[detection])
+
+
+def stats_counters(analyzer):
+    return analyzer.stats.snapshot()["counters"]
+
+
+def test_unknown_tier_is_rejected():
+    with pytest.raises(ValueError):
+        FaceAnalyzer(face_mesh=FakeFaceMesh(), tier="fast")
+
+
+def test_mesh_tier_never_runs_a_detector():
+    analyzer = FaceAnalyzer(face_mesh=FakeFaceMesh(), tier="mesh")
+    assert analyzer.face_detector is None
+    assert analyzer.analyze(frame()).face_present
+
+
+def test_cascade_skips_face_mesh_while_the_detector_sees_nobody():
+    mesh, detector = FakeFaceMesh(), FakeDetector(face=False)
+    analyzer = FaceAnalyzer(
+        face_mesh=mesh,
+        face_detector=detector,
+        tier="cascade",
+        stats=PipelineStats(),
+    )
+    for _ in range(3):
+        result = analyzer.analyze(frame())
+        assert not result.face_present and result.inferred
+    assert detector.runs == 3 and not mesh.views
+    assert stats_counters(analyzer)["mesh_skipped"] == 3
+
+    # Once FaceMesh has the face, it follows it without the detector
+    detector.face = True
+    assert analyzer.analyze(frame()).face_present
+    assert analyzer.analyze(frame()).face_present
+    assert detector.runs == 4 and len(mesh.views) == 2
+
+    # FaceMesh lost it, the detector gates again
+    mesh.points = None
+    detector.face = False
+    analyzer.analyze(frame())
+    analyzer.analyze(frame())
+    assert detector.runs == 5 and len(mesh.views) == 3
+
+
+def test_cascade_detection_seeds_the_roi_crop():
+    mesh, detector = FakeFaceMesh(), FakeDetector()
+    analyzer = FaceAnalyzer(
+        face_mesh=mesh, face_detector=detector, tier="cascade", roi=True
+    )
+    analyzer.analyze(frame())
+    # FaceMesh started on the detected box instead of the whole frame
+    assert mesh.views[0].shape[:2] != (IMG_H, IMG_W)
+
+
+def test_presence_tier_reports_faces_without_pose():
+    detector = FakeDetector()
+    analyzer = FaceAnalyzer(face_detector=detector, tier="presence")
+    assert analyzer.face_mesh is None
+    result = analyzer.analyze(frame())
+    assert result.face_present and result.pose is None
+    detector.face = False
+    assert not analyzer.analyze(frame()).face_present
@@ -0,0 +1,81 @@
+import math
+
+import numpy as np
+
+from face_tracker.attention import AttentionAggregator, format_attention_summary
+
+
+def feed(aggregator, flags, fps=30.0, start=0.0, pitch=math.nan):
+    for i, flag in enumerate(flags):
+        aggregator.add(start + i / fps, True, pitch, pitch, flag)
+    return start + len(flags) / fps
+
+
+def test_window_and_totals():
+    aggregator = AttentionAggregator(window_s=1.0)
+    feed(aggregator, [True] * 30 + [False] * 30)
+    snapshot = aggregator.snapshot()
+    assert snapshot["total_frames"] == 60
+    assert snapshot["total_forward_pct"] == 50.0
+    # Only the last second is in the window, which is all looking away
+    assert snapshot["window_frames"] <= 31
+    assert snapshot["window_forward_pct"] < 5.0
+    assert snapshot["window_mean_pitch"] is None
+
+
+def test_memory_is_bounded_by_capacity():
+    aggregator = AttentionAggregator(window_s=1000.0, capacity=16)
+    feed(aggregator, [True] * 100, pitch=2.0)
+    snapshot = aggregator.snapshot()
+    assert snapshot["window_frames"] == 16
+    assert snapshot["total_frames"] == 100
+    assert snapshot["window_mean_pitch"] == 2.0
+
+
+def test_short_glances_are_not_episodes():
+    aggregator = AttentionAggregator(min_episode_s=1.0)
+    t = feed(aggregator, [True] * 30)
+    for _ in range(5):
+        t = feed(aggregator, [False] * 10 + [True] * 20, start=t)
+    assert aggregator.snapshot()["look_away_episodes"] == 0
+
+
+def test_long_look_away_is_one_episode():
+    aggregator = AttentionAggregator(min_episode_s=1.0)
+    t = feed(aggregator, [True] * 30)
+    t = feed(aggregator, [False] * 60, start=t)
+    snapshot = aggregator.snapshot()
+    assert snapshot["look_away_episodes"] == 1
+    assert snapshot["looking_away"]
+    assert "looking away" in format_attention_summary(snapshot)
+
+    feed(aggregator, [True] * 30, start=t)
+    snapshot = aggregator.snapshot()
+    assert snapshot["look_away_episodes"] == 1
+    assert not snapshot["looking_away"]
+    assert abs(snapshot["look_away_s"] - 2.0) < 0.1
+
+
+def test_no_face_counts_as_not_attentive():
+    aggregator = AttentionAggregator()
+    aggregator.add(0.0, False, math.nan, math.nan, True)
+    assert aggregator.snapshot()["total_forward_pct"] == 0.0
+
+
+def test_timeline_buckets():
+    aggregator = AttentionAggregator(bucket_s=1.0, max_buckets=3)
+    t = 0.0
+    for flags in ([True] * 30, [False] * 30, [True] * 15 + [False] * 15, [True] * 30):
+        t = feed(aggregator, flags, start=t)
+    # Oldest bucket fell out of the ring
+    np.testing.assert_allclose(aggregator.timeline(), [0.0, 50.0, 100.0], atol=4.0)
+
+
+def test_reset():
+    aggregator = AttentionAggregator()
+    feed(aggregator, [False] * 60)
+    aggregator.reset()
+    snapshot = aggregator.snapshot()
+    assert snapshot["total_frames"] == 0
+    assert snapshot["look_away_episodes"] == 0
+    assert aggregator.timeline().size == 0
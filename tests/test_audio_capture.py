@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import pyaudio
+
+from voice_assistant.capture import CallbackCapture
+from voice_assistant.fake_audio import FakePyAudio
+
+CHUNK = 512
+
+
+def chunk(i):
+    return bytes([i % 256]) * (2 * CHUNK)
+
+
+def test_one_wakeup_drains_every_pending_chunk():
+    async def scenario():
+        capture = CallbackCapture(frames_per_buffer=CHUNK)
+        received = []
+        capture._loop = asyncio.get_running_loop()
+        capture._on_chunk = received.append
+        # Callbacks keep coming while the loop is busy
+        for i in range(5):
+            assert capture._callback(chunk(i), CHUNK, {}, 0) == (
+                None,
+                pyaudio.paContinue,
+            )
+        await asyncio.sleep(0)
+        return capture, received
+
+    capture, received = asyncio.run(scenario())
+    assert received == [chunk(i) for i in range(5)]
+    stats = capture.stats()
+    assert stats["chunks"] == 5 and stats["wakeups"] == 1
+    assert stats["overflows"] == 0
+
+
+def test_stalled_loop_overflows_and_keeps_the_oldest_chunks():
+    async def scenario():
+        capture = CallbackCapture(frames_per_buffer=CHUNK, pool_size=4)
+        received = []
+        capture._loop = asyncio.get_running_loop()
+        capture._on_chunk = received.append
+        for i in range(7):
+            capture._callback(chunk(i), CHUNK, {}, pyaudio.paInputOverflow)
+        await asyncio.sleep(0)
+        # Room again once the loop drained the ring
+        capture._callback(chunk(7), CHUNK, {}, 0)
+        await asyncio.sleep(0)
+        return capture, received
+
+    capture, received = asyncio.run(scenario())
+    assert received == [chunk(i) for i in (0, 1, 2, 3, 7)]
+    stats = capture.stats()
+    assert stats["overflows"] == 3
+    assert stats["device_overflows"] == 7
+
+
+def test_stop_completes_the_stream():
+    async def scenario():
+        capture = CallbackCapture(frames_per_buffer=CHUNK)
+        received = []
+        capture.open(FakePyAudio(), 0)
+        capture.start(asyncio.get_running_loop(), received.append)
+        while len(received) < 3:
+            await asyncio.sleep(0.01)
+        capture.stop()
+        assert not capture.stream.is_active()
+        after_stop = capture._callback(chunk(0), CHUNK, {}, 0)
+        capture.close()
+        return capture, after_stop
+
+    capture, after_stop = asyncio.run(scenario())
+    assert after_stop == (None, pyaudio.paComplete)
+    assert capture.stream is None
+
+
+def test_closed_loop_completes_the_stream():
+    capture = CallbackCapture(frames_per_buffer=CHUNK)
+    loop = asyncio.new_event_loop()
+    capture._loop = loop
+    capture._on_chunk = lambda data: None
+    loop.close()
+    assert capture._callback(chunk(0), CHUNK, {}, 0) == (None, pyaudio.paComplete)
+    # And stays complete, PortAudio may call once more before it stops
+    assert capture._callback(chunk(1), CHUNK, {}, 0) == (None, pyaudio.paComplete)
+
+
+def test_restart_after_stop_delivers_again():
+    async def scenario():
+        capture = CallbackCapture(frames_per_buffer=CHUNK)
+        received = []
+        loop = asyncio.get_running_loop()
+        capture.open(FakePyAudio(), 0)
+        capture.start(loop, received.append)
+        await asyncio.sleep(0.1)
+        capture.stop()
+        count = len(received)
+        capture.start(loop, received.append)
+        deadline = time.monotonic() + 1.0
+        while len(received) == count and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        capture.close()
+        return count, len(received)
+
+    count, total = asyncio.run(scenario())
+    assert total > count > 0
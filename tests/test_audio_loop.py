@@ -0,0 +1,232 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from google.genai import errors
+
+from voice_assistant import main as voice
+from voice_assistant.fake_audio import FakePyAudio, ScriptedMicrophone, Speaker
+from voice_assistant.mock_live import mock_session_factory
+
+
+@pytest.fixture
+def loop_env(monkeypatch):
+    monkeypatch.setattr(voice, "TRANSCRIPT_DIR", None)
+    stop = threading.Event()
+    voice.set_stop_event(stop)
+    voice.set_jd_cr("Backend engineer", "Five years of Python")
+    yield stop
+    voice.set_stop_event(None)
+
+
+async def run_loop(stop, factory, until, timeout=8.0, silence_s=0.6):
+    mic = ScriptedMicrophone(voice.SEND_SAMPLE_RATE, speech_s=0.6, silence_s=silence_s)
+    pya = FakePyAudio(source=mic, sink=Speaker())
+    loop = asyncio.create_task(voice.audio_loop(session_factory=factory, pya=pya))
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not until() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.05)
+    stop.set()
+    return await asyncio.wait_for(loop, 5.0)
+
+
+def test_failed_send_reconnects_and_resends(loop_env):
+    factory = mock_session_factory(think_ms=50, response_ms=200)
+    failed = []
+
+    def break_uplink():
+        # The first session's sends start failing while receive stays open
+        first = factory.sessions[0]
+        original = first.send_realtime_input
+
+        async def send_realtime_input(**kwargs):
+            if first.audio_messages >= 5:
+                failed.append(kwargs)
+                raise ConnectionError("uplink broken")
+            await original(**kwargs)
+
+        first.send_realtime_input = send_realtime_input
+
+    def reconnected():
+        if len(factory.sessions) == 1 and not hasattr(break_uplink, "done"):
+            break_uplink.done = True
+            break_uplink()
+        return len(factory.sessions) > 1 and factory.sessions[1].audio_messages > 5
+
+    stats = asyncio.run(run_loop(loop_env, factory, reconnected))
+
+    assert failed, "the first session never failed a send"
+    assert len(factory.sessions) >= 2
+    second = factory.sessions[1]
+    assert second.resumed_from is not None
+    assert second.audio_messages > 5
+    # The frame that failed went out again on the new session
+    assert stats["uplink"]["send_failures"] >= 1
+    assert stats["uplink"]["sends_dropped"] == 0
+    assert stats["session"]["reconnects"] >= 1
+
+
+def test_non_str_resume_does_not_kill_the_loop(loop_env, monkeypatch):
+    # What the Qt UI used to store: a widget and a failed extraction
+    monkeypatch.setattr(voice, "_jd", object())
+    monkeypatch.setattr(voice, "_cr", ValueError("PDF could not be read"))
+    factory = mock_session_factory(think_ms=50, response_ms=200)
+    asyncio.run(run_loop(loop_env, factory, lambda: factory.sessions, timeout=4.0))
+    assert factory.sessions
+
+
+def test_config_errors_are_retried(loop_env, monkeypatch):
+    get_config = voice.get_config
+    calls = []
+
+    def flaky_get_config(handle=None):
+        calls.append(handle)
+        if len(calls) == 1:
+            raise TypeError("bad prompt input")
+        return get_config(handle)
+
+    monkeypatch.setattr(voice, "get_config", flaky_get_config)
+    factory = mock_session_factory(think_ms=50, response_ms=200)
+    asyncio.run(run_loop(loop_env, factory, lambda: factory.sessions, timeout=4.0))
+    assert len(calls) >= 2
+    assert factory.sessions
+
+
+def test_concurrent_loops_keep_their_own_stats(loop_env):
+    quiet = mock_session_factory(think_ms=50, response_ms=200)
+    busy = mock_session_factory(think_ms=50, response_ms=200)
+
+    async def run_both():
+        quiet_mic = ScriptedMicrophone(voice.SEND_SAMPLE_RATE, level_db=-90.0)
+        busy_mic = ScriptedMicrophone(
+            voice.SEND_SAMPLE_RATE, speech_s=0.6, silence_s=0.6
+        )
+        loops = [
+            voice.audio_loop(quiet, FakePyAudio(source=quiet_mic, sink=Speaker())),
+            voice.audio_loop(busy, FakePyAudio(source=busy_mic, sink=Speaker())),
+        ]
+        tasks = [asyncio.create_task(loop) for loop in loops]
+        await asyncio.sleep(2.0)
+        loop_env.set()
+        return await asyncio.gather(*tasks)
+
+    quiet_stats, busy_stats = asyncio.run(run_both())
+    # The VAD keeps the silent microphone's audio local
+    assert quiet_stats["uplink"]["messages_sent"] == 0
+    assert busy_stats["uplink"]["messages_sent"] > 0
+    assert quiet.sessions[0].audio_messages == 0
+    assert busy_stats["uplink"]["messages_sent"] == sum(
+        s.audio_messages for s in busy.sessions
+    )
+
+
+def test_go_away_moves_to_a_resumed_session(loop_env):
+    factory = mock_session_factory(
+        think_ms=50, response_ms=200, go_away_after_s=0.5, go_away_time_left_s=5.0
+    )
+    stats = asyncio.run(
+        run_loop(loop_env, factory, lambda: len(factory.sessions) > 1, timeout=5.0)
+    )
+    assert len(factory.sessions) > 1
+    first, second = factory.sessions[:2]
+    # Resumed with a handle the first session handed out
+    assert second.resumed_from.startswith(f"mock-{first.id}-")
+    assert stats["session"]["go_aways"] >= 1
+    assert stats["session"]["reconnects"] >= 1
+
+
+def failing_connect(factory, fail):
+    """Wraps ``factory``, ``fail(handle)`` returns the error a connect raises"""
+    attempts = []
+
+    def connect(model, config):
+        handle = getattr(config.session_resumption, "handle", None)
+        attempts.append(handle)
+        error = fail(handle)
+        if error is not None:
+            raise error
+        return factory(model, config)
+
+    connect.sessions = factory.sessions
+    connect.attempts = attempts
+    return connect
+
+
+def test_failed_resume_falls_back_to_a_fresh_session(loop_env):
+    factory = mock_session_factory(
+        think_ms=50, response_ms=200, go_away_after_s=0.5, go_away_time_left_s=5.0
+    )
+    expired = errors.APIError(1008, "Session not found")
+    connect = failing_connect(factory, lambda handle: handle and expired)
+    stats = asyncio.run(
+        run_loop(loop_env, connect, lambda: len(factory.sessions) > 1, timeout=6.0)
+    )
+    assert len(factory.sessions) > 1
+    assert factory.sessions[1].resumed_from is None
+    assert connect.attempts[1] is not None and connect.attempts[2] is None
+    assert stats["session"]["reconnects"] >= 1
+    assert stats["session"]["resumed"] == 0
+
+
+def test_bad_api_key_stops_the_loop(loop_env, monkeypatch):
+    monkeypatch.setattr(voice, "MAX_FATAL_FAILURES", 2)
+    factory = mock_session_factory()
+    bad_key = errors.APIError(1008, "API key not valid")
+    connect = failing_connect(factory, lambda handle: bad_key)
+    mic = ScriptedMicrophone(voice.SEND_SAMPLE_RATE, speech_s=0.6, silence_s=0.6)
+    pya = FakePyAudio(source=mic, sink=Speaker())
+    # Gives up by itself, the stop event is never set
+    stats = asyncio.run(
+        asyncio.wait_for(voice.audio_loop(session_factory=connect, pya=pya), 6.0)
+    )
+    assert not loop_env.is_set()
+    assert len(connect.attempts) == 2
+    assert not factory.sessions
+    assert stats["session"]["reconnects"] == 0
+
+
+def test_failed_first_connect_is_not_a_reconnect(loop_env):
+    factory = mock_session_factory(think_ms=50, response_ms=200)
+    offline = [ConnectionError("offline")]
+    connect = failing_connect(
+        factory, lambda handle: offline.pop() if offline else None
+    )
+    stats = asyncio.run(run_loop(loop_env, connect, lambda: factory.sessions))
+    assert len(connect.attempts) == 2
+    assert stats["session"]["reconnects"] == 0
+    assert stats["session"]["gap_ms_max"] == 0.0
+
+
+def test_turn_cut_off_by_reconnect_reaches_the_transcript(
+    loop_env, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(voice, "TRANSCRIPT_DIR", str(tmp_path))
+    # go_away arrives mid-turn, the reconnect is due 0.1 s later
+    factory = mock_session_factory(
+        think_ms=50,
+        response_ms=6000,
+        go_away_after_s=2.0,
+        go_away_time_left_s=voice.RECONNECT_MARGIN_S + 0.1,
+    )
+    stats = asyncio.run(
+        run_loop(
+            loop_env,
+            factory,
+            lambda: len(factory.sessions) > 1,
+            timeout=6.0,
+            silence_s=10.0,
+        )
+    )
+    assert len(factory.sessions) > 1
+    # No barge-in: the first session's only turn was cut off mid-stream
+    first = factory.sessions[0]
+    assert first.turns == 1
+    assert first.interruptions == 0
+    records = [
+        json.loads(line) for line in open(stats["transcript"]["path"], encoding="utf-8")
+    ]
+    assert any(
+        r["speaker"] == "interviewer" and "Interviewer words" in r["text"]
+        for r in records
+    )
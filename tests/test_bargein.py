@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+import pytest
+
+from voice_assistant.bargein import BargeInDetector
+from voice_assistant.playback import PlaybackEngine
+
+RATE = 16000
+CHUNK_S = 0.032
+
+
+def tone(db):
+    t = np.arange(512) / RATE
+    amp = 32768.0 * 10 ** (db / 20.0) * math.sqrt(2)
+    return (amp * np.sin(2 * math.pi * 200.0 * t)).astype(np.int16).tobytes()
+
+
+SPEECH = tone(-20.0)
+ROOM = tone(-70.0)
+
+
+@pytest.fixture
+def playback():
+    engine = PlaybackEngine()
+    engine.write(bytes(48 * 5000))
+    return engine
+
+
+def feed(detector, chunk, count, start=0.0):
+    for i in range(count):
+        detector.process(chunk, start + i * CHUNK_S)
+    return start + count * CHUNK_S
+
+
+def settle(detector):
+    # Let the noise floor learn the quiet room
+    return feed(detector, ROOM, 20)
+
+
+def test_ducks_then_pauses_until_the_server_confirms(playback):
+    detector = BargeInDetector(
+        playback, RATE, action="pause", duck_ms=100, pause_ms=250
+    )
+    t = settle(detector)
+    t = feed(detector, SPEECH, 4, t)
+    assert playback.gain == detector.duck_gain
+    t = feed(detector, SPEECH, 5, t)
+    assert playback.paused and detector.paused
+    # Paused, not discarded
+    assert playback.buffered_ms == 5000.0
+
+    stats = detector.stats()
+    assert stats["ducks"] == 1 and stats["local_pauses"] == 1
+    assert 250 <= stats["latency_ms_mean"] <= 300
+
+    detector.server_interrupted(t + 0.2)
+    playback.flush()
+    assert not detector.paused and not playback.active
+    assert detector.stats()["confirmed"] == 1
+
+
+def test_unconfirmed_pause_is_a_false_alarm_and_resumes(playback):
+    detector = BargeInDetector(playback, RATE, action="pause", hold_ms=2000)
+    t = settle(detector)
+    t = feed(detector, SPEECH, 10, t)
+    playback.write(bytes(48 * 100))
+    t = feed(detector, ROOM, 31, t)
+    assert detector.paused
+    feed(detector, ROOM, 40, t)
+    assert not detector.paused and not playback.paused
+    # The held audio and what arrived meanwhile play on
+    assert playback.buffered_ms == 5100.0 and playback.gain == 1.0
+    assert detector.stats()["false_alarms"] == 1
+
+
+def test_turn_complete_without_interruption_resumes(playback):
+    detector = BargeInDetector(playback, RATE, action="pause")
+    t = settle(detector)
+    feed(detector, SPEECH, 10, t)
+    assert playback.paused
+    detector.turn_complete()
+    assert not playback.paused
+    assert detector.stats()["false_alarms"] == 1
+
+
+def test_duck_is_the_default(playback):
+    detector = BargeInDetector(playback, RATE)
+    t = settle(detector)
+    feed(detector, SPEECH, 20, t)
+    assert not playback.paused and playback.buffered_ms == 5000.0
+    assert detector.stats()["local_pauses"] == 0
+
+
+def test_duck_only_releases_after_silence(playback):
+    detector = BargeInDetector(playback, RATE, action="duck", release_ms=400)
+    t = settle(detector)
+    t = feed(detector, SPEECH, 20, t)
+    assert playback.gain == detector.duck_gain and playback.active
+    feed(detector, ROOM, 13, t)
+    assert playback.gain == 1.0
+
+
+def test_nothing_happens_without_playback():
+    playback = PlaybackEngine()
+    detector = BargeInDetector(playback, RATE)
+    t = settle(detector)
+    feed(detector, SPEECH, 20, t)
+    assert detector.stats()["ducks"] == 0
+
+
+def test_short_words_with_gaps_do_not_add_up(playback):
+    detector = BargeInDetector(playback, RATE, duck_ms=100, gap_ms=100)
+    t = settle(detector)
+    for _ in range(5):
+        t = feed(detector, SPEECH, 2, t)
+        t = feed(detector, ROOM, 4, t)
+    assert detector.stats()["ducks"] == 0
+
+
+def test_server_interruption_without_local_detection(playback):
+    detector = BargeInDetector(playback, RATE)
+    t = settle(detector)
+    t = feed(detector, SPEECH, 2, t)
+    detector.server_interrupted(t + 0.1)
+    stats = detector.stats()
+    assert stats["server_only"] == 1
+    assert stats["server_latency_ms_mean"] > 0
+
+
+def test_rejects_unknown_action(playback):
+    with pytest.raises(ValueError):
+        BargeInDetector(playback, RATE, action="mute")
@@ -0,0 +1,80 @@
+import json
+
+import cv2
+import numpy as np
+
+from face_tracker.batch import analyze_videos, count_episodes, output_names
+
+
+def write_video(path, frames=20, size=(160, 120), fps=30.0):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), 8 * i, np.uint8))
+    writer.release()
+    return path
+
+
+def test_single_frame_glitches_are_not_episodes():
+    flags = [True] * 30 + [False] + [True] * 30 + [False, False] + [True] * 30
+    assert count_episodes(flags, fps=30.0) == 0
+
+
+def test_episode_needs_min_episode_s_of_looking_away():
+    away_29 = [True] * 10 + [False] * 30 + [True] * 10
+    away_31 = [True] * 10 + [False] * 31 + [True] * 10
+    assert count_episodes(away_29, fps=30.0) == 0
+    assert count_episodes(away_31, fps=30.0) == 1
+    assert count_episodes(away_31 + away_31, fps=30.0) == 2
+    assert count_episodes(away_29, fps=15.0) == 1
+
+
+def test_output_names_are_unique():
+    names = output_names(
+        [
+            "recordings/day1/candidate.mp4",
+            "recordings/day2/candidate.mp4",
+            "recordings/day2/other.mp4",
+        ]
+    )
+    assert names == {
+        "recordings/day1/candidate.mp4": "day1__candidate",
+        "recordings/day2/candidate.mp4": "day2__candidate",
+        "recordings/day2/other.mp4": "day2__other",
+    }
+
+
+def test_output_names_keep_extension_when_only_it_differs():
+    names = output_names(["clips/a.mp4", "clips/a.avi", "clips/b.mp4"])
+    assert names == {"clips/a.mp4": "a.mp4", "clips/a.avi": "a.avi", "clips/b.mp4": "b"}
+
+
+def test_unreadable_video_is_reported_and_the_rest_analyzed(tmp_path):
+    good = write_video(tmp_path / "good.avi")
+    missing = tmp_path / "missing.avi"
+    summaries, _ = analyze_videos(
+        [good, missing], tmp_path / "out", workers=1, segment_frames=8
+    )
+    assert summaries[str(good)]["frames"] == 20
+    assert summaries[str(good)]["errors"] == []
+    assert summaries[str(missing)]["frames"] == 0
+    assert "Could not open" in summaries[str(missing)]["errors"][0]
+    written = json.loads((tmp_path / "out" / "missing.summary.json").read_text())
+    assert written["errors"] == summaries[str(missing)]["errors"]
+
+
+def test_failed_segments_are_listed_in_the_summary(tmp_path):
+    video = write_video(tmp_path / "clip.avi")
+    summaries, _ = analyze_videos(
+        [video],
+        tmp_path / "out",
+        workers=1,
+        segment_frames=8,
+        analyzer_options={"no_such_option": True},
+    )
+    errors = summaries[str(video)]["errors"]
+    assert [error.split(":")[0] for error in sorted(errors)] == [
+        "frames 0-8",
+        "frames 16-20",
+        "frames 8-16",
+    ]
+    assert summaries[str(video)]["frames"] == 0
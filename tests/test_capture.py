@@ -0,0 +1,98 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from face_tracker import capture
+from face_tracker.capture import FrameGrabber
+
+
+class FakeVideoCapture:
+    """cv2.VideoCapture stand-in, ``read`` blocks until ``gate`` is set"""
+
+    instances = []
+
+    def __init__(self, source):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.reading = threading.Event()
+        self.released = False
+        self.released_while_reading = False
+        self.frames = 0
+        FakeVideoCapture.instances.append(self)
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def read(self):
+        self.reading.set()
+        self.gate.wait()
+        self.reading.clear()
+        if self.released:
+            self.released_while_reading = True
+        self.frames += 1
+        time.sleep(0.005)
+        return True, np.zeros((4, 4, 3), np.uint8)
+
+    def release(self):
+        if self.reading.is_set():
+            self.released_while_reading = True
+        self.released = True
+
+
+@pytest.fixture
+def fake_cv2(monkeypatch):
+    FakeVideoCapture.instances = []
+    monkeypatch.setattr(capture.cv2, "VideoCapture", FakeVideoCapture)
+    return FakeVideoCapture
+
+
+def test_read_returns_newest_frame_and_counts_drops(fake_cv2):
+    grabber = FrameGrabber()
+    assert grabber.start()
+    first = grabber.read(timeout=1.0)
+    time.sleep(0.05)
+    second = grabber.read(timeout=1.0)
+    grabber.stop()
+
+    assert second.seq > first.seq
+    assert grabber.frames_delivered == 2
+    assert grabber.frames_dropped == second.seq - first.seq - 1
+    assert grabber.read(timeout=0.1) is None
+    assert not grabber.running
+
+
+def test_stop_releases_the_device(fake_cv2):
+    grabber = FrameGrabber()
+    grabber.start()
+    grabber.read(timeout=1.0)
+    grabber.stop()
+    assert fake_cv2.instances[0].released
+
+
+def test_stop_never_releases_under_a_blocked_read(fake_cv2, monkeypatch):
+    grabber = FrameGrabber()
+    grabber.start()
+    cap = fake_cv2.instances[0]
+    cap.gate.clear()
+    assert cap.reading.wait(1.0)
+
+    # Don't wait out the real 2 s join timeout
+    join = threading.Thread.join
+    monkeypatch.setattr(
+        threading.Thread, "join", lambda self, timeout=None: join(self, 0.05)
+    )
+    grabber.stop()
+    assert not cap.released
+
+    # The stuck read returns, the reader thread releases the device itself
+    cap.gate.set()
+    deadline = time.monotonic() + 1.0
+    while not cap.released and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cap.released
+    assert not cap.released_while_reading
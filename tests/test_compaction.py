@@ -0,0 +1,93 @@
+import pytest
+
+from voice_assistant.compaction import (
+    as_text,
+    compact,
+    compact_resume,
+    estimate_tokens,
+    get_cache_stats,
+    normalize,
+    split_sections,
+)
+
+RESUME = """Jane Doe
+jane@example.com
+EXPERIENCE
+- Built Python services on Kubernetes
+- Led a team of five
+Page 1 of 2
+EDUCATION
+BSc Computer Science
+EXPERIENCE
+Page 2 of 2
+SKILLS
+Python, Go, Kubernetes, PostgreSQL
+"""
+
+
+@pytest.mark.parametrize(
+    "value", [None, "", ValueError("PDF could not be read"), object(), b"", 42]
+)
+def test_compact_accepts_non_str_and_empty_inputs(value):
+    jd, resume = compact(value, value)
+    assert isinstance(jd, str) and isinstance(resume, str)
+
+
+def test_as_text():
+    assert as_text(None) == ""
+    assert as_text(RuntimeError("boom")) == ""
+    assert as_text(b"caf\xc3\xa9") == "café"
+    assert as_text(12) == "12"
+    assert as_text("text") == "text"
+
+
+def test_normalize_drops_page_noise():
+    text = normalize("Some-\nthing  here\n\n• first\nPage 3\n12")
+    assert text.splitlines() == ["Something here", "- first"]
+
+
+def test_normalize_keeps_one_copy_of_running_headers_only():
+    pages = [
+        "Jane Doe - Resume\nEXPERIENCE\nAcme\n- Python\n- Python\nconfidential",
+        "Jane Doe - Resume\nGlobex\n- Python\nconfidential",
+    ]
+    lines = normalize("\f".join(pages)).splitlines()
+    assert lines.count("Jane Doe - Resume") == 1
+    assert lines.count("confidential") == 1
+    # Repeats within the body are content
+    assert lines.count("- Python") == 3
+
+
+def test_short_all_caps_lines_are_not_headings():
+    text = "Jane Doe\nSKILLS\nAWS\nSQL\nTools:\n- Docker\nWORK EXPERIENCE:\nAcme"
+    sections = split_sections(normalize(text))
+    assert [name for name, _ in sections] == ["", "skills", "tools", "work experience"]
+    assert sections[1][1] == ["SKILLS", "AWS", "SQL"]
+
+
+def test_split_sections_keeps_the_header():
+    sections = split_sections(normalize(RESUME))
+    assert [name for name, _ in sections] == ["", "experience", "education", "skills"]
+    assert sections[0][1] == ["Jane Doe", "jane@example.com"]
+
+
+def test_compact_resume_fits_budget_and_prefers_jd_terms():
+    long_resume = RESUME + "\n".join(
+        f"- Organised office event number {i}" for i in range(200)
+    )
+    text = compact_resume(long_resume, "Python Kubernetes engineer", budget=60)
+    assert estimate_tokens(text) <= 60
+    assert text.startswith("Jane Doe")
+    assert "Kubernetes" in text
+
+
+def test_compact_truncates_jd_and_caches():
+    jd = " ".join(["requirement"] * 500)
+    before = get_cache_stats()
+    first = compact(jd, RESUME, resume_tokens=100, jd_tokens=20)
+    second = compact(jd, RESUME, resume_tokens=100, jd_tokens=20)
+    after = get_cache_stats()
+    assert first == second
+    assert estimate_tokens(first[0]) <= 20
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
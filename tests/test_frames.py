@@ -0,0 +1,54 @@
+import cv2
+import numpy as np
+
+from face_tracker.frames import FramePipeline
+
+
+def bgr_frame(h=48, w=64, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+
+def test_output_is_mirrored_rgb():
+    bgr = bgr_frame()
+    out = FramePipeline().prepare(bgr)
+    expected = cv2.flip(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB), 1)
+    np.testing.assert_array_equal(out, expected)
+    unmirrored = FramePipeline().prepare(bgr, mirror=False)
+    np.testing.assert_array_equal(unmirrored, bgr[..., ::-1])
+
+
+def test_output_buffers_rotate_and_are_reused():
+    pipeline = FramePipeline(output_buffers=3)
+    outputs = [pipeline.prepare(bgr_frame(seed=i)) for i in range(6)]
+    ids = [id(out) for out in outputs]
+    assert len(set(ids[:3])) == 3
+    assert ids[3:] == ids[:3]
+    rgb = id(pipeline._rgb)
+    pipeline.prepare(bgr_frame())
+    assert id(pipeline._rgb) == rgb
+
+
+def test_shape_change_reallocates_the_buffers():
+    pipeline = FramePipeline(output_buffers=2)
+    small = pipeline.prepare(bgr_frame(48, 64))
+    pipeline.prepare(bgr_frame(48, 64))
+    big = pipeline.prepare(bgr_frame(96, 128, seed=1))
+    assert big.shape == (96, 128, 3)
+    assert id(big) != id(small)
+    np.testing.assert_array_equal(
+        big, cv2.flip(cv2.cvtColor(bgr_frame(96, 128, seed=1), cv2.COLOR_BGR2RGB), 1)
+    )
+    # The new buffers are reused from then on
+    again = [pipeline.prepare(bgr_frame(96, 128)) for _ in range(2)]
+    assert id(again[1]) == id(big)
+
+
+def test_width_downscales_into_a_reused_buffer():
+    pipeline = FramePipeline()
+    out = pipeline.prepare(bgr_frame(96, 128), width=64)
+    assert out.shape == (48, 64, 3)
+    small = id(pipeline._small)
+    pipeline.prepare(bgr_frame(96, 128, seed=2), width=64)
+    assert id(pipeline._small) == small
+    # Frames already narrow enough are not resized
+    assert pipeline.prepare(bgr_frame(48, 64), width=64).shape == (48, 64, 3)
@@ -0,0 +1,72 @@
+import math
+
+import cv2
+import numpy as np
+import pytest
+
+from face_tracker.headless import HeadlessTracker, track_video
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    """20 blank frames at 10 fps"""
+    path = tmp_path_factory.mktemp("videos") / "blank.avi"
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (160, 120)
+    )
+    for i in range(20):
+        writer.write(np.full((120, 160, 3), 5 * i, np.uint8))
+    writer.release()
+    return path
+
+
+def test_track_video_yields_a_sample_per_frame(video):
+    samples = list(track_video(video))
+    assert [s.seq for s in samples] == list(range(20))
+    # Timestamps come from the file's frame rate
+    assert [s.timestamp for s in samples] == pytest.approx([i / 10 for i in range(20)])
+    for sample in samples:
+        assert not sample.face_present and not sample.looking_forward
+        assert math.isnan(sample.pitch) and math.isnan(sample.yaw)
+        assert sample.inferred
+
+
+def test_track_video_reads_a_frame_range(video):
+    samples = list(track_video(video, start=5, end=12, fps=25.0))
+    assert [s.seq for s in samples] == list(range(5, 12))
+    assert samples[0].timestamp == pytest.approx(5 / 25)
+
+
+def test_range_past_the_end_stops_at_the_last_frame(video):
+    assert [s.seq for s in track_video(video, start=15, end=2**62)] == list(
+        range(15, 20)
+    )
+
+
+def test_track_video_passes_tracker_options(video):
+    # An expensive-looking budget makes adaptive mode skip frames
+    samples = list(
+        track_video(video, width=80, mirror=True, adaptive=True, cpu_budget=0.001)
+    )
+    assert len(samples) == 20
+    assert samples[0].inferred
+    assert not all(s.inferred for s in samples)
+
+
+def test_unreadable_video_raises(tmp_path):
+    with pytest.raises(ValueError):
+        next(track_video(tmp_path / "missing.avi"))
+
+
+def test_attention_follows_the_samples(video):
+    tracker = HeadlessTracker(attention=True)
+    cap = cv2.VideoCapture(str(video))
+    for index in range(10):
+        ok, frame = cap.read()
+        assert ok
+        tracker.process(frame, index / 10, index)
+    cap.release()
+    snapshot = tracker.attention_snapshot()
+    assert snapshot["total_frames"] == 10
+    assert snapshot["total_face_pct"] == 0.0
+    assert HeadlessTracker().attention_snapshot() is None
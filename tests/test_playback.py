@@ -0,0 +1,103 @@
+import numpy as np
+
+from voice_assistant.playback import ByteRing, PlaybackEngine
+
+# 24 kHz 16-bit: 48 bytes per ms, a 20 ms period is 960 bytes
+PERIOD = 480
+
+
+def test_ring_wraps_around():
+    ring = ByteRing(8)
+    assert ring.write(b"abcdef") == 0
+    out = bytearray(4)
+    assert ring.read_into(out) == 4 and out == b"abcd"
+    assert ring.write(b"ghijkl") == 0
+    assert len(ring) == 8
+    out = bytearray(10)
+    assert ring.read_into(out) == 8
+    assert out[:8] == b"efghijkl"
+    assert len(ring) == 0
+
+
+def test_ring_drops_oldest_when_full():
+    ring = ByteRing(4)
+    ring.write(b"abc")
+    assert ring.write(b"def") == 2
+    out = bytearray(4)
+    ring.read_into(out)
+    assert out == b"cdef"
+    # Writes larger than the ring keep their tail
+    assert ring.write(b"0123456789") == 0
+    ring.read_into(out)
+    assert out == b"6789"
+
+
+def audio(ms, value=1000):
+    return np.full(24 * ms, value, np.int16).tobytes()
+
+
+def play(engine):
+    data, _ = engine.callback(None, PERIOD, {}, 0)
+    return np.frombuffer(data, np.int16)
+
+
+def test_waits_for_target_depth_then_plays_periods():
+    engine = PlaybackEngine(target_ms=120)
+    engine.write(audio(100))
+    assert not play(engine).any()
+    engine.write(audio(40))
+    assert play(engine).tolist() == [1000] * PERIOD
+    assert engine.buffered_ms == 120.0
+    assert engine.active
+
+
+def test_end_of_turn_plays_out_short_tail_without_underrun():
+    engine = PlaybackEngine(target_ms=120)
+    engine.write(audio(30))
+    engine.end_turn()
+    assert play(engine).all()
+    tail = play(engine)
+    # 10 ms of audio, then silence
+    assert tail[: PERIOD // 2].all() and not tail[PERIOD // 2 :].any()
+    assert engine.stats()["underruns"] == 0
+    assert not engine.active
+
+
+def test_running_dry_mid_turn_is_an_underrun_and_rebuffers():
+    engine = PlaybackEngine(target_ms=40)
+    engine.write(audio(40))
+    play(engine)
+    play(engine)
+    play(engine)
+    assert engine.stats()["underruns"] == 1
+    engine.write(audio(20))
+    # Below target again, silence until 40 ms are buffered
+    assert not play(engine).any()
+
+
+def test_flush_and_gain():
+    engine = PlaybackEngine(target_ms=20)
+    engine.write(audio(200))
+    engine.set_gain(0.5)
+    assert play(engine)[0] == 500
+    assert engine.flush() == 180.0
+    assert engine.gain == 1.0
+    assert not engine.active
+    stats = engine.stats()
+    assert stats["flushes"] == 1 and stats["peak_buffered_ms"] == 200.0
+
+
+def test_pause_holds_audio_until_resumed():
+    engine = PlaybackEngine(target_ms=20)
+    engine.write(audio(100))
+    assert play(engine).any()
+    engine.pause()
+    assert not play(engine).any()
+    engine.write(audio(40))
+    assert engine.buffered_ms == 120.0 and engine.active
+    engine.resume()
+    assert play(engine).any()
+    assert engine.buffered_ms == 100.0
+    engine.pause()
+    engine.flush()
+    assert not engine.paused and not engine.active
@@ -0,0 +1,78 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from face_tracker.pool import FaceMeshPool
+
+FRAME = np.zeros((120, 160, 3), np.uint8)
+
+
+class Results:
+    """Pool callback that records every PoolResult"""
+
+    def __init__(self):
+        self.items = []
+        self.lock = threading.Lock()
+
+    def __call__(self, item):
+        with self.lock:
+            self.items.append(item)
+
+    def wait_for(self, count, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while len(self.items) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return len(self.items) >= count
+
+
+@pytest.fixture
+def results():
+    return Results()
+
+
+def test_results_of_a_stream_arrive_in_order(results):
+    with FaceMeshPool(workers=2, max_pending=4, callback=results) as pool:
+        for i in range(8):
+            for stream in ("a", "b"):
+                assert pool.submit(stream, FRAME, timestamp=i / 30)
+    assert len(results.items) == 16
+    for stream in ("a", "b"):
+        items = [item for item in results.items if item.stream_id == stream]
+        assert [item.seq for item in items] == list(range(8))
+        assert [item.timestamp for item in items] == [i / 30 for i in range(8)]
+        assert all(item.error is None for item in items)
+        assert not any(item.result.face_present for item in items)
+    assert pool.pending == 0
+
+
+def test_submit_applies_backpressure(results):
+    with FaceMeshPool(workers=1, max_pending=2, callback=results) as pool:
+        # The worker is still loading FaceMesh, nothing has been freed yet
+        assert pool.submit("a", FRAME, block=False)
+        assert pool.submit("a", FRAME, block=False)
+        assert not pool.submit("a", FRAME, block=False)
+        assert pool.pending == 2
+        # A blocking submit waits for a slot
+        assert pool.submit("a", FRAME, timeout=30.0)
+    assert [item.seq for item in results.items] == [0, 1, 2]
+
+
+def test_dead_worker_fails_its_frames_and_frees_its_slots(results):
+    with FaceMeshPool(
+        workers=2, max_pending=4, callback=results, check_interval=0.05
+    ) as pool:
+        for i in range(4):
+            assert pool.submit("a", FRAME, timestamp=float(i))
+        pool._processes[pool._assignment["a"]].kill()
+
+        assert results.wait_for(4)
+        lost = [item for item in results.items if item.error is not None]
+        assert lost and all("died" in item.error for item in lost)
+        assert pool.pending == 0
+
+        # The stream carries on on the surviving worker, seq keeps counting
+        assert pool.submit("a", FRAME, timeout=5.0)
+        assert results.wait_for(5)
+    assert results.items[-1].seq == 4 and results.items[-1].error is None
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from face_tracker.pose import (
+    BOX_LANDMARKS,
+    KEY_LANDMARKS,
+    gather_landmarks,
+    key_points,
+    key_points_from_array,
+    key_points_from_normalized,
+)
+
+
+def mesh(count):
+    """FaceMesh-like landmarks whose coordinates encode their index"""
+    points = [
+        SimpleNamespace(x=i / 1000, y=i / 2000, z=-i / 4000) for i in range(count)
+    ]
+    return SimpleNamespace(landmark=points)
+
+
+def as_array(face_landmarks):
+    return np.array([(p.x, p.y, p.z) for p in face_landmarks.landmark])
+
+
+def test_key_landmarks_are_gathered_in_mesh_order():
+    raw = gather_landmarks(mesh(468))
+    assert raw.shape == (len(KEY_LANDMARKS), 3)
+    assert raw.dtype == np.float64
+    assert np.round(raw[:, 0] * 1000).astype(int).tolist() == list(KEY_LANDMARKS)
+    np.testing.assert_allclose(raw[:, 2], -np.array(KEY_LANDMARKS) / 4000)
+
+
+def test_gather_follows_the_requested_indices():
+    indices = KEY_LANDMARKS + BOX_LANDMARKS
+    raw = gather_landmarks(mesh(478), indices)
+    assert np.round(raw[:, 0] * 1000).astype(int).tolist() == list(indices)
+
+
+def test_all_key_point_paths_agree():
+    face = mesh(478)
+    face_2d, face_3d = key_points(face, 640, 480)
+    from_array = key_points_from_array(as_array(face), 640, 480)
+    raw = gather_landmarks(face, KEY_LANDMARKS + BOX_LANDMARKS)
+    from_raw = key_points_from_normalized(raw[: len(KEY_LANDMARKS)], 640, 480)
+    for other in (from_array, from_raw):
+        np.testing.assert_array_equal(other[0], face_2d)
+        np.testing.assert_array_equal(other[1], face_3d)
+    # Pixel coordinates are truncated, depth stays normalized
+    assert face_2d[1].tolist() == [int(33 / 1000 * 640), int(33 / 2000 * 480)]
+    assert face_3d[1, 2] == -33 / 4000
+    assert face_2d.flags.c_contiguous
+
+
+def test_mesh_without_iris_landmarks_is_enough():
+    # 468 landmarks, or any list that reaches the highest key index
+    raw = gather_landmarks(mesh(max(KEY_LANDMARKS) + 1))
+    assert len(raw) == len(KEY_LANDMARKS)
+
+
+@pytest.mark.parametrize("count", [0, 6, 200, max(KEY_LANDMARKS)])
+def test_short_landmark_lists_raise_instead_of_misplacing_points(count):
+    with pytest.raises(IndexError):
+        gather_landmarks(mesh(count))
+    with pytest.raises(IndexError):
+        key_points_from_array(np.zeros((count, 3)), 640, 480)
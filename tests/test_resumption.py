@@ -0,0 +1,97 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from voice_assistant.resumption import (
+    SessionResumption,
+    _seconds,
+    format_session_summary,
+)
+
+
+def update(resumable, handle=None):
+    return SimpleNamespace(resumable=resumable, new_handle=handle)
+
+
+@pytest.mark.parametrize(
+    "time_left, seconds",
+    [("9.5s", 9.5), ("5s", 5.0), (3, 3.0), (timedelta(seconds=2), 2.0), (None, None)],
+)
+def test_time_left_parsing(time_left, seconds):
+    assert _seconds(time_left) == seconds
+
+
+def test_keeps_newest_resumable_handle():
+    resumption = SessionResumption()
+    resumption.start_session()
+    resumption.update(update(True, "h1"))
+    resumption.update(update(False))
+    assert resumption.handle == "h1" and not resumption.resumable
+    resumption.update(update(True, "h2"))
+    assert resumption.handle == "h2"
+
+
+async def due_within(resumption, seconds):
+    try:
+        await asyncio.wait_for(resumption.wait_due(), seconds)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def test_go_away_while_resumable_is_due_at_once():
+    async def scenario():
+        resumption = SessionResumption(margin_s=3.0)
+        resumption.start_session()
+        resumption.update(update(True, "h1"))
+        resumption.go_away("60s")
+        return await due_within(resumption, 0.1)
+
+    assert asyncio.run(scenario())
+
+
+def test_go_away_mid_turn_waits_for_resumable_or_margin():
+    async def scenario():
+        resumption = SessionResumption(margin_s=3.0)
+        resumption.start_session()
+        resumption.update(update(False))
+        resumption.go_away("60s")
+        early = await due_within(resumption, 0.1)
+        resumption.update(update(True, "h2"))
+        return early, await due_within(resumption, 0.1)
+
+    assert asyncio.run(scenario()) == (False, True)
+
+
+def test_margin_deadline_fires_without_resumable_update():
+    async def scenario():
+        resumption = SessionResumption(margin_s=3.0)
+        resumption.start_session()
+        resumption.go_away("3.2s")
+        return await due_within(resumption, 1.0)
+
+    assert asyncio.run(scenario())
+
+
+def test_new_session_resets_go_away():
+    async def scenario():
+        resumption = SessionResumption(margin_s=3.0)
+        resumption.start_session()
+        resumption.go_away("3.1s")
+        resumption.start_session()
+        return await due_within(resumption, 0.3)
+
+    assert not asyncio.run(scenario())
+
+
+def test_reconnect_stats():
+    resumption = SessionResumption()
+    resumption.reconnected(0.2, resumed=True)
+    resumption.reconnected(0.4, resumed=False)
+    stats = resumption.stats()
+    assert stats["reconnects"] == 2 and stats["resumed"] == 1
+    assert stats["gap_ms_mean"] == pytest.approx(300.0)
+    assert stats["gap_ms_max"] == pytest.approx(400.0)
+    assert "2 reconnects" in format_session_summary(stats)
@@ -0,0 +1,119 @@
+import math
+import multiprocessing as mp
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from face_tracker import camera as camera_module
+from face_tracker.analyzer import FaceResult
+from face_tracker.attention import AttentionAggregator
+from face_tracker.shared_frames import SharedCamera, SharedFrameRing, _camera_main
+
+NO_FACE = FaceResult(False, None, True)
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing.create(4, 6, slots=3)
+    yield ring
+    ring.close()
+
+
+def test_frames_round_trip_through_the_ring(ring):
+    reader = SharedFrameRing.attach(ring.name)
+    image = np.full((4, 6, 3), 7, np.uint8)
+    ring.write(1.5, image, FaceResult(False, None, True))
+
+    frame = reader.read()
+    assert frame.seq == 1 and frame.timestamp == 1.5
+    assert not frame.face_present and math.isnan(frame.pitch)
+    assert (frame.image == 7).all()
+    assert reader.read(after=1) is None
+
+    for _ in range(3):
+        ring.write(2.0, image, FaceResult(False, None, True))
+    assert not reader.is_current(frame)
+    del frame
+    reader.close()
+
+
+def test_attention_snapshot_crosses_the_ring(ring):
+    reader = SharedFrameRing.attach(ring.name)
+    assert reader.attention_snapshot() is None
+
+    attention = AttentionAggregator()
+    for i in range(60):
+        attention.add(i / 30, True, math.nan, math.nan, i < 10)
+    expected = attention.snapshot()
+    ring.publish_attention(expected)
+
+    snapshot = reader.attention_snapshot()
+    assert snapshot.keys() == expected.keys()
+    assert snapshot["window_mean_pitch"] is None
+    assert snapshot["looking_away"] is True
+    for key, value in expected.items():
+        if value is not None:
+            assert snapshot[key] == pytest.approx(value)
+    reader.close()
+
+
+def test_attention_means_survive_the_ring(ring):
+    attention = AttentionAggregator()
+    attention.add(0.0, True, 5.0, -3.0, True)
+    ring.publish_attention(attention.snapshot())
+    snapshot = ring.attention_snapshot()
+    assert snapshot["window_mean_pitch"] == pytest.approx(5.0)
+    assert snapshot["window_mean_yaw"] == pytest.approx(-3.0)
+    assert snapshot["looking_away"] is False
+
+
+def test_camera_frames_skip_frames_overwritten_during_the_copy(ring):
+    camera = SharedCamera()
+    camera.ring = ring
+    camera.process = SimpleNamespace(is_alive=lambda: True)
+    ring.write(1.0, np.full((4, 6, 3), 1, np.uint8), NO_FACE)
+
+    is_current = ring.is_current
+
+    def lapped(frame):
+        # The writer comes round to frame 1's slot while it is copied
+        if frame.seq == 1:
+            for value in (2, 3, 4):
+                ring.write(2.0, np.full((4, 6, 3), value, np.uint8), NO_FACE)
+        return is_current(frame)
+
+    ring.is_current = lapped
+    frame = next(camera.frames())
+    assert (frame == 4).all()
+    assert camera.torn_frames == 1
+    # Nothing left pointing into the ring
+    assert frame.base is None
+
+
+def test_camera_process_resizes_frames_after_a_resolution_change(monkeypatch):
+    shapes = [(4, 6), (8, 12), (4, 6)]
+
+    def track_frames(**options):
+        for i, (h, w) in enumerate(shapes):
+            image = np.full((h, w, 3), 10 * (i + 1), np.uint8)
+            yield SimpleNamespace(timestamp=float(i), image=image, result=NO_FACE)
+
+    monkeypatch.setattr(camera_module, "track_frames", track_frames)
+    conn, child_conn = mp.Pipe()
+    worker = threading.Thread(
+        target=_camera_main, args=(child_conn, threading.Event(), {})
+    )
+    worker.start()
+    ring = SharedFrameRing.create(*conn.recv(), slots=4)
+    conn.send(ring.name)
+    worker.join(5.0)
+
+    assert ring.closed
+    frame = ring.read()
+    assert frame.seq == 3
+    assert ring.images.shape == (4, 4, 6, 3)
+    assert (ring.images[1] == 20).all()
+    del frame
+    ring.close()
@@ -0,0 +1,60 @@
+import time
+
+from face_tracker.stats import PipelineStats, format_summary
+
+
+def test_disabled_stats_record_nothing():
+    stats = PipelineStats(enabled=False)
+    stats.count("pnp_failures")
+    with stats.time("inference"):
+        pass
+    stats.record("inference", 0.01)
+    stats.frame()
+    snapshot = stats.snapshot()
+    assert snapshot == {"enabled": False, "fps": 0.0, "counters": {}, "stages": {}}
+
+
+def test_disabled_timers_are_one_shared_no_op():
+    stats = PipelineStats(enabled=False)
+    assert stats.time("inference") is stats.time("solvepnp")
+
+
+def test_stage_timings_and_counters():
+    stats = PipelineStats()
+    for ms in (10.0, 20.0):
+        stats.record("inference", ms / 1000.0)
+    with stats.time("solvepnp"):
+        time.sleep(0.002)
+    stats.count("pnp_failures", 2)
+    for _ in range(3):
+        stats.frame()
+
+    snapshot = stats.snapshot()
+    inference = snapshot["stages"]["inference"]
+    assert inference["count"] == 2
+    assert inference["mean_ms"] == 15.0
+    assert inference["recent_ms"] == 0.1 * 20.0 + 0.9 * 10.0
+    assert inference["max_ms"] == 20.0
+    assert snapshot["stages"]["solvepnp"]["max_ms"] >= 2.0
+    assert snapshot["counters"] == {"pnp_failures": 2, "frames_processed": 3}
+    assert snapshot["fps"] > 0
+
+    stats.reset()
+    assert stats.snapshot()["counters"] == {}
+
+
+def test_format_summary():
+    assert format_summary(None) == "No camera stats yet"
+    snapshot = {
+        "fps": 29.96,
+        "counters": {"pnp_failures": 3},
+        "stages": {"inference": {"recent_ms": 12.34}},
+        "capture": {"frames_dropped": 5, "last_output_age_ms": 41.6},
+        "below_realtime": True,
+    }
+    assert format_summary(snapshot) == (
+        "30.0 fps | inference 12.3 ms | 5 dropped | latency 42 ms | "
+        "3 PnP failures | below real time"
+    )
+    quiet = {"fps": 15.0, "counters": {}, "stages": {}}
+    assert format_summary(quiet) == "15.0 fps"
@@ -0,0 +1,80 @@
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from face_tracker.streaming import MJPEGStreamer
+
+
+def frames(stop, count=None):
+    image = np.zeros((48, 64, 3), np.uint8)
+    n = 0
+    while not stop.is_set() and (count is None or n < count):
+        n += 1
+        stop.wait(0.01)
+        yield image
+
+
+@pytest.fixture
+def streamer():
+    stop = threading.Event()
+    streamer = MJPEGStreamer(frames(stop))
+    streamer.start()
+    yield streamer
+    stop.set()
+    streamer.stop()
+
+
+def get(streamer, path):
+    url = f"http://127.0.0.1:{streamer.port}{path}"
+    return urllib.request.urlopen(url, timeout=2.0)
+
+
+def wait_for_frame(streamer):
+    seq, jpeg = streamer.wait_frame(0, timeout=2.0)
+    assert jpeg is not None
+
+
+def test_binds_loopback_on_a_free_port(streamer):
+    assert streamer.host == "127.0.0.1"
+    assert streamer.port != 0
+    other = MJPEGStreamer(iter(()))
+    other.start()
+    assert other.port != streamer.port
+    other.stop()
+
+
+def test_taken_port_falls_back_to_a_free_one(streamer):
+    other = MJPEGStreamer(iter(()), port=streamer.port)
+    other.start()
+    assert other.port not in (0, streamer.port)
+    other.stop()
+
+
+def test_frames_are_only_served_under_the_token(streamer):
+    wait_for_frame(streamer)
+    with get(streamer, f"/{streamer.token}/frame.jpg") as response:
+        assert response.headers["Content-Type"] == "image/jpeg"
+        assert response.read(2) == b"\xff\xd8"
+    for path in ("/stream", "/frame.jpg", "/", "/wrong/stream"):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            get(streamer, path)
+        assert error.value.code == 404
+
+
+def test_tokens_differ_per_streamer():
+    assert MJPEGStreamer(iter(())).token != MJPEGStreamer(iter(())).token
+
+
+def test_stops_when_the_frame_source_ends():
+    streamer = MJPEGStreamer(frames(threading.Event(), count=3))
+    streamer.start()
+    for _ in range(200):
+        if not streamer.running and streamer._server is None:
+            break
+        threading.Event().wait(0.01)
+    assert not streamer.running
+    with pytest.raises(OSError):
+        get(streamer, streamer.stream_path)
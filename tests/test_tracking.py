@@ -0,0 +1,38 @@
+from face_tracker.tracking import InferenceCadence
+
+
+def run(cadence, frames, period, inference):
+    """Feed frames at ``period``, running inference whenever it is due"""
+    runs = 0
+    for i in range(frames):
+        cadence.tick(i * period)
+        if cadence.due():
+            cadence.record_inference(inference)
+            runs += 1
+    return runs
+
+
+def test_first_frame_is_due():
+    cadence = InferenceCadence()
+    cadence.tick(0.0)
+    assert cadence.due()
+
+
+def test_cheap_inference_runs_every_frame():
+    cadence = InferenceCadence(cpu_budget=0.35)
+    assert run(cadence, 60, 1 / 30, 0.002) == 60
+    assert cadence.interval == 1
+
+
+def test_interval_keeps_inference_within_budget():
+    cadence = InferenceCadence(cpu_budget=0.35)
+    # 30 ms per run at 30 fps is 90% of a core, every 3rd frame fits 35%
+    runs = run(cadence, 300, 1 / 30, 0.030)
+    assert cadence.interval == 3
+    assert runs * 0.030 / (300 / 30) <= 0.35 + 0.02
+
+
+def test_interval_is_capped():
+    cadence = InferenceCadence(max_interval=5, cpu_budget=0.1)
+    run(cadence, 100, 1 / 30, 0.5)
+    assert cadence.interval == 5
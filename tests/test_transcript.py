@@ -0,0 +1,89 @@
+import json
+import time
+from datetime import datetime
+
+from voice_assistant.transcript import (
+    TranscriptWriter,
+    format_transcript_summary,
+    transcript_path,
+)
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_nothing_is_created_without_records(tmp_path):
+    path = tmp_path / "transcripts" / "empty.jsonl"
+    writer = TranscriptWriter(str(path)).start()
+    writer.add("candidate", "")
+    writer.stop()
+    assert not path.parent.exists()
+    assert writer.stats()["written"] == 0
+
+
+def test_records_are_written_in_order_on_stop(tmp_path):
+    path = tmp_path / "transcripts" / "interview.jsonl"
+    writer = TranscriptWriter(str(path), flush_interval=60.0).start()
+    writer.add("interviewer", "Tell me about yourself.", 1_700_000_000.0)
+    writer.add("candidate", "I build backends.", 1_700_000_005.0, lang="en")
+    writer.stop()
+
+    records = read_records(path)
+    assert [r["turn"] for r in records] == [1, 2]
+    assert records[0]["speaker"] == "interviewer"
+    assert records[1]["text"] == "I build backends."
+    assert records[1]["lang"] == "en"
+    assert records[0]["time"].startswith("2023-11-14T22:13:20")
+    stats = writer.stats()
+    assert stats["written"] == 2 and stats["batches"] == 1 and stats["pending"] == 0
+
+
+def test_full_batches_are_written_before_the_interval(tmp_path):
+    path = tmp_path / "t.jsonl"
+    writer = TranscriptWriter(str(path), batch_size=2, flush_interval=60.0).start()
+    writer.add("candidate", "one")
+    writer.add("candidate", "two")
+    deadline = time.monotonic() + 2.0
+    while writer.stats()["written"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(read_records(path)) == 2
+    writer.stop()
+
+
+def test_oldest_pending_records_are_dropped(tmp_path):
+    path = tmp_path / "t.jsonl"
+    writer = TranscriptWriter(str(path), max_pending=2, batch_size=100)
+    for i in range(5):
+        writer.add("candidate", f"turn {i}")
+    writer.start().stop()
+    assert [r["text"] for r in read_records(path)] == ["turn 3", "turn 4"]
+    assert writer.stats()["dropped"] == 3
+    assert "3 dropped" in format_transcript_summary(writer.stats())
+
+
+def test_unwritable_path_counts_an_error(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    writer = TranscriptWriter(str(blocker / "t.jsonl")).start()
+    writer.add("candidate", "hello")
+    writer.stop()
+    assert writer.stats()["errors"] == 1
+
+
+def test_transcript_paths_are_unique_within_a_second():
+    now = datetime(2024, 5, 1, 9, 30, 5)
+    paths = {transcript_path("transcripts", now) for _ in range(100)}
+    assert len(paths) == 100
+    assert all("interview-20240501-093005-" in path for path in paths)
+
+
+def test_existing_file_is_never_appended_to(tmp_path):
+    path = tmp_path / "t.jsonl"
+    path.write_text("other interview\n")
+    writer = TranscriptWriter(str(path)).start()
+    writer.add("candidate", "hello")
+    writer.stop()
+    assert path.read_text() == "other interview\n"
+    assert writer.stats()["errors"] == 1
@@ -0,0 +1,132 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from voice_assistant.uplink import (
+    UplinkAggregator,
+    UplinkQueue,
+    UplinkStats,
+    format_uplink_summary,
+)
+
+# 32 ms of 16 kHz 16-bit audio, one capture chunk
+CHUNK = bytes(1024)
+
+
+def test_chunks_are_packed_into_frames():
+    uplink = UplinkAggregator(16000, frame_ms=40, adaptive=False)
+    assert uplink.frame_bytes == 1280
+    frames = [frame for _ in range(5) for frame in uplink.add(CHUNK)]
+    assert [len(frame) for frame in frames] == [1280] * 4
+    assert uplink.buffered_ms == 0.0
+    assert uplink.flush() is None
+
+    uplink.add(CHUNK)
+    assert uplink.buffered_ms == 32.0
+    assert len(uplink.flush()) == 1024
+
+
+def test_frame_ms_is_clamped():
+    assert UplinkAggregator(frame_ms=5, min_ms=20).frame_ms == 20
+    assert UplinkAggregator(frame_ms=500, max_ms=100).frame_ms == 100
+    # Never below one capture chunk
+    assert UplinkAggregator(frame_ms=20, min_ms=20, chunk_ms=32).frame_ms == 32
+
+
+def test_slow_sends_grow_frames_fast_sends_shrink_back_to_frame_ms():
+    uplink = UplinkAggregator(frame_ms=40, min_ms=20, max_ms=100, chunk_ms=32)
+    for _ in range(20):
+        uplink.record_send(0.050)
+    assert uplink.frame_ms == 100
+
+    for _ in range(200):
+        uplink.record_send(0.0001)
+    assert uplink.frame_ms == 40
+
+
+def test_fast_link_sends_fewer_messages_than_chunks():
+    uplink = UplinkAggregator(16000, frame_ms=40, min_ms=20, chunk_ms=32)
+    messages = 0
+    for _ in range(310):
+        for _ in uplink.add(CHUNK):
+            uplink.record_send(0.0008)
+            messages += 1
+    # 310 chunks is ~10 s of audio, one chunk per message would be ~31 msg/s
+    assert messages / 9.92 < 31
+
+
+def test_fixed_frames_without_adaptation():
+    uplink = UplinkAggregator(frame_ms=40, adaptive=False)
+    for _ in range(20):
+        uplink.record_send(0.050)
+    assert uplink.frame_ms == 40
+    assert uplink.send_latency_ms > 40
+
+
+def test_stats_snapshot():
+    stats = UplinkStats()
+    for _ in range(4):
+        stats.captured(1024)
+    stats.sent(2048, 0.003, 40)
+    stats.stream_ended()
+    snapshot = stats.snapshot()
+    assert snapshot["chunks_captured"] == 4
+    assert snapshot["sent_pct"] == 50.0
+    assert snapshot["send_ms_max"] == 3.0
+    assert snapshot["stream_ends"] == 1
+    assert "1 messages" in format_uplink_summary(snapshot)
+
+
+def loud(n=512):
+    return np.resize(np.array([8000, -8000], np.int16), n).tobytes()
+
+
+def test_queue_drops_oldest_when_full():
+    queue = UplinkQueue(3, "drop_oldest")
+    for i in range(5):
+        queue.put_nowait(bytes([i]) * 4)
+    assert queue.qsize() == 3
+    stats = queue.stats()
+    assert stats["dropped"] == 2 and stats["dropped_bytes"] == 8
+    assert stats["high_water_mark"] == 3
+    got = asyncio.run(drain(queue))
+    assert [chunk[0] for chunk in got] == [2, 3, 4]
+
+
+def test_queue_drops_silence_before_speech():
+    queue = UplinkQueue(3, "drop_silence")
+    speech = loud()
+    queue.put_nowait(speech)
+    queue.put_nowait(bytes(1024))
+    queue.put_nowait(speech)
+    queue.put_nowait(speech)
+    assert queue.stats()["dropped_silence"] == 1
+    assert asyncio.run(drain(queue)) == [speech] * 3
+
+    # All speech: fall back to the oldest
+    for _ in range(4):
+        queue.put_nowait(speech)
+    assert queue.stats()["dropped"] == 2
+    assert queue.stats()["dropped_silence"] == 1
+
+
+def test_queue_get_waits_for_data():
+    async def scenario():
+        queue = UplinkQueue(4)
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0.01)
+        assert not getter.done()
+        queue.put_nowait(b"ab")
+        return await asyncio.wait_for(getter, 1.0)
+
+    assert asyncio.run(scenario()) == b"ab"
+
+
+def test_queue_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        UplinkQueue(4, "drop_newest")
+
+
+async def drain(queue):
+    return [await queue.get() for _ in range(queue.qsize())]
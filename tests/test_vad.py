@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+
+from voice_assistant.vad import SILENCE_DB, VadGate, level_db
+
+RATE = 16000
+CHUNK_MS = 32
+
+
+def tone(db, ms=CHUNK_MS):
+    t = np.arange(RATE * ms // 1000) / RATE
+    amp = 32768.0 * 10 ** (db / 20.0) * math.sqrt(2)
+    return (amp * np.sin(2 * math.pi * 200.0 * t)).astype(np.int16).tobytes()
+
+
+def test_level_db():
+    assert level_db(b"") == SILENCE_DB
+    assert level_db(bytes(1024)) == SILENCE_DB
+    assert abs(level_db(tone(-20.0)) - -20.0) < 0.5
+
+
+def test_silence_is_held_back():
+    gate = VadGate(RATE)
+    for _ in range(50):
+        assert gate.process(tone(-70.0)) == ([], False)
+    assert not gate.open
+
+
+def test_speech_opens_with_pre_roll_and_closes_after_hangover():
+    gate = VadGate(RATE, pre_roll_ms=300, hangover_ms=600, onset_chunks=2)
+    for _ in range(30):
+        gate.process(tone(-70.0))
+
+    chunks, ended = gate.process(tone(-20.0))
+    assert (chunks, ended) == ([], False)
+    chunks, ended = gate.process(tone(-20.0))
+    assert gate.open and not ended
+    # ~300 ms of pre-roll plus the chunk that opened the gate
+    assert 300 <= (len(chunks) - 1) * CHUNK_MS <= 300 + 2 * CHUNK_MS
+    assert gate.segments == 1
+
+    quiet = 0
+    while True:
+        chunks, ended = gate.process(tone(-70.0))
+        assert len(chunks) == 1
+        quiet += 1
+        if ended:
+            break
+    assert quiet * CHUNK_MS >= 600
+    assert not gate.open
+
+
+def test_single_click_does_not_open():
+    gate = VadGate(RATE, onset_chunks=2)
+    for _ in range(10):
+        gate.process(tone(-70.0))
+    gate.process(tone(-20.0))
+    gate.process(tone(-70.0))
+    assert not gate.open
+
+
+def test_noise_floor_follows_the_room():
+    gate = VadGate(RATE, margin_db=10.0)
+    for _ in range(50):
+        gate.process(tone(-40.0))
+    # Steady -40 dB room noise is not speech, 15 dB above it is
+    assert not gate.open
+    assert not gate.is_speech(tone(-40.0))
+    assert gate.is_speech(tone(-25.0))
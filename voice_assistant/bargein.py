@@ -0,0 +1,201 @@
+import time
+from collections import deque
+
+from voice_assistant.vad import VadGate
+
+BARGE_IN_ACTIONS = ("duck", "pause")
+
+
+class BargeInDetector:
+    """Stops playback locally as soon as the candidate talks over it.
+
+    Every captured chunk is checked with a VadGate noise floor while the
+    model's audio is playing. After ``duck_ms`` of speech (pauses shorter
+    than ``gap_ms`` allowed) the playback is ducked to ``duck_gain``; with
+    action "pause" it is paused after ``pause_ms``, long before the
+    server's ``interrupted`` arrives.
+    Speech has to be louder than ``threshold_db`` so the model's own voice
+    leaking from the speakers doesn't trigger it; headphones work best.
+
+    Nothing is discarded locally. Paused audio, and audio still arriving
+    for the turn, stays buffered until the server confirms with
+    ``interrupted`` and the playback is flushed. If the turn completes
+    without it, or nothing arrives within ``hold_ms``, the detection counts
+    as a false alarm and playback resumes where it stopped. A duck is
+    released after ``release_ms`` of silence.
+
+    Latency is measured from speech onset to silence: the local pause plus
+    the output device latency, or the server interruption when the server
+    gets there first.
+    """
+
+    def __init__(
+        self,
+        playback,
+        sample_rate=16000,
+        sample_width=2,
+        action="duck",
+        threshold_db=-35.0,
+        margin_db=15.0,
+        duck_ms=100,
+        pause_ms=250,
+        duck_gain=0.25,
+        gap_ms=100,
+        release_ms=400,
+        hold_ms=2000,
+        window=50,
+    ):
+        if action not in BARGE_IN_ACTIONS:
+            raise ValueError(
+                f"Unknown action {action!r}, expected one of {BARGE_IN_ACTIONS}"
+            )
+        self.playback = playback
+        self._bytes_per_ms = sample_rate * sample_width / 1000.0
+        self.action = action
+        self.duck_ms = duck_ms
+        self.pause_ms = pause_ms
+        self.duck_gain = duck_gain
+        self.gap_ms = gap_ms
+        self.release_ms = release_ms
+        self.hold_ms = hold_ms
+        self.output_latency_ms = 0.0
+        self.vad = VadGate(
+            sample_rate, sample_width, threshold_db=threshold_db, margin_db=margin_db
+        )
+
+        self._speech_ms = 0.0
+        self._quiet_ms = 0.0
+        self._onset = None
+        self._ducked = False
+        self._paused_at = None
+
+        self._latency = deque(maxlen=window)
+        self._server_latency = deque(maxlen=window)
+        self._confirm_lag = deque(maxlen=window)
+        self.ducks = 0
+        self.local_pauses = 0
+        self.confirmed = 0
+        self.false_alarms = 0
+        self.server_only = 0
+
+    def process(self, data, now=None):
+        """Check one captured chunk, called on the event loop"""
+        if now is None:
+            now = time.monotonic()
+        speech = self.vad.is_speech(data)
+        self._expire(now)
+        if not self.playback.active:
+            self._speech_ms = 0.0
+            self._onset = None
+            self._release()
+            return
+
+        chunk_ms = len(data) / self._bytes_per_ms
+        if not speech:
+            self._quiet_ms += chunk_ms
+            if self._quiet_ms >= self.gap_ms:
+                self._speech_ms = 0.0
+                self._onset = None
+            if self._quiet_ms >= self.release_ms:
+                self._release()
+            return
+
+        if self._onset is None:
+            self._onset = now - chunk_ms / 1000.0
+        self._speech_ms += chunk_ms
+        self._quiet_ms = 0.0
+
+        if not self._ducked and self._speech_ms >= self.duck_ms:
+            self.playback.set_gain(self.duck_gain)
+            self._ducked = True
+            self.ducks += 1
+        if (
+            self.action == "pause"
+            and self._paused_at is None
+            and self._speech_ms >= self.pause_ms
+        ):
+            self.playback.pause()
+            self._paused_at = now
+            self.local_pauses += 1
+            self._latency.append(1000.0 * (now - self._onset) + self.output_latency_ms)
+            self._onset = None
+            print("✋ Barge-in, playback paused")
+
+    @property
+    def paused(self):
+        """True while playback is paused waiting for the server"""
+        return self._paused_at is not None
+
+    def server_interrupted(self, now=None):
+        """The server sent ``interrupted``, reconcile with local detection"""
+        if now is None:
+            now = time.monotonic()
+        if self._paused_at is not None:
+            # The caller flushes the playback, which also ends the pause
+            self.confirmed += 1
+            self._confirm_lag.append(1000.0 * (now - self._paused_at))
+            self._paused_at = None
+            self._ducked = False
+            return
+        self.server_only += 1
+        if self._onset is not None:
+            self._server_latency.append(
+                1000.0 * (now - self._onset) + self.output_latency_ms
+            )
+        self._onset = None
+        self._ducked = False
+
+    def turn_complete(self):
+        """The model's turn ended without ``interrupted``, play the rest"""
+        if self._paused_at is not None:
+            self._false_alarm()
+
+    def _expire(self, now):
+        if (
+            self._paused_at is not None
+            and now - self._paused_at > self.hold_ms / 1000.0
+        ):
+            # No confirmation from the server, the model kept talking
+            self._false_alarm()
+
+    def _false_alarm(self):
+        self._paused_at = None
+        self.false_alarms += 1
+        self.playback.set_gain(1.0)
+        self._ducked = False
+        self.playback.resume()
+
+    def _release(self):
+        if self._ducked:
+            self.playback.set_gain(1.0)
+            self._ducked = False
+
+    def stats(self):
+        """Counts and onset-to-silence latency of local and server interruptions"""
+        latency = list(self._latency)
+        server = list(self._server_latency)
+        lag = list(self._confirm_lag)
+        return {
+            "action": self.action,
+            "ducks": self.ducks,
+            "local_pauses": self.local_pauses,
+            "confirmed": self.confirmed,
+            "false_alarms": self.false_alarms,
+            "server_only": self.server_only,
+            "latency_ms_mean": sum(latency) / len(latency) if latency else 0.0,
+            "latency_ms_max": max(latency) if latency else 0.0,
+            "server_latency_ms_mean": sum(server) / len(server) if server else 0.0,
+            "confirm_lag_ms_mean": sum(lag) / len(lag) if lag else 0.0,
+        }
+
+
+def format_barge_in_summary(stats):
+    """One-line summary of BargeInDetector.stats()"""
+    if not stats:
+        return "No barge-in stats yet"
+    return (
+        f"{stats['local_pauses']} local ({stats['confirmed']} confirmed, "
+        f"{stats['false_alarms']} false) | {stats['server_only']} server only | "
+        f"onset to silence {stats['latency_ms_mean']:.0f} ms local, "
+        f"{stats['server_latency_ms_mean']:.0f} ms server"
+    )
@@ -0,0 +1,163 @@
+import time
+from collections import deque
+
+import pyaudio
+
+
+class CallbackCapture:
+    """Microphone capture in PyAudio callback mode.
+
+    PortAudio calls ``_callback`` on its own thread for every buffer. The
+    samples are copied into a preallocated ring of ``pool_size`` slots and
+    the event loop is woken with ``call_soon_threadsafe``; a wakeup already
+    pending covers any chunks that arrive before the loop gets to it, so a
+    busy loop drains several chunks per wakeup. No executor thread is used
+    per chunk. If the loop falls ``pool_size`` chunks behind, new chunks are
+    dropped and counted as overflows.
+
+    Once stopped, or when the event loop is gone, the callback returns
+    ``paComplete`` so PortAudio winds the stream down by itself.
+
+    Capture jitter is the deviation of callback intervals from the nominal
+    buffer period; handoff latency is the time from callback to delivery on
+    the loop.
+    """
+
+    def __init__(
+        self,
+        sample_rate=16000,
+        frames_per_buffer=512,
+        channels=1,
+        sample_width=2,
+        pool_size=64,
+    ):
+        self.sample_rate = sample_rate
+        self.frames_per_buffer = frames_per_buffer
+        self.channels = channels
+        slot_bytes = frames_per_buffer * channels * sample_width
+        self._slots = [bytearray(slot_bytes) for _ in range(pool_size)]
+        self._lengths = [0] * pool_size
+        self._times = [0.0] * pool_size
+        self._write = 0
+        self._read = 0
+        self._wake_pending = False
+        self._stopping = False
+
+        self.stream = None
+        self._loop = None
+        self._on_chunk = None
+        self._jitter = deque(maxlen=500)
+        self._handoff = deque(maxlen=500)
+        self._last_callback = None
+        self.chunks = 0
+        self.overflows = 0
+        self.wakeups = 0
+        self.device_overflows = 0
+
+    def open(self, pya, device_index=None, fmt=pyaudio.paInt16):
+        """Open the input stream (blocking, run it off the event loop)"""
+        self.stream = pya.open(
+            format=fmt,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._callback,
+            start=False,
+        )
+        return self.stream
+
+    def start(self, loop, on_chunk):
+        """Start delivering chunks to ``on_chunk(bytes)`` on ``loop``"""
+        self._loop = loop
+        self._on_chunk = on_chunk
+        self._last_callback = None
+        self._stopping = False
+        self.stream.start_stream()
+
+    def stop(self):
+        self._stopping = True
+        if self.stream is not None and self.stream.is_active():
+            self.stream.stop_stream()
+
+    def close(self):
+        if self.stream is not None:
+            self.stop()
+            self.stream.close()
+            self.stream = None
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        # Runs on the PortAudio thread, keep it short and allocation free
+        if self._stopping:
+            return (None, pyaudio.paComplete)
+        now = time.monotonic()
+        if self._last_callback is not None:
+            interval = now - self._last_callback
+            self._jitter.append(abs(interval - frame_count / self.sample_rate))
+        self._last_callback = now
+        if status & pyaudio.paInputOverflow:
+            self.device_overflows += 1
+
+        pool_size = len(self._slots)
+        if self._write - self._read >= pool_size:
+            self.overflows += 1
+            return (None, pyaudio.paContinue)
+
+        index = self._write % pool_size
+        n = len(in_data)
+        self._slots[index][:n] = in_data
+        self._lengths[index] = n
+        self._times[index] = now
+        self._write += 1
+
+        if not self._wake_pending and self._loop is not None:
+            self._wake_pending = True
+            try:
+                self._loop.call_soon_threadsafe(self._drain)
+            except RuntimeError:
+                # Event loop already closed, nobody will read this stream
+                self._stopping = True
+                return (None, pyaudio.paComplete)
+        return (None, pyaudio.paContinue)
+
+    def _drain(self):
+        # Runs on the event loop
+        self._wake_pending = False
+        self.wakeups += 1
+        pool_size = len(self._slots)
+        now = time.monotonic()
+        while self._read < self._write:
+            index = self._read % pool_size
+            data = bytes(memoryview(self._slots[index])[: self._lengths[index]])
+            self._handoff.append(now - self._times[index])
+            self._read += 1
+            self.chunks += 1
+            self._on_chunk(data)
+
+    def stats(self):
+        """Chunk, overflow and wakeup counts, jitter and handoff latency in ms"""
+        jitter = list(self._jitter)
+        handoff = list(self._handoff)
+        return {
+            "chunks": self.chunks,
+            "wakeups": self.wakeups,
+            "overflows": self.overflows,
+            "device_overflows": self.device_overflows,
+            "jitter_ms_mean": 1000.0 * sum(jitter) / len(jitter) if jitter else 0.0,
+            "jitter_ms_max": 1000.0 * max(jitter) if jitter else 0.0,
+            "handoff_ms_mean": 1000.0 * sum(handoff) / len(handoff) if handoff else 0.0,
+            "handoff_ms_max": 1000.0 * max(handoff) if handoff else 0.0,
+        }
+
+
+def format_capture_summary(stats):
+    """One-line summary of CallbackCapture.stats()"""
+    if not stats:
+        return "No capture stats yet"
+    return (
+        f"{stats['chunks']} chunks in {stats['wakeups']} wakeups | "
+        f"jitter {stats['jitter_ms_mean']:.1f} ms (max {stats['jitter_ms_max']:.1f}) | "
+        f"handoff {stats['handoff_ms_mean']:.2f} ms | "
+        f"{stats['overflows']} overflows"
+    )
@@ -0,0 +1,276 @@
+import hashlib
+import math
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+
+# Rough size of a token in characters for English prose
+CHARS_PER_TOKEN = 4
+
+_BULLETS = re.compile(r"^[\s•●▪■‣⁃·◦*-]+")
+_PAGE_LINE = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_HEADINGS = {
+    "summary",
+    "professional summary",
+    "profile",
+    "objective",
+    "experience",
+    "work experience",
+    "professional experience",
+    "employment",
+    "projects",
+    "skills",
+    "technical skills",
+    "education",
+    "certifications",
+    "courses",
+    "training",
+    "volunteering",
+    "achievements",
+    "awards",
+    "publications",
+    "languages",
+    "interests",
+    "hobbies",
+    "references",
+}
+# Sections worth keeping even when they share few words with the JD
+_SECTION_BOOST = {
+    "skills": 1.5,
+    "technical skills": 1.5,
+    "experience": 1.3,
+    "work experience": 1.3,
+    "professional experience": 1.3,
+    "projects": 1.2,
+    "hobbies": 0.3,
+    "interests": 0.3,
+    "references": 0.1,
+}
+# Lines this close to a page break can be running headers and footers
+_EDGE_LINES = 3
+_STOPWORDS = set(
+    """a an and are as at be by for from has have in is it its of on or our that
+    the their this to we will with you your who what which work working able
+    ability experience years year strong good team using use etc""".split()
+)
+
+_cache = OrderedDict()
+_cache_size = 32
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def as_text(value):
+    """Prompt text from whatever the UI handed over
+
+    None and exceptions (a failed PDF extraction) become "", bytes are
+    decoded and anything else goes through str().
+    """
+    if value is None or isinstance(value, BaseException):
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode("utf-8", errors="replace")
+    return str(value)
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _pages(text):
+    """Cleaned lines per page, pages end at form feeds and page numbers"""
+    pages = []
+    for chunk in text.split("\f"):
+        page = []
+        for raw in chunk.splitlines():
+            line = re.sub(r"\s+", " ", raw).strip()
+            bullet = _BULLETS.match(line)
+            if bullet and bullet.end() < len(line):
+                line = "- " + line[bullet.end() :].strip()
+            if not line:
+                continue
+            if _PAGE_LINE.match(line):
+                pages.append(page)
+                page = []
+                continue
+            page.append(line)
+        pages.append(page)
+    return [page for page in pages if page]
+
+
+def normalize(text):
+    """Clean PDF-extracted text: whitespace, hyphenation, page noise, headers
+
+    A line found near the top or bottom of more than one page (a running
+    header or footer) is kept only once. Other repeated lines are content,
+    e.g. the same bullet under two jobs, and stay.
+    """
+    text = unicodedata.normalize("NFKC", as_text(text))
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    pages = _pages(text)
+
+    def edges(page):
+        if len(page) <= 2 * _EDGE_LINES:
+            return page
+        return page[:_EDGE_LINES] + page[-_EDGE_LINES:]
+
+    counts = Counter()
+    for page in pages:
+        # Bullets are list items, never headers or footers
+        counts.update(
+            {line.lower() for line in edges(page) if not line.startswith("- ")}
+        )
+    running = {key for key, count in counts.items() if count > 1}
+
+    lines = []
+    seen = set()
+    for page in pages:
+        for line in page:
+            key = line.lower()
+            if key in running:
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _heading(line):
+    """The normalized heading name if ``line`` is a section heading
+
+    Known section names count with or without a colon, anything else only
+    as a short line ending in ":", so "AWS" or "SQL" alone is no heading.
+    """
+    name = line.rstrip(":").strip().lower()
+    if name in _HEADINGS:
+        return name
+    words = line.split()
+    if line.endswith(":") and 0 < len(words) <= 4 and not line.startswith("-"):
+        return name
+    return None
+
+
+def split_sections(text):
+    """Split normalized resume text into (heading, lines) sections
+
+    Text before the first heading (name, contact) has the heading "".
+    """
+    sections = [("", [])]
+    for i, line in enumerate(text.splitlines()):
+        # The first line is usually the candidate's name, never a heading
+        name = _heading(line) if i else None
+        if name is not None:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, lines) for name, lines in sections if lines]
+
+
+def _terms(text):
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _score(text, weights):
+    terms = set(_terms(text))
+    return sum(weights.get(term, 0.0) for term in terms)
+
+
+def _fit_lines(lines, weights, budget):
+    """Highest-scoring lines of a section that fit ``budget``, in order"""
+    ranked = sorted(
+        range(1, len(lines)), key=lambda i: _score(lines[i], weights), reverse=True
+    )
+    keep = {0}
+    used = estimate_tokens(lines[0])
+    for i in ranked:
+        cost = estimate_tokens(lines[i]) + 1
+        if used + cost <= budget:
+            keep.add(i)
+            used += cost
+    return [lines[i] for i in sorted(keep)]
+
+
+def _truncate(text, budget):
+    """The start of ``text`` up to ``budget`` tokens, cut at a word boundary"""
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            room = (budget - used - 1) * CHARS_PER_TOKEN
+            if room > 0:
+                kept.append(line[:room].rsplit(" ", 1)[0])
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def compact_resume(resume, jd, budget=1500):
+    """Normalized resume cut to ``budget`` tokens, most JD-relevant parts first
+
+    Sections are ranked by the JD terms they contain (weighted by how often
+    the JD uses them, normalized for section length) and added until the
+    budget is spent; a section that doesn't fit whole keeps its best lines.
+    The contact header is always kept and the original order is preserved.
+    """
+    text = normalize(resume)
+    if estimate_tokens(text) <= budget:
+        return text
+
+    counts = Counter(_terms(jd))
+    weights = {term: 1.0 + math.log(count) for term, count in counts.items()}
+    sections = split_sections(text)
+
+    def rank(index):
+        name, lines = sections[index]
+        if name == "":
+            return math.inf
+        body = "\n".join(lines)
+        score = _score(body, weights) / math.sqrt(estimate_tokens(body))
+        # A small base so the boosts order sections without JD matches
+        return (score + 0.05) * _SECTION_BOOST.get(name, 1.0)
+
+    chosen = {}
+    remaining = budget
+    for index in sorted(range(len(sections)), key=rank, reverse=True):
+        lines = sections[index][1]
+        cost = estimate_tokens("\n".join(lines)) + 1
+        if cost <= remaining:
+            chosen[index] = lines
+            remaining -= cost
+        elif remaining > 40:
+            lines = _fit_lines(lines, weights, remaining)
+            if len(lines) > 1:
+                chosen[index] = lines
+                remaining -= estimate_tokens("\n".join(lines)) + 1
+    return "\n".join("\n".join(chosen[i]) for i in sorted(chosen))
+
+
+def compact(jd, resume, resume_tokens=1500, jd_tokens=800):
+    """Compacted (jd, resume) for the system prompt, cached by content hash"""
+    jd, resume = as_text(jd), as_text(resume)
+    digest = hashlib.sha256(
+        f"{resume_tokens}:{jd_tokens}\0{jd}\0{resume}".encode("utf-8", "replace")
+    ).hexdigest()
+    if digest in _cache:
+        _cache.move_to_end(digest)
+        _cache_stats["hits"] += 1
+        return _cache[digest]
+
+    _cache_stats["misses"] += 1
+    result = (
+        _truncate(normalize(jd), jd_tokens),
+        compact_resume(resume, jd, resume_tokens),
+    )
+    _cache[digest] = result
+    while len(_cache) > _cache_size:
+        _cache.popitem(last=False)
+    return result
+
+
+def get_cache_stats():
+    """Hits, misses and entries of the compaction cache"""
+    return dict(_cache_stats, entries=len(_cache))
@@ -5,10 +5,18 @@ from google import genai
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-client = genai.Client(api_key=GEMINI_API_KEY)
-
 MODEL = "gemini-2.0-flash-live-001"
 
+_client = None
+
+
+def get_client():
+    """The shared genai client, created on first use so imports work offline"""
+    global _client
+    if _client is None:
+        _client = genai.Client(api_key=GEMINI_API_KEY)
+    return _client
+
 
 def prompt(JOB_DESCRIPTION, CANDIDATE_RESUME):
     return f"""[ROLE DEFINITION – NON-OVERRIDABLE]
@@ -0,0 +1,248 @@
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pyaudio
+
+# Samples at the start of each microphone chunk carrying its sequence number
+STAMP_SAMPLES = 16
+
+
+class FakeStream:
+    """A PyAudio stream driven by a pacing thread instead of a device"""
+
+    def __init__(
+        self,
+        rate,
+        input=False,
+        output=False,
+        frames_per_buffer=1024,
+        stream_callback=None,
+        start=True,
+        source=None,
+        sink=None,
+        sample_width=2,
+        **kwargs,
+    ):
+        self.rate = rate
+        self.is_input = input
+        self.frames_per_buffer = frames_per_buffer or 1024
+        self.sample_width = sample_width
+        self._callback = stream_callback
+        self._source = source
+        self._sink = sink
+        self._active = False
+        self._thread = None
+        self._next_io = None
+        if start:
+            self.start_stream()
+
+    def start_stream(self):
+        if self._active:
+            return
+        self._active = True
+        if self._callback is not None:
+            self._thread = threading.Thread(
+                target=self._run, name="FakeStream", daemon=True
+            )
+            self._thread.start()
+
+    def stop_stream(self):
+        self._active = False
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def is_active(self):
+        return self._active
+
+    def close(self):
+        self.stop_stream()
+
+    def get_input_latency(self):
+        return 0.0
+
+    def get_output_latency(self):
+        return 0.0
+
+    def _silence(self, frame_count):
+        return bytes(frame_count * self.sample_width)
+
+    def _run(self):
+        frames = self.frames_per_buffer
+        period = frames / self.rate
+        deadline = time.monotonic()
+        while self._active:
+            deadline += period
+            if self.is_input:
+                data = self._source(frames) if self._source else self._silence(frames)
+                _, flag = self._callback(data, frames, {}, 0)
+            else:
+                data, flag = self._callback(None, frames, {}, 0)
+                if self._sink is not None:
+                    self._sink(data)
+            if flag == pyaudio.paComplete:
+                # Like PortAudio, the stream goes inactive by itself
+                self._active = False
+                break
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()
+
+    def _pace(self, frame_count):
+        now = time.monotonic()
+        if self._next_io is None or self._next_io < now:
+            self._next_io = now
+        self._next_io += frame_count / self.rate
+        time.sleep(max(0.0, self._next_io - now))
+
+    def read(self, num_frames, exception_on_overflow=True):
+        self._pace(num_frames)
+        if self._source is None:
+            return self._silence(num_frames)
+        return self._source(num_frames)
+
+    def write(self, data):
+        if self._sink is not None:
+            self._sink(data)
+        self._pace(len(data) // self.sample_width)
+
+
+class FakePyAudio:
+    """Drop-in for pyaudio.PyAudio with one fake microphone and speaker.
+
+    Streams are paced in real time by a thread, like PortAudio would: input
+    streams pull blocks from ``source(frame_count)``, output streams push
+    what they play to ``sink(data)``. ScriptedMicrophone and Speaker are
+    such a source and sink.
+    """
+
+    def __init__(self, source=None, sink=None):
+        self.source = source
+        self.sink = sink
+        self.streams = []
+
+    def get_default_input_device_info(self):
+        return {"index": 0, "name": "Fake microphone", "maxInputChannels": 1}
+
+    def open(self, format=pyaudio.paInt16, channels=1, rate=16000, **kwargs):
+        stream = FakeStream(rate, source=self.source, sink=self.sink, **kwargs)
+        self.streams.append(stream)
+        return stream
+
+    def terminate(self):
+        for stream in self.streams:
+            stream.close()
+
+
+class ScriptedMicrophone:
+    """Microphone source alternating ``speech_s`` of speech and ``silence_s`` of room noise
+
+    Each chunk carries a sequence number in its first STAMP_SAMPLES samples
+    (as 0/1 values, inaudible and invisible to the VAD). ``received`` finds
+    those stamps in the uplink byte stream and returns how long after
+    capture each chunk arrived.
+    """
+
+    def __init__(
+        self,
+        sample_rate=16000,
+        speech_s=1.5,
+        silence_s=3.0,
+        level_db=-20.0,
+        noise_db=-70.0,
+        seed=0,
+    ):
+        self.sample_rate = sample_rate
+        self.speech_s = speech_s
+        self.silence_s = silence_s
+        self._speech_amp = 32768.0 * 10 ** (level_db / 20.0)
+        self._noise_amp = 32768.0 * 10 ** (noise_db / 20.0)
+        self._rng = np.random.default_rng(seed)
+        self._bits = 1 << np.arange(STAMP_SAMPLES)
+        self._position = 0
+        self._seq = 0
+        self._captured = deque()
+        self._lock = threading.Lock()
+        self._received = bytearray()
+        self.chunk_bytes = None
+
+    def __call__(self, frame_count):
+        t = (
+            self._position / self.sample_rate
+            + np.arange(frame_count) / self.sample_rate
+        )
+        self._position += frame_count
+        cycle = self.speech_s + self.silence_s
+        if (t[0] % cycle) < self.speech_s:
+            # Voiced sound with a syllable-rate envelope
+            envelope = 0.6 + 0.4 * np.sin(2 * math.pi * 4.0 * t)
+            tone = np.sin(2 * math.pi * 180.0 * t) + 0.5 * np.sin(
+                2 * math.pi * 360.0 * t
+            )
+            samples = self._speech_amp * envelope * tone / 1.5
+        else:
+            samples = self._noise_amp * self._rng.standard_normal(frame_count)
+        pcm = np.clip(samples, -32768, 32767).astype(np.int16)
+
+        seq = self._seq
+        self._seq += 1
+        pcm[:STAMP_SAMPLES] = (seq & self._bits) > 0
+        self.chunk_bytes = pcm.nbytes
+        with self._lock:
+            self._captured.append((seq, time.monotonic()))
+            if len(self._captured) > 10000:
+                self._captured.popleft()
+        return pcm.tobytes()
+
+    def received(self, data, now=None):
+        """Feed uplink audio in send order, returns capture-to-arrival seconds per chunk"""
+        if now is None:
+            now = time.monotonic()
+        self._received += data
+        size = self.chunk_bytes
+        latencies = []
+        while size and len(self._received) >= size:
+            head = bytes(self._received[: 2 * STAMP_SAMPLES])
+            stamp = np.frombuffer(head, np.int16)
+            seq = int(np.dot(stamp & 1, self._bits))
+            del self._received[:size]
+            with self._lock:
+                # Chunks that were gated or dropped never arrive, skip past them
+                while self._captured and self._captured[0][0] & 0xFFFF != seq:
+                    self._captured.popleft()
+                if self._captured:
+                    latencies.append(now - self._captured.popleft()[1])
+        return latencies
+
+
+class Speaker:
+    """Output sink that notes when sound starts after silence
+
+    ``expect(t)`` marks when a response's first audio left the server; the
+    next silence-to-sound transition records the response-to-speaker latency.
+    """
+
+    def __init__(self):
+        self._expected = None
+        self._sounding = False
+        self.latencies = []
+        self.blocks = 0
+        self.sounding_blocks = 0
+
+    def expect(self, timestamp):
+        self._expected = timestamp
+
+    def __call__(self, data):
+        self.blocks += 1
+        sounding = data.count(0) != len(data)
+        if sounding:
+            self.sounding_blocks += 1
+            if not self._sounding and self._expected is not None:
+                self.latencies.append(time.monotonic() - self._expected)
+                self._expected = None
+        self._sounding = sounding
@@ -1,17 +1,69 @@
 import asyncio
+import time
 import traceback
 import pyaudio
-from collections import deque
 import random
 
-from google.genai import types
-from voice_assistant.config import prompt, MODEL, client
+from google.genai import errors, types
+from voice_assistant.bargein import BargeInDetector, format_barge_in_summary
+from voice_assistant.capture import CallbackCapture, format_capture_summary
+from voice_assistant.compaction import as_text, compact, estimate_tokens
+from voice_assistant.config import prompt, MODEL, get_client
+from voice_assistant.playback import PlaybackEngine, format_playback_summary
+from voice_assistant.uplink import (
+    UplinkAggregator,
+    UplinkQueue,
+    UplinkStats,
+    format_uplink_summary,
+)
+from voice_assistant.resumption import SessionResumption, format_session_summary
+from voice_assistant.transcript import (
+    TranscriptWriter,
+    format_transcript_summary,
+    transcript_path,
+)
+from voice_assistant.vad import VadGate
 
 FORMAT = pyaudio.paInt16
 RECEIVE_SAMPLE_RATE = 24000
 SEND_SAMPLE_RATE = 16000
 CHUNK_SIZE = 512
 CHANNELS = 1
+# "callback" hands PyAudio callback buffers to the event loop, "blocking"
+# reads each chunk on an executor thread
+CAPTURE_MODE = "callback"
+# Captured chunks are packed into uplink frames of 40-100 ms, never shorter
+# than one capture chunk
+UPLINK_FRAME_MS = 40
+UPLINK_MIN_MS = 1000 * CHUNK_SIZE / SEND_SAMPLE_RATE
+UPLINK_MAX_MS = 100
+# Local voice activity gate, silence is not uploaded while it is closed
+VAD_ENABLED = True
+# At most ~1 s of captured audio waits for upload, stale audio is dropped
+# ("drop_oldest", or "drop_silence" to drop quiet chunks first)
+UPLINK_QUEUE_CHUNKS = 32
+UPLINK_QUEUE_POLICY = "drop_silence"
+# Received audio is played in fixed 20 ms periods once 120 ms are buffered
+PLAYBACK_PERIOD_MS = 20
+PLAYBACK_TARGET_MS = 120
+# Local barge-in while the model talks: "duck" lowers playback until the
+# server interrupts, "pause" ducks and then pauses it, None is off
+BARGE_IN = "duck"
+# Reconnect this many seconds before a go_away deadline at the latest
+RECONNECT_MARGIN_S = 3.0
+# A failed send reconnects and is tried again on the new session, this
+# many attempts in all before its audio is dropped
+SEND_ATTEMPTS = 2
+# A resume that fails this often in a row drops the handle for a fresh session
+RESUME_ATTEMPTS = 2
+# Give up after this many failed connects in a row that retrying won't fix,
+# like a bad API key
+MAX_FATAL_FAILURES = 3
+# Token budgets for the resume and JD in the system prompt
+PROMPT_RESUME_TOKENS = 1500
+PROMPT_JD_TOKENS = 800
+# Interview transcripts are appended here as JSONL, None disables them
+TRANSCRIPT_DIR = "transcripts"
 
 from google.genai.types import (
     LiveConnectConfig,
@@ -19,6 +71,7 @@ from google.genai.types import (
     VoiceConfig,
     PrebuiltVoiceConfig,
     FunctionDeclaration,
+    SessionResumptionConfig,
     Tool,
 )
 
@@ -27,6 +80,15 @@ _stop_event = None
 # Global variables for JD and CR
 _jd = None
 _cr = None
+# Uplink counters and queue, playback engine and resumption state of the
+# most recently started audio loop, for the get_*_stats accessors. Each
+# loop also returns its own stats, see audio_loop.
+_uplink_stats = None
+_uplink_queue = None
+_playback = None
+_resumption = None
+# Opens Live sessions, see set_session_factory
+_session_factory = None
 
 
 def set_stop_event(stop_event):
@@ -38,8 +100,62 @@ def set_stop_event(stop_event):
 def set_jd_cr(jd, cr):
     """Set the global Job Description and Candidate Resume"""
     global _jd, _cr
-    _jd = jd
-    _cr = cr
+    for name, value in (("Job description", jd), ("Resume", cr)):
+        if isinstance(value, BaseException):
+            print(f"⚠️ {name} could not be read: {value}")
+        elif value is not None and not isinstance(value, str):
+            print(f"⚠️ {name} is a {type(value).__name__}, not text")
+    _jd = as_text(jd)
+    _cr = as_text(cr)
+
+
+def get_uplink_stats():
+    """Messages/sec, thread hops, byte and queue counters of the running audio loop"""
+    if _uplink_stats is None:
+        return None
+    snapshot = _uplink_stats.snapshot()
+    if _uplink_queue is not None:
+        snapshot["queue"] = _uplink_queue.stats()
+    return snapshot
+
+
+def get_playback_stats():
+    """Underruns and buffered ms of the running audio loop's playback"""
+    if _playback is None:
+        return None
+    return _playback.stats()
+
+
+def default_session_factory(model, config):
+    """Live API session for ``model``, as an async context manager"""
+    return get_client().aio.live.connect(model=model, config=config)
+
+
+def set_session_factory(factory):
+    """Replace how Live sessions are opened, e.g. with a local mock
+
+    ``factory(model, config)`` must return an async context manager that
+    yields a session; None restores the real Live API.
+    """
+    global _session_factory
+    _session_factory = factory
+
+
+def get_session_stats():
+    """Reconnect count and gap times of the running audio loop"""
+    if _resumption is None:
+        return None
+    return _resumption.stats()
+
+
+def _transient(error):
+    """Whether a failed connect may succeed when tried again as is"""
+    if isinstance(error, errors.ClientError):
+        return error.code in (408, 429)
+    if isinstance(error, errors.APIError):
+        # Websocket close codes, 1007 and 1008 are a bad request, key or handle
+        return error.code not in (1007, 1008)
+    return True
 
 
 def _should_stop():
@@ -114,14 +230,21 @@ order_status_tool = Tool(
 )
 
 
-def get_config():
-    """Create LiveConnectConfig with current JD and CR"""
+def get_config(handle=None):
+    """Create LiveConnectConfig with current JD and CR, resuming ``handle`` if given"""
     global _jd, _cr
 
     # Use provided JD and CR or fallback to empty strings
     jd = _jd if _jd else ""
     cr = _cr if _cr else ""
 
+    # Cleaned and cut to budget, cached so reconnects reuse it
+    jd, cr = compact(jd, cr, PROMPT_RESUME_TOKENS, PROMPT_JD_TOKENS)
+    print(
+        f"📝 Prompt context: JD ~{estimate_tokens(jd)} tokens, "
+        f"resume ~{estimate_tokens(cr)} tokens"
+    )
+
     return LiveConnectConfig(
         response_modalities=["AUDIO"],
         output_audio_transcription={},
@@ -133,33 +256,56 @@ def get_config():
         ),
         system_instruction=prompt(jd, cr),
         tools=[order_status_tool],
+        session_resumption=SessionResumptionConfig(handle=handle),
     )
 
 
 class AudioManager:
-    def __init__(self, input_sample_rate=16000, output_sample_rate=24000):
-        self.pya = pyaudio.PyAudio()
+    def __init__(
+        self,
+        input_sample_rate=16000,
+        output_sample_rate=24000,
+        capture_mode=CAPTURE_MODE,
+        barge_in=BARGE_IN,
+        pya=None,
+    ):
+        self.pya = pya if pya is not None else pyaudio.PyAudio()
         self.input_stream = None
+        self.capture = None
+        if capture_mode == "callback":
+            self.capture = CallbackCapture(input_sample_rate, CHUNK_SIZE, CHANNELS)
         self.output_stream = None
         self.input_sample_rate = input_sample_rate
         self.output_sample_rate = output_sample_rate
-        self.audio_queue = deque()
-        self.is_playing = False
-        self.playback_task = None
+        self.playback = PlaybackEngine(
+            output_sample_rate,
+            period_ms=PLAYBACK_PERIOD_MS,
+            target_ms=PLAYBACK_TARGET_MS,
+        )
+        self.barge_in = None
+        if barge_in:
+            self.barge_in = BargeInDetector(
+                self.playback, input_sample_rate, action=barge_in
+            )
 
     async def initialize(self):
         mic_info = self.pya.get_default_input_device_info()
         print(f"microphone used: {mic_info}")
 
-        self.input_stream = await asyncio.to_thread(
-            self.pya.open,
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=self.input_sample_rate,
-            input=True,
-            input_device_index=mic_info["index"],
-            frames_per_buffer=CHUNK_SIZE,
-        )
+        if self.capture is not None:
+            self.input_stream = await asyncio.to_thread(
+                self.capture.open, self.pya, mic_info["index"], FORMAT
+            )
+        else:
+            self.input_stream = await asyncio.to_thread(
+                self.pya.open,
+                format=FORMAT,
+                channels=CHANNELS,
+                rate=self.input_sample_rate,
+                input=True,
+                input_device_index=mic_info["index"],
+                frames_per_buffer=CHUNK_SIZE,
+            )
 
         self.output_stream = await asyncio.to_thread(
             self.pya.open,
@@ -167,43 +313,53 @@ class AudioManager:
             channels=CHANNELS,
             rate=self.output_sample_rate,
             output=True,
+            frames_per_buffer=self.playback.period_frames,
+            stream_callback=self.playback.callback,
         )
+        if self.barge_in is not None:
+            latency = self.output_stream.get_output_latency()
+            self.barge_in.output_latency_ms = 1000.0 * latency
 
-    def add_audio(self, audio_data):
-        """Add audio data to the playback queue"""
-        self.audio_queue.append(audio_data)
-
-        if self.playback_task is None or self.playback_task.done():
-            self.playback_task = asyncio.create_task(self.play_audio())
+    @property
+    def is_playing(self):
+        return self.playback.active
 
-    async def play_audio(self):
-        """Play all queued audio data"""
-        print("🗣️ Gemini talking")
-        while self.audio_queue and not _should_stop():
-            try:
-                audio_data = self.audio_queue.popleft()
-                await asyncio.to_thread(self.output_stream.write, audio_data)
-            except Exception as e:
-                print(f"Error playing audio: {e}")
-                break
-
-        self.is_playing = False
+    def add_audio(self, audio_data):
+        """Add audio data to the playback buffer"""
+        if not self.playback.active:
+            print("🗣️ Gemini talking")
+        self.playback.write(audio_data)
+
+    def end_turn(self):
+        """The model finished its turn, play out the buffered tail"""
+        self.playback.end_turn()
+        if self.barge_in is not None:
+            self.barge_in.turn_complete()
+
+    def on_captured(self, data):
+        """Run barge-in detection on a captured microphone chunk"""
+        if self.barge_in is not None:
+            self.barge_in.process(data)
 
     def interrupt(self):
-        """Handle interruption by stopping playback and clearing queue"""
-        self.audio_queue.clear()
-        self.is_playing = False
-
-        if self.playback_task and not self.playback_task.done():
-            self.playback_task.cancel()
+        """Handle the server's interruption by dropping all buffered playback"""
+        if self.barge_in is not None:
+            self.barge_in.server_interrupted()
+        self.playback.flush()
 
     async def cleanup(self):
         """Cleanup audio resources"""
         print("🔧 Cleaning up audio resources...")
 
-        self.interrupt()
+        self.playback.flush()
+        print(f"🔊 Playback: {format_playback_summary(self.playback.stats())}")
+        if self.barge_in is not None:
+            print(f"✋ Barge-in: {format_barge_in_summary(self.barge_in.stats())}")
 
-        if self.input_stream:
+        if self.capture is not None:
+            print(f"🎤 Capture: {format_capture_summary(self.capture.stats())}")
+            await asyncio.to_thread(self.capture.close)
+        elif self.input_stream:
             await asyncio.to_thread(self.input_stream.stop_stream)
             await asyncio.to_thread(self.input_stream.close)
 
@@ -215,27 +371,64 @@ class AudioManager:
         print("✅ Audio cleanup complete")
 
 
-async def audio_loop():
-    """Main audio loop - based on your original with stop control added"""
+async def audio_loop(session_factory=None, pya=None):
+    """Main audio loop - based on your original with stop control added
+
+    ``session_factory`` and ``pya`` override the Live API session factory and
+    the PyAudio instance, for running against mocks and fake devices.
+    Returns this loop's final stats (uplink, playback, barge_in, session,
+    transcript), which stay correct when several loops run side by side.
+    """
+    global _uplink_stats, _uplink_queue, _playback, _resumption
+
+    connect = session_factory or _session_factory or default_session_factory
     audio_manager = AudioManager(
-        input_sample_rate=SEND_SAMPLE_RATE, output_sample_rate=RECEIVE_SAMPLE_RATE
+        input_sample_rate=SEND_SAMPLE_RATE,
+        output_sample_rate=RECEIVE_SAMPLE_RATE,
+        pya=pya,
+    )
+    _playback = audio_manager.playback
+    uplink = UplinkAggregator(
+        SEND_SAMPLE_RATE,
+        frame_ms=UPLINK_FRAME_MS,
+        min_ms=UPLINK_MIN_MS,
+        max_ms=UPLINK_MAX_MS,
+        chunk_ms=1000 * CHUNK_SIZE / SEND_SAMPLE_RATE,
     )
+    uplink_stats = _uplink_stats = UplinkStats()
+    # Bounded queue for user audio chunks, stale audio is dropped
+    audio_queue = _uplink_queue = UplinkQueue(UPLINK_QUEUE_CHUNKS, UPLINK_QUEUE_POLICY)
+    vad = VadGate(SEND_SAMPLE_RATE) if VAD_ENABLED else None
+    resumption = _resumption = SessionResumption(RECONNECT_MARGIN_S)
+    # Current Live session, replaced on reconnect while the audio keeps running
+    session = None
+    session_ready = asyncio.Event()
+    # Set by a failed send, run_sessions then moves to a new connection
+    session_lost = asyncio.Event()
+    transcript = None
+    if TRANSCRIPT_DIR:
+        transcript = TranscriptWriter(transcript_path(TRANSCRIPT_DIR)).start()
 
     try:
         await audio_manager.initialize()
 
-        # Get config with current JD and CR
-        config = get_config()
-
-        async with (
-            client.aio.live.connect(model=MODEL, config=config) as session,
-            asyncio.TaskGroup() as tg,
-        ):
-            # Queue for user audio chunks to control flow
-            audio_queue = asyncio.Queue()
+        async with asyncio.TaskGroup() as tg:
 
             async def listen_for_audio():
                 """Just captures audio and puts it in the queue"""
+                if audio_manager.capture is not None:
+                    # Chunks arrive from the PortAudio callback, no thread hops
+                    def on_chunk(data):
+                        uplink_stats.captured(len(data), hops=0)
+                        audio_manager.on_captured(data)
+                        audio_queue.put_nowait(data)
+
+                    audio_manager.capture.start(asyncio.get_running_loop(), on_chunk)
+                    while not _should_stop():
+                        await asyncio.sleep(0.1)
+                    audio_manager.capture.stop()
+                    return
+
                 while not _should_stop():
                     try:
                         data = await asyncio.to_thread(
@@ -243,39 +436,92 @@ async def audio_loop():
                             CHUNK_SIZE,
                             exception_on_overflow=False,
                         )
+                        uplink_stats.captured(len(data))
+                        audio_manager.on_captured(data)
                         await audio_queue.put(data)
                     except Exception as e:
                         if not _should_stop():
                             print(f"Error in audio capture: {e}")
                         break
 
+            async def send_input(**kwargs):
+                """send_realtime_input on the current session
+
+                A failed send marks the session lost so run_sessions
+                reconnects, then goes out again on the new session.
+                Returns False if the input was dropped.
+                """
+                for attempt in range(1, SEND_ATTEMPTS + 1):
+                    # Captured audio waits in audio_queue while reconnecting
+                    await session_ready.wait()
+                    live = session
+                    try:
+                        await live.send_realtime_input(**kwargs)
+                        return True
+                    except Exception as e:
+                        if _should_stop():
+                            raise
+                        dropped = attempt == SEND_ATTEMPTS
+                        uplink_stats.send_failed(dropped)
+                        print(f"Error sending audio: {e}")
+                        if live is session:
+                            session_ready.clear()
+                            session_lost.set()
+                print("⚠️ Dropped uplink audio after failed retries")
+                return False
+
+            async def send_frame(frame):
+                start = time.perf_counter()
+                sent = await send_input(
+                    media={
+                        "data": frame,
+                        "mime_type": f"audio/pcm;rate={SEND_SAMPLE_RATE}",
+                    }
+                )
+                if sent:
+                    elapsed = time.perf_counter() - start
+                    uplink.record_send(elapsed)
+                    uplink_stats.sent(len(frame), elapsed, uplink.frame_ms)
+
             async def process_and_send_audio():
                 """Processes audio from queue and sends to Gemini"""
                 while not _should_stop():
                     try:
                         data = await audio_queue.get()
 
-                        # Always send the audio data to Gemini
-                        await session.send_realtime_input(
-                            media={
-                                "data": data,
-                                "mime_type": f"audio/pcm;rate={SEND_SAMPLE_RATE}",
-                            }
-                        )
+                        # Silence is held back, speech goes out with its pre-roll
+                        if vad is not None:
+                            chunks, ended = vad.process(data)
+                        else:
+                            chunks, ended = [data], False
+
+                        # Send once a full uplink frame has been collected
+                        for chunk in chunks:
+                            for frame in uplink.add(chunk):
+                                await send_frame(frame)
+
+                        if ended:
+                            # Speech is over, flush and tell the server the
+                            # stream paused so it doesn't wait for more audio
+                            frame = uplink.flush()
+                            if frame:
+                                await send_frame(frame)
+                            if await send_input(audio_stream_end=True):
+                                uplink_stats.stream_ended()
                         audio_queue.task_done()
 
                     except Exception as e:
                         if not _should_stop():
                             print(f"Error in audio processing: {e}")
-                        break
+                            traceback.print_exc()
 
-            async def receive_and_play():
+            async def receive_and_play(session):
                 """Receive responses and play audio - your original logic"""
                 while not _should_stop():
+                    input_transcriptions = []
+                    output_transcriptions = []
+                    input_started = output_started = None
                     try:
-                        input_transcriptions = []
-                        output_transcriptions = []
-
                         async for response in session.receive():
                             if _should_stop():
                                 break
@@ -285,10 +531,12 @@ async def audio_loop():
                                 update = response.session_resumption_update
                                 if update.resumable and update.new_handle:
                                     print(f"new SESSION: {update.new_handle}")
+                                resumption.update(update)
 
                             # Check if the connection will be soon terminated
                             if response.go_away is not None:
-                                print(response.go_away.time_left)
+                                print(f"⏳ go_away, {response.go_away.time_left} left")
+                                resumption.go_away(response.go_away.time_left)
 
                             # Handle tool calls
                             if response.tool_call:
@@ -358,17 +606,22 @@ async def audio_loop():
 
                             if server_content and server_content.turn_complete:
                                 print("✅ Gemini done talking")
+                                audio_manager.end_turn()
 
                             output_transcription = getattr(
                                 response.server_content, "output_transcription", None
                             )
                             if output_transcription and output_transcription.text:
+                                if not output_transcriptions:
+                                    output_started = time.time()
                                 output_transcriptions.append(output_transcription.text)
 
                             input_transcription = getattr(
                                 response.server_content, "input_transcription", None
                             )
                             if input_transcription and input_transcription.text:
+                                if not input_transcriptions:
+                                    input_started = time.time()
                                 input_transcriptions.append(input_transcription.text)
 
                         # Print transcriptions (your original logic)
@@ -387,19 +640,126 @@ async def audio_loop():
                             traceback.print_exc()
                         break
 
+                    finally:
+                        # Queued for the transcript writer thread in the order
+                        # the turns started, also when a reconnect cuts the
+                        # turn off
+                        if transcript is not None:
+                            turns = [
+                                (input_started, "candidate", input_transcriptions),
+                                (output_started, "interviewer", output_transcriptions),
+                            ]
+                            for started, speaker, parts in sorted(
+                                turns, key=lambda turn: turn[0] or 0.0
+                            ):
+                                transcript.add(speaker, "".join(parts), started)
+
+            async def run_sessions():
+                """Connect, and reconnect with the latest handle until stopped"""
+                nonlocal session
+                lost_at = None
+                failures = 0
+                fatal = 0
+                while not _should_stop():
+                    resumed = resumption.handle is not None
+                    connected = False
+                    try:
+                        config = get_config(resumption.handle)
+                        async with connect(MODEL, config) as live:
+                            session = live
+                            connected = True
+                            failures = 0
+                            fatal = 0
+                            resumption.start_session()
+                            session_lost.clear()
+                            session_ready.set()
+                            if lost_at is not None:
+                                gap = time.monotonic() - lost_at
+                                resumption.reconnected(gap, resumed)
+                                print(f"🔁 Reconnected in {1000 * gap:.0f} ms")
+                                lost_at = None
+
+                            # Runs until the connection drops, a send fails, a
+                            # go_away says it's time to move to a new one or
+                            # we are stopped
+                            tasks = (
+                                asyncio.create_task(receive_and_play(live)),
+                                asyncio.create_task(session_lost.wait()),
+                                asyncio.create_task(resumption.wait_due()),
+                                asyncio.create_task(wait_for_stop()),
+                            )
+                            await asyncio.wait(
+                                tasks, return_when=asyncio.FIRST_COMPLETED
+                            )
+                            for task in tasks:
+                                task.cancel()
+                            await asyncio.gather(*tasks, return_exceptions=True)
+                            session_ready.clear()
+                            lost_at = time.monotonic()
+                            # A turn cut off by the switch won't continue
+                            audio_manager.end_turn()
+                    except Exception as e:
+                        if _should_stop():
+                            break
+                        print(f"Error in live session: {e}")
+                        failures += 1
+                        if not _transient(e):
+                            fatal += 1
+                            if fatal >= MAX_FATAL_FAILURES:
+                                print("🛑 Giving up on the live session")
+                                raise
+                        if (
+                            resumed
+                            and not connected
+                            and (not _transient(e) or failures >= RESUME_ATTEMPTS)
+                        ):
+                            # The handle may have expired, lose the context
+                            # rather than the interview
+                            print("🔁 Resume failed, starting a fresh session")
+                            resumption.handle = None
+                    session_ready.clear()
+                    # Gaps only count once there was a session to lose
+                    if lost_at is None and session is not None:
+                        lost_at = time.monotonic()
+                    if failures:
+                        await asyncio.sleep(min(failures, 5))
+
+                # The sender may be waiting for audio that no longer comes
+                sender.cancel()
+
+            async def wait_for_stop():
+                while not _should_stop():
+                    await asyncio.sleep(0.1)
+
             # Start all tasks with proper task creation
             tg.create_task(listen_for_audio())
-            tg.create_task(process_and_send_audio())
-            tg.create_task(receive_and_play())
+            sender = tg.create_task(process_and_send_audio())
+            tg.create_task(run_sessions())
 
     except Exception as e:
         print(f"Error in audio loop: {e}")
         traceback.print_exc()
     finally:
         # Always cleanup
+        uplink_snapshot = uplink_stats.snapshot()
+        uplink_snapshot["queue"] = audio_queue.stats()
+        print(f"📤 Uplink: {format_uplink_summary(uplink_snapshot)}")
+        print(f"🔁 Session: {format_session_summary(resumption.stats())}")
+        if transcript is not None:
+            await asyncio.to_thread(transcript.stop)
+            print(f"📝 Transcript: {format_transcript_summary(transcript.stats())}")
         await audio_manager.cleanup()
         print("🛑 Audio loop stopped")
 
+    barge_in = audio_manager.barge_in
+    return {
+        "uplink": uplink_snapshot,
+        "playback": audio_manager.playback.stats(),
+        "barge_in": barge_in.stats() if barge_in is not None else None,
+        "session": resumption.stats(),
+        "transcript": transcript.stats() if transcript is not None else None,
+    }
+
 
 def run_audio_loop():
     """Run the audio loop with error handling."""
@@ -0,0 +1,254 @@
+import asyncio
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import numpy as np
+
+from voice_assistant.vad import level_db
+
+_session_ids = itertools.count(1)
+# Put on the message queue when the connection goes away
+_CLOSED = object()
+
+
+def _message(
+    server_content=None,
+    tool_call=None,
+    go_away=None,
+    session_resumption_update=None,
+):
+    """A response shaped like types.LiveServerMessage"""
+    return SimpleNamespace(
+        server_content=server_content,
+        tool_call=tool_call,
+        go_away=go_away,
+        session_resumption_update=session_resumption_update,
+    )
+
+
+def _content(**fields):
+    content = dict(
+        model_turn=None,
+        turn_complete=None,
+        interrupted=None,
+        input_transcription=None,
+        output_transcription=None,
+    )
+    content.update(fields)
+    return _message(server_content=SimpleNamespace(**content))
+
+
+def _tone(sample_rate, ms, freq=220.0, level_db=-20.0):
+    t = np.arange(sample_rate * ms // 1000) / sample_rate
+    amp = 32768.0 * 10 ** (level_db / 20.0)
+    return (amp * np.sin(2 * math.pi * freq * t)).astype(np.int16).tobytes()
+
+
+class MockLiveSession:
+    """Local stand-in for a Gemini Live session.
+
+    Accepts realtime audio and answers every ``audio_stream_end`` with a
+    scripted turn: an input transcription after ``think_ms``, then
+    ``response_ms`` of tone audio in ``chunk_ms`` messages (sent ``speed``
+    times faster than real time) with output transcriptions, then
+    ``turn_complete`` and a fresh resumption handle. Every ``tool_every``-th
+    turn starts with a get_order_status tool call and waits for the tool
+    response. ``interrupt_ms`` of speech arriving while the turn is still
+    streaming interrupts it, like the server's own voice detection.
+    With ``go_away_after_s`` a go_away is sent after that long and the
+    connection is closed ``go_away_time_left_s`` later.
+
+    ``on_audio(data)`` sees every uploaded audio payload and
+    ``on_response(t)`` the time each turn's first audio message is sent.
+    """
+
+    def __init__(
+        self,
+        sample_rate=24000,
+        think_ms=300,
+        response_ms=2000,
+        chunk_ms=40,
+        speed=1.5,
+        tool_every=3,
+        interrupt_ms=500,
+        go_away_after_s=None,
+        go_away_time_left_s=5.0,
+        on_audio=None,
+        on_response=None,
+        resumed_from=None,
+    ):
+        self.id = next(_session_ids)
+        self.think_ms = think_ms
+        self.response_ms = response_ms
+        self.chunk_ms = chunk_ms
+        self.speed = speed
+        self.tool_every = tool_every
+        self.interrupt_ms = interrupt_ms
+        self.go_away_after_s = go_away_after_s
+        self.go_away_time_left_s = go_away_time_left_s
+        self.on_audio = on_audio
+        self.on_response = on_response
+        self.resumed_from = resumed_from
+        self._chunk = _tone(sample_rate, chunk_ms)
+        self._messages = asyncio.Queue()
+        self._responder = None
+        self._streaming = False
+        self._barge_in_bytes = 0
+        self._tool_done = asyncio.Event()
+        self._timers = []
+        self.closed = False
+
+        self.audio_messages = 0
+        self.audio_bytes = 0
+        self.stream_ends = 0
+        self.turns = 0
+        self.interruptions = 0
+        self.tool_calls = 0
+        self.tool_responses = 0
+        self.go_aways = 0
+
+    def start(self):
+        self._put_handle()
+        if self.go_away_after_s is not None:
+            loop = asyncio.get_running_loop()
+            self._timers.append(loop.call_later(self.go_away_after_s, self._go_away))
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for timer in self._timers:
+            timer.cancel()
+        if self._responder is not None:
+            self._responder.cancel()
+        self._messages.put_nowait(_CLOSED)
+
+    def _check_open(self):
+        if self.closed:
+            raise ConnectionError("mock Live session is closed")
+
+    def _put_handle(self, resumable=True):
+        update = SimpleNamespace(
+            resumable=resumable,
+            new_handle=f"mock-{self.id}-{self.turns}" if resumable else None,
+        )
+        self._messages.put_nowait(_message(session_resumption_update=update))
+
+    def _go_away(self):
+        self.go_aways += 1
+        go_away = SimpleNamespace(time_left=f"{self.go_away_time_left_s}s")
+        self._messages.put_nowait(_message(go_away=go_away))
+        loop = asyncio.get_running_loop()
+        self._timers.append(loop.call_later(self.go_away_time_left_s, self.close))
+
+    async def send_realtime_input(
+        self, *, media=None, audio=None, audio_stream_end=None, **kwargs
+    ):
+        self._check_open()
+        if audio_stream_end:
+            self.stream_ends += 1
+            if self._responder is None or self._responder.done():
+                self._responder = asyncio.create_task(self._respond())
+            return
+
+        blob = media if media is not None else audio
+        if blob is None:
+            return
+        data = blob["data"] if isinstance(blob, dict) else blob.data
+        self.audio_messages += 1
+        self.audio_bytes += len(data)
+        if self.on_audio is not None:
+            self.on_audio(data)
+        if not self._streaming:
+            return
+        # The candidate talks over the model (16 kHz 16-bit uplink)
+        if level_db(data) > -40.0:
+            self._barge_in_bytes += len(data)
+        if self._barge_in_bytes >= self.interrupt_ms * 32:
+            self._streaming = False
+            self._responder.cancel()
+            self.interruptions += 1
+            self._messages.put_nowait(_content(interrupted=True))
+            self._messages.put_nowait(_content(turn_complete=True))
+
+    async def send_tool_response(self, *, function_responses, **kwargs):
+        self._check_open()
+        self.tool_responses += 1
+        self._tool_done.set()
+
+    async def _respond(self):
+        self.turns += 1
+        self._put_handle(resumable=False)
+        await asyncio.sleep(self.think_ms / 1000.0)
+        text = SimpleNamespace(text=f"Candidate answer {self.turns}. ")
+        self._messages.put_nowait(_content(input_transcription=text))
+
+        if self.tool_every and self.turns % self.tool_every == 0:
+            self.tool_calls += 1
+            self._tool_done.clear()
+            call = SimpleNamespace(
+                name="get_order_status",
+                args={"order_id": f"A{self.turns}"},
+                id=f"call-{self.id}-{self.turns}",
+            )
+            tool_call = SimpleNamespace(function_calls=[call])
+            self._messages.put_nowait(_message(tool_call=tool_call))
+            try:
+                await asyncio.wait_for(self._tool_done.wait(), 5.0)
+            except asyncio.TimeoutError:
+                pass
+
+        self._streaming = True
+        self._barge_in_bytes = 0
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=self._chunk))
+        model_turn = SimpleNamespace(parts=[part])
+        for i in range(max(1, self.response_ms // self.chunk_ms)):
+            if i == 0 and self.on_response is not None:
+                self.on_response(time.monotonic())
+            self._messages.put_nowait(_content(model_turn=model_turn))
+            if i % 10 == 0:
+                words = SimpleNamespace(text=f"Interviewer words {i}. ")
+                self._messages.put_nowait(_content(output_transcription=words))
+            await asyncio.sleep(self.chunk_ms / 1000.0 / self.speed)
+        self._streaming = False
+        self._messages.put_nowait(_content(turn_complete=True))
+        self._put_handle()
+
+    async def receive(self):
+        """Messages of the current turn, ends after turn_complete"""
+        while True:
+            message = await self._messages.get()
+            if message is _CLOSED:
+                raise ConnectionError("mock Live session closed by server")
+            yield message
+            content = message.server_content
+            if content is not None and content.turn_complete:
+                return
+
+
+def mock_session_factory(connect_ms=0, **options):
+    """Session factory for audio_loop that opens MockLiveSessions
+
+    Connecting takes ``connect_ms``, other options go to MockLiveSession.
+    Every opened session is appended to the factory's ``sessions`` list.
+    """
+    sessions = []
+
+    @asynccontextmanager
+    async def connect(model, config):
+        await asyncio.sleep(connect_ms / 1000.0)
+        resumption = getattr(config, "session_resumption", None)
+        handle = getattr(resumption, "handle", None)
+        session = MockLiveSession(resumed_from=handle, **options)
+        sessions.append(session)
+        session.start()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    connect.sessions = sessions
+    return connect
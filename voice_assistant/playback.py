@@ -0,0 +1,202 @@
+import threading
+
+import numpy as np
+import pyaudio
+
+
+class ByteRing:
+    """Fixed-capacity byte ring buffer; when full, the oldest bytes are dropped"""
+
+    def __init__(self, capacity):
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(self._buf)
+
+    def write(self, data):
+        """Append ``data``, returns how many old bytes had to be dropped"""
+        data = memoryview(data)
+        capacity = len(self._buf)
+        if len(data) > capacity:
+            data = data[-capacity:]
+        dropped = max(0, self._size + len(data) - capacity)
+        if dropped:
+            self._start = (self._start + dropped) % capacity
+            self._size -= dropped
+
+        end = (self._start + self._size) % capacity
+        first = min(len(data), capacity - end)
+        self._view[end : end + first] = data[:first]
+        if first < len(data):
+            self._view[: len(data) - first] = data[first:]
+        self._size += len(data)
+        return dropped
+
+    def read_into(self, out):
+        """Move up to ``len(out)`` bytes into the writable buffer ``out``"""
+        n = min(len(out), self._size)
+        capacity = len(self._buf)
+        first = min(n, capacity - self._start)
+        out[:first] = self._view[self._start : self._start + first]
+        if first < n:
+            out[first:n] = self._view[: n - first]
+        self._start = (self._start + n) % capacity
+        self._size -= n
+        return n
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+
+class PlaybackEngine:
+    """Jitter-buffered playback driven by the PyAudio output callback.
+
+    Received audio goes into a preallocated ByteRing. The output stream pulls
+    fixed ``period_ms`` blocks from ``callback``, so the device always gets
+    evenly sized writes without an executor thread per chunk. Playback of a
+    turn starts once ``target_ms`` is buffered (or the turn has ended), and
+    after an underrun waits for the same depth again instead of crackling on
+    every late packet. Running dry before the turn ended counts as an
+    underrun. While paused the output is silent and received audio keeps
+    buffering, so ``resume`` picks up where it stopped.
+    """
+
+    def __init__(
+        self,
+        sample_rate=24000,
+        sample_width=2,
+        period_ms=20,
+        target_ms=120,
+        capacity_s=120,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.period_frames = sample_rate * period_ms // 1000
+        self.target_ms = target_ms
+        self._bytes_per_ms = sample_rate * sample_width / 1000.0
+        self._ring = ByteRing(int(capacity_s * 1000 * self._bytes_per_ms))
+        self._out = bytearray(self.period_frames * sample_width)
+        self._silence = bytes(len(self._out))
+        self._lock = threading.Lock()
+        self._playing = False
+        self._turn_ended = True
+        self._paused = False
+        self.gain = 1.0
+
+        self.underruns = 0
+        self.periods_played = 0
+        self.overflow_bytes = 0
+        self.flushes = 0
+        self.peak_bytes = 0
+
+    @property
+    def buffered_ms(self):
+        return len(self._ring) / self._bytes_per_ms
+
+    @property
+    def active(self):
+        """True while there is audio being played or waiting to be played"""
+        return self._playing or len(self._ring) > 0
+
+    def write(self, data):
+        """Queue received audio, called from the event loop"""
+        with self._lock:
+            self.overflow_bytes += self._ring.write(data)
+            self._turn_ended = False
+            self.peak_bytes = max(self.peak_bytes, len(self._ring))
+
+    def end_turn(self):
+        """No more audio is coming for this turn, play out what is buffered"""
+        with self._lock:
+            self._turn_ended = True
+
+    def flush(self):
+        """Drop everything buffered, returns how many ms were discarded"""
+        with self._lock:
+            flushed = len(self._ring) / self._bytes_per_ms
+            self._ring.clear()
+            self._playing = False
+            self._turn_ended = True
+            self._paused = False
+            self.gain = 1.0
+            self.flushes += 1
+            return flushed
+
+    def pause(self):
+        """Go silent without dropping anything, until ``resume`` or ``flush``"""
+        with self._lock:
+            self._paused = True
+
+    def resume(self):
+        with self._lock:
+            self._paused = False
+
+    @property
+    def paused(self):
+        return self._paused
+
+    def set_gain(self, gain):
+        """Scale the output, e.g. to duck playback while the user talks"""
+        self.gain = gain
+
+    def callback(self, in_data, frame_count, time_info, status):
+        """PyAudio output callback, runs on the PortAudio thread"""
+        n = frame_count * self.sample_width
+        if n > len(self._out):
+            self._out = bytearray(n)
+            self._silence = bytes(n)
+
+        with self._lock:
+            if self._paused:
+                return (self._silence[:n], pyaudio.paContinue)
+            buffered = len(self._ring)
+            if not self._playing and buffered:
+                target = self.target_ms * self._bytes_per_ms
+                self._playing = buffered >= target or self._turn_ended
+            if not self._playing:
+                return (self._silence[:n], pyaudio.paContinue)
+
+            out = memoryview(self._out)[:n]
+            got = self._ring.read_into(out)
+            if got < n:
+                out[got:] = self._silence[: n - got]
+                if not self._turn_ended:
+                    self.underruns += 1
+                self._playing = False
+            self.periods_played += 1
+        if self.gain != 1.0:
+            samples = np.frombuffer(out, dtype=np.int16) * self.gain
+            return (samples.astype(np.int16).tobytes(), pyaudio.paContinue)
+        return (bytes(out), pyaudio.paContinue)
+
+    def stats(self):
+        """Underruns, current and peak buffered ms, overflow and flush counts"""
+        with self._lock:
+            return {
+                "buffered_ms": len(self._ring) / self._bytes_per_ms,
+                "peak_buffered_ms": self.peak_bytes / self._bytes_per_ms,
+                "target_ms": self.target_ms,
+                "underruns": self.underruns,
+                "periods_played": self.periods_played,
+                "overflow_ms": self.overflow_bytes / self._bytes_per_ms,
+                "flushes": self.flushes,
+            }
+
+
+def format_playback_summary(stats):
+    """One-line summary of PlaybackEngine.stats()"""
+    if not stats:
+        return "No playback stats yet"
+    return (
+        f"buffered {stats['buffered_ms']:.0f} ms "
+        f"(peak {stats['peak_buffered_ms']:.0f}, target {stats['target_ms']}) | "
+        f"{stats['underruns']} underruns | {stats['flushes']} flushes"
+    )
@@ -0,0 +1,106 @@
+import asyncio
+import re
+import time
+from collections import deque
+from datetime import timedelta
+
+
+def _seconds(time_left):
+    """GoAway.time_left as seconds, it arrives as a duration string like "9.5s" """
+    if time_left is None:
+        return None
+    if isinstance(time_left, timedelta):
+        return time_left.total_seconds()
+    if isinstance(time_left, (int, float)):
+        return float(time_left)
+    match = re.match(r"\s*([\d.]+)\s*s?\s*$", str(time_left))
+    return float(match.group(1)) if match else None
+
+
+class SessionResumption:
+    """Resumption handle and go_away deadline of the current Live session.
+
+    ``update`` keeps the newest handle from ``session_resumption_update``
+    messages and whether the session can be resumed right now (the server
+    reports it as not resumable while a turn or tool call is in flight).
+    After ``go_away`` the reconnect is requested as soon as the session is
+    resumable, or ``margin_s`` before the deadline at the latest, so the
+    switch happens on our terms instead of by a dropped connection.
+    ``wait_due`` returns once that point is reached. Reconnect gaps are the
+    time the uplink had no session to send to.
+    """
+
+    def __init__(self, margin_s=3.0, window=50):
+        self.margin_s = margin_s
+        self.handle = None
+        self.resumable = False
+        self.deadline = None
+        self._due = None
+        self._timer = None
+        self._gaps = deque(maxlen=window)
+        self.go_aways = 0
+        self.reconnects = 0
+        self.resumed = 0
+
+    def start_session(self):
+        """Reset the go_away state for a freshly connected session"""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self.deadline = None
+        self._due = asyncio.Event()
+
+    def update(self, update):
+        """Handle a ``session_resumption_update`` message"""
+        self.resumable = bool(update.resumable)
+        if update.resumable and update.new_handle:
+            self.handle = update.new_handle
+        if self.deadline is not None and self.resumable:
+            self._due.set()
+
+    def go_away(self, time_left):
+        """The server will close the connection after ``time_left``"""
+        self.go_aways += 1
+        seconds = _seconds(time_left)
+        if seconds is None:
+            seconds = self.margin_s
+        self.deadline = time.monotonic() + seconds
+        if self.resumable:
+            self._due.set()
+            return
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(max(0.0, seconds - self.margin_s), self._due.set)
+
+    async def wait_due(self):
+        await self._due.wait()
+
+    def reconnected(self, gap_s, resumed):
+        """A new session is ready ``gap_s`` after the previous one stopped"""
+        self.reconnects += 1
+        if resumed:
+            self.resumed += 1
+        self._gaps.append(1000.0 * gap_s)
+
+    def stats(self):
+        """Reconnect counts and gap times in ms"""
+        gaps = list(self._gaps)
+        return {
+            "has_handle": self.handle is not None,
+            "go_aways": self.go_aways,
+            "reconnects": self.reconnects,
+            "resumed": self.resumed,
+            "gap_ms_mean": sum(gaps) / len(gaps) if gaps else 0.0,
+            "gap_ms_max": max(gaps) if gaps else 0.0,
+            "gap_ms_last": gaps[-1] if gaps else 0.0,
+        }
+
+
+def format_session_summary(stats):
+    """One-line summary of SessionResumption.stats()"""
+    if not stats:
+        return "No session stats yet"
+    return (
+        f"{stats['reconnects']} reconnects ({stats['resumed']} resumed, "
+        f"{stats['go_aways']} go_away) | gap {stats['gap_ms_mean']:.0f} ms "
+        f"(max {stats['gap_ms_max']:.0f})"
+    )
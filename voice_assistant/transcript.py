@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+
+class TranscriptWriter:
+    """Append-only JSONL transcript, written by a background thread.
+
+    ``add`` only appends a record to an in-memory buffer, so the receive
+    loop never touches the disk. The writer thread wakes up once
+    ``batch_size`` records are pending or every ``flush_interval`` seconds
+    and writes them with a single write and flush. At most ``max_pending``
+    records are buffered; beyond that the oldest are dropped and counted.
+    ``stop`` writes whatever is left before returning. The file (and its
+    directory) is only created once there is a first record to write, so
+    sessions without a conversation leave nothing on disk.
+    """
+
+    def __init__(self, path, max_pending=1000, batch_size=32, flush_interval=1.0):
+        self.path = path
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._started = time.monotonic()
+        self._turn = 0
+
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+        self.write_ms_max = 0.0
+
+    def start(self):
+        self._started = time.monotonic()
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="TranscriptWriter", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def add(self, speaker, text, timestamp=None, **extra):
+        """Record one turn, never blocks on disk"""
+        if not text:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        self._turn += 1
+        record = {
+            "turn": self._turn,
+            "speaker": speaker,
+            "time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+            "offset_s": round(time.monotonic() - self._started, 3),
+            "text": text,
+        }
+        record.update(extra)
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(record)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def _run(self):
+        f = None
+        try:
+            while True:
+                with self._cond:
+                    if self._running and len(self._pending) < self.batch_size:
+                        self._cond.wait(self.flush_interval)
+                    batch = list(self._pending)
+                    self._pending.clear()
+                    running = self._running
+                if batch:
+                    if f is None:
+                        f = self._open()
+                    if f is not None:
+                        self._write(f, batch)
+                if not running:
+                    break
+        finally:
+            if f is not None:
+                f.close()
+
+    def _open(self):
+        """Create the transcript file on the first record, None on failure"""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # "x": never append to another interview's transcript
+            return open(self.path, "x", encoding="utf-8")
+        except OSError as e:
+            self.errors += 1
+            print(f"Error opening transcript: {e}")
+            return None
+
+    def _write(self, f, batch):
+        start = time.perf_counter()
+        try:
+            f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch))
+            f.flush()
+        except OSError as e:
+            self.errors += 1
+            print(f"Error writing transcript: {e}")
+            return
+        self.write_ms_max = max(
+            self.write_ms_max, 1000.0 * (time.perf_counter() - start)
+        )
+        self.written += len(batch)
+        self.batches += 1
+
+    def stop(self, timeout=5.0):
+        """Write everything pending and stop the writer thread"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Records written, batches, dropped and pending, slowest write"""
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            "path": self.path,
+            "written": self.written,
+            "batches": self.batches,
+            "pending": pending,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "write_ms_max": self.write_ms_max,
+        }
+
+
+def transcript_path(directory, now=None):
+    """A new transcript file name in ``directory``, unique per interview
+
+    The random suffix keeps interviews started in the same second apart.
+    """
+    now = datetime.now() if now is None else now
+    name = f"interview-{now:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl"
+    return os.path.join(directory, name)
+
+
+def format_transcript_summary(stats):
+    """One-line summary of TranscriptWriter.stats()"""
+    if not stats:
+        return "No transcript"
+    return (
+        f"{stats['written']} turns in {stats['batches']} writes to {stats['path']}"
+        f" | {stats['dropped']} dropped"
+    )
@@ -0,0 +1,278 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from voice_assistant.vad import level_db
+
+QUEUE_POLICIES = ("drop_oldest", "drop_silence")
+
+
+class UplinkAggregator:
+    """Packs captured PCM chunks into larger frames before upload.
+
+    Every ``send_realtime_input`` is one websocket message, so sending each
+    32 ms capture chunk on its own costs ~31 messages per second. Chunks are
+    collected until ``frame_ms`` of audio is buffered and sent as one frame.
+
+    With ``adaptive=True`` the frame duration follows the measured send
+    latency: when a send takes more than ``target_ratio`` of a frame's
+    duration the frames grow (fewer, larger messages), when sends are much
+    cheaper they shrink back, but never below the configured ``frame_ms``.
+    A frame is never shorter than one ``chunk_ms`` capture chunk, so chunks
+    are not split into extra messages.
+    """
+
+    def __init__(
+        self,
+        sample_rate=16000,
+        sample_width=2,
+        frame_ms=40,
+        min_ms=20,
+        max_ms=100,
+        adaptive=True,
+        target_ratio=0.25,
+        chunk_ms=0,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.min_ms = max(min_ms, chunk_ms)
+        self.max_ms = max(max_ms, self.min_ms)
+        self.adaptive = adaptive
+        self.target_ratio = target_ratio
+        self.frame_ms = min(max(frame_ms, self.min_ms), self.max_ms)
+        # Where adaptation shrinks back to once sends are cheap again
+        self.base_ms = self.frame_ms
+        self.send_latency_ms = 0.0
+        self._buffer = bytearray()
+        self._sends = 0
+
+    @property
+    def frame_bytes(self):
+        samples = int(self.sample_rate * self.frame_ms // 1000)
+        return samples * self.sample_width
+
+    @property
+    def buffered_ms(self):
+        return 1000.0 * len(self._buffer) / (self.sample_rate * self.sample_width)
+
+    def add(self, data):
+        """Buffer a captured chunk, returns the frames now ready to send"""
+        self._buffer += data
+        size = self.frame_bytes
+        frames = []
+        while len(self._buffer) >= size:
+            frames.append(bytes(self._buffer[:size]))
+            del self._buffer[:size]
+        return frames
+
+    def flush(self):
+        """Whatever is buffered as a final short frame, or None"""
+        if not self._buffer:
+            return None
+        frame = bytes(self._buffer)
+        self._buffer.clear()
+        return frame
+
+    def record_send(self, seconds):
+        """Feed back how long one send took and adapt the frame duration"""
+        ms = seconds * 1000.0
+        self._sends += 1
+        if self._sends == 1:
+            self.send_latency_ms = ms
+        else:
+            self.send_latency_ms = 0.2 * ms + 0.8 * self.send_latency_ms
+        if not self.adaptive or self._sends < 5:
+            return
+
+        budget = self.target_ratio * self.frame_ms
+        if self.send_latency_ms > budget and self.frame_ms < self.max_ms:
+            self.frame_ms = min(self.max_ms, self.frame_ms + 20)
+            self._sends = 0
+        elif self.send_latency_ms < budget / 4 and self.frame_ms > self.base_ms:
+            self.frame_ms = max(self.base_ms, self.frame_ms - 20)
+            self._sends = 0
+
+
+class UplinkQueue:
+    """Bounded queue between microphone capture and upload.
+
+    ``put_nowait`` never blocks: once ``maxsize`` chunks are waiting, one is
+    dropped so the uplink never carries more than ``maxsize`` chunks of
+    latency. "drop_oldest" drops the oldest chunk; "drop_silence" drops the
+    oldest chunk quieter than ``silence_db`` first and only falls back to
+    the oldest chunk when everything queued is speech. Single consumer.
+    """
+
+    def __init__(self, maxsize=32, policy="drop_oldest", silence_db=-50.0):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(
+                f"Unknown policy {policy!r}, expected one of {QUEUE_POLICIES}"
+            )
+        self.maxsize = maxsize
+        self.policy = policy
+        self.silence_db = silence_db
+        self._items = deque()
+        self._ready = asyncio.Event()
+        self.high_water_mark = 0
+        self.dropped = 0
+        self.dropped_silence = 0
+        self.dropped_bytes = 0
+
+    def qsize(self):
+        return len(self._items)
+
+    def put_nowait(self, data):
+        silent = False
+        if self.policy == "drop_silence":
+            silent = level_db(data) < self.silence_db
+        if len(self._items) >= self.maxsize:
+            self._drop()
+        self._items.append((data, silent))
+        self.high_water_mark = max(self.high_water_mark, len(self._items))
+        self._ready.set()
+
+    async def put(self, data):
+        self.put_nowait(data)
+
+    def _drop(self):
+        index = 0
+        if self.policy == "drop_silence":
+            for i, (_, silent) in enumerate(self._items):
+                if silent:
+                    index = i
+                    self.dropped_silence += 1
+                    break
+        data, _ = self._items[index]
+        del self._items[index]
+        self.dropped += 1
+        self.dropped_bytes += len(data)
+
+    async def get(self):
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()[0]
+
+    def task_done(self):
+        pass
+
+    def stats(self):
+        """Current depth, high-water mark and dropped chunks"""
+        return {
+            "policy": self.policy,
+            "depth": len(self._items),
+            "maxsize": self.maxsize,
+            "high_water_mark": self.high_water_mark,
+            "dropped": self.dropped,
+            "dropped_silence": self.dropped_silence,
+            "dropped_bytes": self.dropped_bytes,
+        }
+
+
+class UplinkStats:
+    """Counters for the microphone-to-Gemini path, safe to poll from UI threads"""
+
+    def __init__(self, window=100):
+        self._lock = threading.Lock()
+        self._send_times = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._send_times.clear()
+            self.started = time.monotonic()
+            self.chunks_captured = 0
+            self.bytes_captured = 0
+            self.thread_hops = 0
+            self.messages_sent = 0
+            self.bytes_sent = 0
+            self.send_ms_max = 0.0
+            self.frame_ms = 0
+            self.stream_ends = 0
+            self.send_failures = 0
+            self.sends_dropped = 0
+
+    def captured(self, nbytes, hops=1):
+        """A chunk arrived from the microphone, ``hops`` thread round-trips"""
+        with self._lock:
+            self.chunks_captured += 1
+            self.bytes_captured += nbytes
+            self.thread_hops += hops
+
+    def sent(self, nbytes, seconds, frame_ms=0):
+        """One realtime-input message went out"""
+        now = time.monotonic()
+        with self._lock:
+            self._send_times.append(now)
+            self.messages_sent += 1
+            self.bytes_sent += nbytes
+            self.send_ms_max = max(self.send_ms_max, seconds * 1000.0)
+            self.frame_ms = frame_ms
+
+    def stream_ended(self):
+        """The VAD gate closed and audio_stream_end was sent"""
+        with self._lock:
+            self.stream_ends += 1
+
+    def send_failed(self, dropped=False):
+        """A send raised; ``dropped`` when its input was given up on"""
+        with self._lock:
+            self.send_failures += 1
+            self.sends_dropped += dropped
+
+    def snapshot(self):
+        """Totals plus recent messages/sec and thread hops/sec"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.started
+            times = self._send_times
+            rate = 0.0
+            if len(times) > 1 and times[-1] > times[0]:
+                rate = (len(times) - 1) / (times[-1] - times[0])
+            return {
+                "chunks_captured": self.chunks_captured,
+                "bytes_captured": self.bytes_captured,
+                "messages_sent": self.messages_sent,
+                "bytes_sent": self.bytes_sent,
+                "sent_pct": (
+                    100.0 * self.bytes_sent / self.bytes_captured
+                    if self.bytes_captured
+                    else 0.0
+                ),
+                "stream_ends": self.stream_ends,
+                "send_failures": self.send_failures,
+                "sends_dropped": self.sends_dropped,
+                "messages_per_sec": rate,
+                "thread_hops": self.thread_hops,
+                "thread_hops_per_sec": self.thread_hops / elapsed if elapsed else 0.0,
+                "send_ms_max": self.send_ms_max,
+                "frame_ms": self.frame_ms,
+            }
+
+
+def format_uplink_summary(snapshot):
+    """One-line summary of an UplinkStats snapshot"""
+    if not snapshot:
+        return "No uplink stats yet"
+    summary = (
+        f"{snapshot['messages_per_sec']:.1f} msg/s at {snapshot['frame_ms']} ms | "
+        f"{snapshot['messages_sent']} messages | "
+        f"sent {snapshot['sent_pct']:.0f}% of captured audio | "
+        f"{snapshot['thread_hops_per_sec']:.1f} thread hops/s"
+    )
+    if snapshot.get("send_failures"):
+        summary += (
+            f" | {snapshot['send_failures']} failed sends, "
+            f"{snapshot['sends_dropped']} dropped"
+        )
+    return summary + _format_queue(snapshot.get("queue"))
+
+
+def _format_queue(queue):
+    if not queue:
+        return ""
+    return (
+        f" | queue peak {queue['high_water_mark']}/{queue['maxsize']}, "
+        f"{queue['dropped']} dropped"
+    )
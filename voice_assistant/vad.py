@@ -0,0 +1,115 @@
+import math
+from collections import deque
+
+import numpy as np
+
+# Level reported for digital silence
+SILENCE_DB = -96.0
+
+
+def level_db(data):
+    """RMS level of 16-bit PCM in dBFS"""
+    samples = np.frombuffer(data, dtype=np.int16)
+    if not samples.size:
+        return SILENCE_DB
+    x = samples.astype(np.float32)
+    rms = math.sqrt(float(np.dot(x, x)) / x.size)
+    if rms < 1.0:
+        return SILENCE_DB
+    return 20.0 * math.log10(rms / 32768.0)
+
+
+class VadGate:
+    """Energy-based voice activity gate for the uplink.
+
+    A chunk counts as speech when its level is ``margin_db`` above the noise
+    floor and above ``threshold_db``. The noise floor is the quietest chunk
+    of the last ``floor_window_ms``, which pauses between words keep close to
+    the room noise. The gate opens after ``onset_chunks`` speech chunks in a
+    row and sends the last ``pre_roll_ms`` of audio first, so onsets are not
+    clipped. It stays open for ``hangover_ms`` after speech stops so the
+    server still hears the trailing silence it uses to end the turn. While
+    closed, nothing is sent.
+    """
+
+    def __init__(
+        self,
+        sample_rate=16000,
+        sample_width=2,
+        threshold_db=-50.0,
+        margin_db=10.0,
+        pre_roll_ms=300,
+        hangover_ms=600,
+        onset_chunks=2,
+        floor_window_ms=3000,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.pre_roll_ms = pre_roll_ms
+        self.hangover_ms = hangover_ms
+        self.onset_chunks = onset_chunks
+        self.floor_window_ms = floor_window_ms
+
+        self._levels = None
+        self.open = False
+        self._pre_roll = deque()
+        self._pre_roll_bytes = 0
+        self._loud = 0
+        self._quiet_ms = 0.0
+        self.level = SILENCE_DB
+        self.segments = 0
+
+    def _ms(self, data):
+        return 1000.0 * len(data) / (self.sample_rate * self.sample_width)
+
+    @property
+    def noise_db(self):
+        if not self._levels:
+            return SILENCE_DB
+        return min(self._levels)
+
+    def is_speech(self, data):
+        """Classify one chunk and update the noise floor"""
+        if self._levels is None:
+            chunk_ms = max(self._ms(data), 1.0)
+            self._levels = deque(maxlen=math.ceil(self.floor_window_ms / chunk_ms))
+        self.level = level_db(data)
+        self._levels.append(self.level)
+        return self.level > max(self.threshold_db, self.noise_db + self.margin_db)
+
+    def process(self, data):
+        """Gate one chunk, returns (chunks to send, whether the gate just closed)"""
+        speech = self.is_speech(data)
+
+        if self.open:
+            if speech:
+                self._quiet_ms = 0.0
+            else:
+                self._quiet_ms += self._ms(data)
+                if self._quiet_ms >= self.hangover_ms:
+                    self.open = False
+                    self._loud = 0
+                    return [data], True
+            return [data], False
+
+        self._loud = self._loud + 1 if speech else 0
+        if self._loud < self.onset_chunks:
+            self._remember(data)
+            return [], False
+
+        self.open = True
+        self.segments += 1
+        self._quiet_ms = 0.0
+        chunks = list(self._pre_roll) + [data]
+        self._pre_roll.clear()
+        self._pre_roll_bytes = 0
+        return chunks, False
+
+    def _remember(self, data):
+        self._pre_roll.append(data)
+        self._pre_roll_bytes += len(data)
+        limit = self.pre_roll_ms * self.sample_rate * self.sample_width / 1000.0
+        while self._pre_roll and self._pre_roll_bytes - len(self._pre_roll[0]) >= limit:
+            self._pre_roll_bytes -= len(self._pre_roll.popleft())